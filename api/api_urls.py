@@ -0,0 +1,6 @@
+from django.urls import path
+from api.api_views import BatchAPI
+
+urlpatterns = [
+    path("", BatchAPI.as_view(), name="api-batch"),
+]
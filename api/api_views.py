@@ -0,0 +1,27 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from api.batch import BatchError, parse_batch, run_batch
+
+
+class BatchAPI(APIView):
+    """
+    Several API reads in one round trip:
+
+        {"requests": [{"id": "stocks", "method": "GET", "path": "/api/stocks/",
+                       "params": {"page": 2}}, ...]}
+
+    A query string in path is kept; params are added to it. Responds with
+    {"responses": [{"id", "status", "body"}, ...]} in order; a sub-request
+    that crashes gets status 500 without failing the others.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            items = parse_batch(request.data)
+        except BatchError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"responses": run_batch(request, items)})
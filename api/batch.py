@@ -0,0 +1,123 @@
+import logging
+from django.conf import settings
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework.response import Response
+
+# --------------------
+# In-process batch of API reads
+# --------------------
+# Each sub-request is dispatched straight to the resolved DRF view with the
+# caller's already authenticated user, on the same thread and database
+# connection. Unrendered Response.data is collected, so every body is
+# serialised once, in the batch response.
+
+MAX_REQUESTS = getattr(settings, "API_BATCH_MAX_REQUESTS", 20)
+ALLOWED_METHODS = ("GET",)
+API_PREFIX = "/api/"
+BATCH_PATH = "/api/batch/"
+
+logger = logging.getLogger(__name__)
+
+
+class BatchError(ValueError):
+    pass
+
+
+def parse_batch(payload):
+    """Validate the request list; raises BatchError with a client message."""
+    requests = payload.get("requests") if isinstance(payload, dict) else None
+    if not isinstance(requests, list) or not requests:
+        raise BatchError("requests must be a non-empty list")
+    if len(requests) > MAX_REQUESTS:
+        raise BatchError(f"At most {MAX_REQUESTS} requests per batch")
+
+    parsed = []
+    for index, item in enumerate(requests):
+        if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+            raise BatchError(f"Request {index} needs a path")
+        params = item.get("params") or {}
+        if not isinstance(params, dict):
+            raise BatchError(f"Request {index}: params must be an object")
+        parsed.append({
+            "id": item.get("id", index),
+            "method": str(item.get("method", "GET")).upper(),
+            "path": item["path"],
+            "params": params,
+        })
+    return parsed
+
+
+def _query_string(query_string, params):
+    """The path's own query string with `params` added (replacing same keys)."""
+    query = QueryDict(query_string, mutable=True)
+    for key, value in params.items():
+        if isinstance(value, list):
+            query.setlist(key, [str(item) for item in value])
+        else:
+            query[key] = str(value)
+    return query.urlencode()
+
+
+def _sub_request(request, path, query_string):
+    sub = HttpRequest()
+    sub.method = "GET"
+    sub.path = sub.path_info = path
+    sub.META = {
+        **request.META,
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query_string,
+        "CONTENT_LENGTH": "",
+    }
+    sub.GET = QueryDict(query_string)
+    sub.COOKIES = request.COOKIES
+
+    # Reuse the batch's authentication instead of running it again
+    sub.user = request.user
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    if hasattr(request._request, "session"):
+        sub.session = request._request.session
+    return sub
+
+
+def _error(item, status, message):
+    return {"id": item["id"], "status": status, "body": {"error": message}}
+
+
+def run_batch(request, items):
+    responses = []
+    for item in items:
+        path, _, path_query = item["path"].partition("?")
+
+        if item["method"] not in ALLOWED_METHODS:
+            responses.append(_error(item, 405, "Only GET requests can be batched"))
+            continue
+        if not path.startswith(API_PREFIX) or path.startswith(BATCH_PATH):
+            responses.append(_error(item, 400, "Path must be an API endpoint"))
+            continue
+
+        try:
+            match = resolve(path)
+        except Resolver404:
+            responses.append(_error(item, 404, "Not found"))
+            continue
+
+        sub = _sub_request(request, path, _query_string(path_query, item["params"]))
+        sub.resolver_match = match
+        try:
+            response = match.func(sub, *match.args, **match.kwargs)
+        except Exception:
+            # DRF turns API errors into responses; anything else fails this item only
+            logger.exception("Batched request %s %s failed", item["method"], item["path"])
+            responses.append(_error(item, 500, "Internal server error"))
+            continue
+
+        if isinstance(response, Response):
+            body = response.data
+        else:
+            body = None
+        responses.append({"id": item["id"], "status": response.status_code, "body": body})
+
+    return responses
@@ -0,0 +1,60 @@
+import time
+from itertools import cycle, islice
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from api.renderers import MessagePackRenderer, ORJSONRenderer
+from sampling.api_serializers import FishSamplingSerializer
+from sampling.growth import with_growth_status
+from sampling.models import FishSampling
+
+RENDERERS = [
+    ("drf-json", JSONRenderer()),
+    ("orjson", ORJSONRenderer()),
+    ("msgpack", MessagePackRenderer()),
+]
+
+
+class Command(BaseCommand):
+    help = "Compare render time and payload size of the API renderers on sampling pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-sizes",
+            default="5,50,500",
+            help="Comma separated page sizes",
+        )
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def handle(self, *args, **options):
+        page_sizes = [int(size) for size in options["page_sizes"].split(",")]
+        samplings = list(
+            with_growth_status(
+                FishSampling.objects
+                .select_related("fish_stock", "fish_stock__pond", "fish_stock__species")
+            )
+            .order_by("-sampled_on", "-id")[:max(page_sizes)]
+        )
+        if not samplings:
+            raise CommandError("No samplings to render; add some data first")
+
+        # Serialise once: only the renderers are measured
+        rows = FishSamplingSerializer(samplings, many=True).data
+
+        self.stdout.write(f"{'page':>6} {'renderer':>10} {'ms/page':>10} {'bytes':>10}")
+        for size in page_sizes:
+            # Real rows, repeated when the database holds fewer than `size`
+            page = {
+                "count": size,
+                "next": None,
+                "previous": None,
+                "results": list(islice(cycle(rows), size)),
+            }
+
+            for name, renderer in RENDERERS:
+                payload = renderer.render(page, renderer.media_type)
+                started = time.perf_counter()
+                for _ in range(options["repeat"]):
+                    renderer.render(page, renderer.media_type)
+                elapsed = (time.perf_counter() - started) * 1000 / options["repeat"]
+
+                self.stdout.write(f"{size:>6} {name:>10} {elapsed:>10.3f} {len(payload):>10}")
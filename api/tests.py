@@ -1,3 +1,160 @@
+import io
+import json
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+import msgpack
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from api.renderers import MSGPACK_MEDIA_TYPE, MessagePackParser, MessagePackRenderer, ORJSONRenderer
+from core.models import FishSpecies, Pond
+from sampling.api_views import GrowthStatusSummaryAPI
+from sampling.models import FishSampling, PondFishStock
 
-# Create your tests here.
+
+class BatchAPITests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("crew", password="secret")
+        species = FishSpecies.objects.create(name="Tilapia")
+        self.stocks = []
+        for name in ("P1", "P2"):
+            pond = Pond.objects.create(user=self.user, name=name, area_acres=Decimal("1.00"))
+            stock = PondFishStock.objects.create(
+                user=self.user,
+                pond=pond,
+                species=species,
+                quantity=1000,
+                initial_avg_weight=Decimal("10.00"),
+                stocked_on=date(2026, 1, 1),
+            )
+            FishSampling.objects.create(
+                user=self.user,
+                fish_stock=stock,
+                sampled_on=date(2026, 1, 21),
+                sample_fish_count=10,
+                sample_total_weight=Decimal("200.00"),
+            )
+            self.stocks.append(stock)
+        self.client.force_login(self.user)
+
+    def batch(self, *requests):
+        response = self.client.post(
+            reverse("api-batch"),
+            {"requests": list(requests)},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()["responses"]
+
+    def sampling_stocks(self, body):
+        rows = body["results"] if isinstance(body, dict) else body
+        return {row["fish_stock"]["id"] for row in rows}
+
+    def test_query_string_in_path_is_applied(self):
+        stock = self.stocks[0]
+        [response] = self.batch({"path": f"/api/samplings/?fish_stock={stock.pk}"})
+        self.assertEqual(response["status"], 200)
+        self.assertEqual(self.sampling_stocks(response["body"]), {stock.pk})
+
+    def test_params_are_added_to_path_query(self):
+        stock = self.stocks[1]
+        [response] = self.batch({
+            "path": "/api/samplings/?from_date=2026-01-01",
+            "params": {"fish_stock": stock.pk},
+        })
+        self.assertEqual(self.sampling_stocks(response["body"]), {stock.pk})
+
+    def test_crashing_request_fails_alone(self):
+        with (
+            mock.patch.object(GrowthStatusSummaryAPI, "get", side_effect=RuntimeError("boom")),
+            self.assertLogs("api.batch", "ERROR"),
+        ):
+            failed, ok = self.batch(
+                {"id": "summary", "path": "/api/growth-status/"},
+                {"id": "samplings", "path": "/api/samplings/"},
+            )
+        self.assertEqual((failed["id"], failed["status"]), ("summary", 500))
+        self.assertEqual((ok["id"], ok["status"]), ("samplings", 200))
+
+
+class RendererTests(TestCase):
+    DATA = {
+        "weight": Decimal("12.50"),
+        "weights": [Decimal("0.1"), Decimal("-3"), Decimal("1E+2")],
+        "sampled_on": date(2026, 1, 21),
+        "utc": datetime(2026, 1, 21, 6, 30, 15, 123456, tzinfo=timezone.utc),
+        "offset": datetime(2026, 1, 21, 6, 30, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+        "naive": datetime(2026, 1, 21, 6, 30),
+        "name": "Tilapia ü",
+        "count": 10,
+        "growth": None,
+        "nested": {"stock": {"stocked_on": date(2026, 1, 1), "quantity": Decimal("1000")}},
+    }
+
+    def reference(self, data):
+        return json.loads(JSONRenderer().render(data))
+
+    def test_orjson_matches_json_renderer(self):
+        self.assertEqual(json.loads(ORJSONRenderer().render(self.DATA)), self.reference(self.DATA))
+
+    def test_msgpack_matches_json_renderer(self):
+        self.assertEqual(msgpack.unpackb(MessagePackRenderer().render(self.DATA)), self.reference(self.DATA))
+
+    def test_api_responses_match_across_formats(self):
+        user = User.objects.create_user("crew", password="secret")
+        pond = Pond.objects.create(user=user, name="P1", area_acres=Decimal("2.50"))
+        stock = PondFishStock.objects.create(
+            user=user,
+            pond=pond,
+            species=FishSpecies.objects.create(name="Tilapia"),
+            quantity=1000,
+            initial_avg_weight=Decimal("10.00"),
+            stocked_on=date(2026, 1, 1),
+        )
+        FishSampling.objects.create(
+            user=user,
+            fish_stock=stock,
+            sampled_on=date(2026, 1, 21),
+            sample_fish_count=8,
+            sample_total_weight=Decimal("81.00"),
+        )
+        self.client.force_login(user)
+
+        as_json = self.client.get(reverse("api-samplings"), HTTP_ACCEPT="application/json")
+        as_msgpack = self.client.get(reverse("api-samplings"), HTTP_ACCEPT=MSGPACK_MEDIA_TYPE)
+        self.assertEqual(as_msgpack["Content-Type"], MSGPACK_MEDIA_TYPE)
+        self.assertEqual(msgpack.unpackb(as_msgpack.content), as_json.json())
+        self.assertEqual(as_json.json()["results"][0]["average_weight"], 10.13)
+
+
+class MessagePackParserTests(TestCase):
+    def parse(self, data):
+        return MessagePackParser().parse(io.BytesIO(data))
+
+    def test_round_trips_renderer_output(self):
+        data = {"requests": [{"path": "/api/samplings/", "params": {"fish_stock": 1}}], "name": "ü"}
+        self.assertEqual(self.parse(MessagePackRenderer().render(data)), data)
+
+    def test_invalid_payloads_raise_parse_error(self):
+        packed = msgpack.packb({"a": 1})
+        for data in (b"", packed[:-1], packed + b"\x01", b"\xc1"):
+            with self.subTest(data=data):
+                with self.assertRaises(ParseError):
+                    self.parse(data)
+
+    def test_api_accepts_msgpack_body(self):
+        user = User.objects.create_user("crew", password="secret")
+        self.client.force_login(user)
+        response = self.client.post(
+            reverse("api-batch"),
+            msgpack.packb({"requests": [{"id": "summary", "path": "/api/growth-status/"}]}),
+            content_type=MSGPACK_MEDIA_TYPE,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["responses"][0]["status"], 200)
+
+        response = self.client.post(reverse("api-batch"), b"\xc1", content_type=MSGPACK_MEDIA_TYPE)
+        self.assertEqual(response.status_code, 400)
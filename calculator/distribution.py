@@ -0,0 +1,58 @@
+import numpy as np
+
+# Matches calculator.utils.pack_batch_weights
+BATCH_WEIGHT_DTYPE = np.dtype("<f4")
+
+
+def batch_weight_array(data):
+    """Zero-copy float32 view over a packed batch-weights column."""
+    if not data:
+        return np.empty(0, dtype=BATCH_WEIGHT_DTYPE)
+    return np.frombuffer(data, dtype=BATCH_WEIGHT_DTYPE)
+
+
+def batch_weight_stats(data, batch_size, bins=10):
+    weights = batch_weight_array(data)
+    if weights.size == 0 or not batch_size:
+        return None
+
+    # Per-fish weight of each batch
+    per_fish = weights.astype(np.float64) / batch_size
+    mean = per_fish.mean()
+    std = per_fish.std(ddof=1) if per_fish.size > 1 else 0.0
+
+    counts, edges = np.histogram(per_fish, bins=min(bins, per_fish.size))
+
+    return {
+        "batch_count": int(per_fish.size),
+        "mean": round(float(mean), 2),
+        "std_dev": round(float(std), 2),
+        "cv_percentage": round(float(std / mean * 100), 2) if mean else None,
+        "min": round(float(per_fish.min()), 2),
+        "max": round(float(per_fish.max()), 2),
+        "histogram": {
+            "counts": counts.tolist(),
+            "bin_edges": [round(float(edge), 2) for edge in edges],
+        },
+    }
+
+
+def grouped_moments(values, groups, n_groups):
+    """Count, mean and sample variance of `values` per group index, vectorised."""
+    count = np.bincount(groups, minlength=n_groups).astype(np.float64)
+    total = np.bincount(groups, weights=values, minlength=n_groups)
+    squares = np.bincount(groups, weights=values * values, minlength=n_groups)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        variance = (squares - count * mean * mean) / (count - 1)
+    return count, mean, np.clip(variance, 0.0, None)
+
+
+def required_sample_size(cv, margin, z, minimum=2):
+    """
+    Samples needed for a ±margin (fraction of the mean) confidence interval
+    on the mean, given the coefficient of variation: n = (z * cv / margin)².
+    """
+    n = np.ceil((z * np.asarray(cv, dtype=np.float64) / margin) ** 2)
+    return np.maximum(np.nan_to_num(n, nan=minimum), minimum).astype(np.int64)
@@ -0,0 +1,142 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import numpy as np
+
+# --------------------
+# Monte Carlo growth / harvest engine
+# --------------------
+# Pure NumPy so chunks can run in worker processes without Django.
+#
+# Each trajectory draws its own growth offset and daily mortality rate,
+# then steps day by day:
+#
+#     sgr(W)  = intercept + slope * ln(W) + offset        (% per day)
+#     W(t+1)  = W(t) * exp(sgr / 100)
+#     N(t)    = quantity * exp(-mortality * t)
+#
+# and is harvested on the first day W reaches the target weight
+# (or on the last simulated day).
+
+PERCENTILES = [5, 25, 50, 75, 95]
+BAND_STEP_DAYS = 7
+
+_executor = None
+_executor_workers = 0
+
+
+def run_chunk(params, size, seed):
+    rng = np.random.default_rng(seed)
+    days = params["max_days"]
+
+    offsets = rng.normal(0.0, params["sgr_sd"], size)
+
+    # Gamma keeps mortality positive with the requested mean / sd
+    mean, sd = params["mortality_mean"], params["mortality_sd"]
+    if sd > 0 and mean > 0:
+        shape = (mean / sd) ** 2
+        mortality = rng.gamma(shape, mean / shape, size)
+    else:
+        mortality = np.full(size, mean)
+
+    weight = np.full(size, params["initial_weight"], dtype=np.float64)
+    harvest_day = np.full(size, days, dtype=np.int32)
+    harvest_weight = np.zeros(size)
+    harvested = np.zeros(size, dtype=bool)
+    over_capacity = np.zeros(size, dtype=bool)
+    band_days = np.arange(0, days + 1, BAND_STEP_DAYS)
+    band = np.zeros((size, band_days.size))
+
+    capacity_kg = params["capacity_kg"]
+    quantity = params["quantity"]
+    for day in range(1, days + 1):
+        sgr = params["intercept"] + params["slope"] * np.log(weight) + offsets
+        # Fish do not shrink on average over a day
+        weight *= np.exp(np.maximum(sgr, 0.0) / 100.0)
+
+        biomass = quantity * np.exp(-mortality * day) * weight / 1000.0
+        growing = ~harvested
+        if capacity_kg:
+            over_capacity |= growing & (biomass > capacity_kg)
+
+        reached = growing & (weight >= params["target_weight"])
+        harvest_day[reached] = day
+        harvest_weight[reached] = weight[reached]
+        harvested |= reached
+
+        if day % BAND_STEP_DAYS == 0:
+            # Harvested trajectories hold no standing biomass
+            band[:, day // BAND_STEP_DAYS] = np.where(harvested & ~reached, 0.0, biomass)
+
+    harvest_weight[~harvested] = weight[~harvested]
+    survival = np.exp(-mortality * harvest_day)
+    harvest_biomass = quantity * survival * harvest_weight / 1000.0
+    band[:, 0] = quantity * params["initial_weight"] / 1000.0
+
+    return {
+        "harvest_day": harvest_day,
+        "harvest_weight": harvest_weight,
+        "harvest_biomass": harvest_biomass,
+        "survival": survival,
+        "reached": harvested,
+        "over_capacity": over_capacity,
+        "band": band,
+    }
+
+
+def _pool(workers):
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        # Spawned workers import only this module, never the web app
+        _executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _executor_workers = workers
+    return _executor
+
+
+def _drop_pool(pool):
+    global _executor, _executor_workers
+    if _executor is pool:
+        _executor, _executor_workers = None, 0
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def simulate(params, trajectories, workers=1, seed=None, min_chunk=5000):
+    """
+    Run `trajectories` paths split into independent chunks (one seed each)
+    across `workers` processes, and merge the per-path results.
+    """
+    chunks = max(1, min(workers, trajectories // min_chunk))
+    sizes = [len(part) for part in np.array_split(np.arange(trajectories), chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(chunks)
+
+    if chunks == 1:
+        results = [run_chunk(params, sizes[0], seeds[0])]
+    else:
+        # A worker killed mid-run (e.g. by the OOM killer) breaks the whole
+        # pool for good: replace it and retry once on a fresh one
+        for attempt in range(2):
+            pool = _pool(workers)
+            try:
+                results = list(pool.map(run_chunk, [params] * chunks, sizes, seeds))
+                break
+            except BrokenProcessPool:
+                _drop_pool(pool)
+                if attempt:
+                    raise
+
+    return {
+        key: np.concatenate([result[key] for result in results])
+        for key in results[0]
+    }
+
+
+def percentile_bands(values, decimals=2):
+    return {
+        f"p{p}": round(float(v), decimals)
+        for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))
+    }
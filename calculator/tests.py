@@ -1,3 +1,58 @@
-from django.test import TestCase
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+from django.test import SimpleTestCase
+from calculator import simulation
 
-# Create your tests here.
+PARAMS = {
+    "max_days": 60,
+    "quantity": 1000,
+    "initial_weight": 10.0,
+    "target_weight": 200.0,
+    "intercept": 3.0,
+    "slope": -0.3,
+    "sgr_sd": 0.1,
+    "mortality_mean": 0.001,
+    "mortality_sd": 0.0005,
+    "capacity_kg": None,
+}
+
+
+class InlineExecutor:
+    """Runs map() in this process; `broken` ones fail like a dead worker."""
+
+    def __init__(self, broken=False, **kwargs):
+        self.broken = broken
+        self.shut_down = False
+
+    def map(self, function, *iterables):
+        if self.broken:
+            raise BrokenProcessPool("A child process terminated abruptly")
+        return map(function, *iterables)
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+class SimulatePoolTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.multiple(simulation, _executor=None, _executor_workers=0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_with(self, *executors):
+        with mock.patch.object(simulation, "ProcessPoolExecutor", side_effect=executors):
+            return simulation.simulate(PARAMS, 200, workers=2, seed=1, min_chunk=100)
+
+    def test_broken_pool_is_replaced(self):
+        broken, fresh = InlineExecutor(broken=True), InlineExecutor()
+        paths = self.run_with(broken, fresh)
+        self.assertEqual(paths["harvest_day"].shape, (200,))
+        self.assertTrue(broken.shut_down)
+        self.assertIs(simulation._executor, fresh)
+
+    def test_gives_up_after_second_broken_pool(self):
+        first, second = InlineExecutor(broken=True), InlineExecutor(broken=True)
+        with self.assertRaises(BrokenProcessPool):
+            self.run_with(first, second)
+        # The next run starts on a new pool
+        self.assertIsNone(simulation._executor)
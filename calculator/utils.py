@@ -1,4 +1,6 @@
+from array import array
 from decimal import Decimal, InvalidOperation
+import sys
 
 def calculate_sampling_from_batches(batch_size, batches):
     if batch_size <= 0:
@@ -30,3 +32,22 @@ def calculate_sampling_from_batches(batch_size, batches):
         "average_weight": round(average_weight, 2),
     }
 
+
+# Batch weights are stored as packed little-endian float32 so they can be
+# loaded straight into NumPy (np.frombuffer) without parsing.
+BATCH_WEIGHT_TYPECODE = "f"
+
+
+def pack_batch_weights(batches):
+    packed = array(BATCH_WEIGHT_TYPECODE, (float(weight) for weight in batches))
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_batch_weights(data):
+    unpacked = array(BATCH_WEIGHT_TYPECODE)
+    unpacked.frombytes(bytes(data))
+    if sys.byteorder != "little":
+        unpacked.byteswap()
+    return unpacked.tolist()
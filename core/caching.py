@@ -0,0 +1,30 @@
+from django.conf import settings
+
+# --------------------
+# Shared vs per-process cache
+# --------------------
+# Invalidating by deleting / bumping a cache key only reaches other workers
+# when they read the same cache (Redis, Memcached, database). With the
+# default per-process LocMem cache, entries that are invalidated on change
+# must also expire on their own, after LOCAL_CACHE_TIMEOUT seconds.
+
+LOCAL_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+LOCAL_CACHE_TIMEOUT = getattr(settings, "LOCAL_CACHE_TIMEOUT", 60)
+
+
+def cache_is_shared(alias="default"):
+    return settings.CACHES[alias]["BACKEND"] not in LOCAL_BACKENDS
+
+
+def invalidated_timeout(timeout=None, alias="default"):
+    """
+    Timeout for an entry that is invalidated on change: `timeout` (None =
+    never expire) with a shared cache, at most LOCAL_CACHE_TIMEOUT otherwise.
+    """
+    if cache_is_shared(alias):
+        return timeout
+    return LOCAL_CACHE_TIMEOUT if timeout is None else min(timeout, LOCAL_CACHE_TIMEOUT)
@@ -38,3 +38,43 @@ class FishSpecies(models.Model):
         if self.user:
             return f"{self.name} (custom)"
         return f"{self.name} (default)"
+
+
+class SearchTerm(models.Model):
+    """
+    Prefix index for typeahead search. One row per searchable token,
+    kept in sync by signals; see core.search.
+    """
+    POND = "pond"
+    SPECIES = "species"
+    STOCK = "stock"
+
+    KIND_CHOICES = [
+        (POND, "Pond"),
+        (SPECIES, "Species"),
+        (STOCK, "Stock"),
+    ]
+
+    # NULL = visible to everyone (global species)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+"
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    # Optional grouping, e.g. the pond of a stock
+    parent_id = models.PositiveIntegerField(null=True, blank=True)
+    label = models.CharField(max_length=200)
+    term = models.CharField(max_length=200)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "term"], name="search_user_term_idx"),
+            models.Index(fields=["kind", "object_id"], name="search_object_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.term} → {self.label}"
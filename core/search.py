@@ -0,0 +1,101 @@
+import re
+from django.db.models import Q
+from core.models import SearchTerm
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+MAX_TERM_LENGTH = 200
+MAX_LIMIT = 50
+
+
+def normalize(text):
+    return " ".join(TOKEN_RE.findall((text or "").lower()))
+
+
+def _terms(texts):
+    terms = set()
+    for text in texts:
+        normalized = normalize(text)
+        if not normalized:
+            continue
+        # Whole phrase for multi-word prefixes, plus each word on its own
+        terms.add(normalized[:MAX_TERM_LENGTH])
+        terms.update(word[:MAX_TERM_LENGTH] for word in normalized.split())
+    return terms
+
+
+def index_object(kind, object_id, label, texts, user=None, parent_id=None):
+    remove_object(kind, object_id)
+    SearchTerm.objects.bulk_create([
+        SearchTerm(
+            user=user,
+            kind=kind,
+            object_id=object_id,
+            parent_id=parent_id,
+            label=label[:200],
+            term=term,
+        )
+        for term in _terms(texts)
+    ])
+
+
+def remove_object(kind, object_id):
+    SearchTerm.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def remove_objects(kind, object_ids):
+    SearchTerm.objects.filter(kind=kind, object_id__in=object_ids).delete()
+
+
+def index_pond(pond):
+    index_object(SearchTerm.POND, pond.pk, pond.name, [pond.name], user=pond.user)
+
+
+def index_species(species):
+    index_object(
+        SearchTerm.SPECIES,
+        species.pk,
+        species.name,
+        [species.name],
+        user=species.user,
+    )
+
+
+def search(user, query, kinds=None, parent_id=None, limit=10):
+    """
+    Top-`limit` prefix matches visible to `user`.
+    Uses a range scan on (user, term) so it never touches the whole table.
+    """
+    prefix = normalize(query)
+    if not prefix:
+        return []
+
+    limit = max(1, min(int(limit), MAX_LIMIT))
+
+    queryset = SearchTerm.objects.filter(
+        Q(user=user) | Q(user__isnull=True),
+        term__gte=prefix,
+        term__lt=prefix + "\uffff",
+    )
+    if kinds:
+        queryset = queryset.filter(kind__in=kinds)
+    if parent_id:
+        queryset = queryset.filter(parent_id=parent_id)
+
+    rows = (
+        queryset
+        .order_by("term")
+        .values_list("kind", "object_id", "label")
+    )
+
+    # An object can match on several tokens; over-fetch then de-duplicate
+    results = []
+    seen = set()
+    for kind, object_id, label in rows[:limit * 4]:
+        if (kind, object_id) in seen:
+            continue
+        seen.add((kind, object_id))
+        results.append({"type": kind, "id": object_id, "label": label})
+        if len(results) == limit:
+            break
+
+    return results
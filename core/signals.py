@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core.models import FishSpecies, Pond, SearchTerm
+from core.search import index_pond, index_species, remove_object
+
+
+@receiver(post_save, sender=Pond)
+def pond_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_pond(instance)
+
+
+@receiver(post_delete, sender=Pond)
+def pond_deleted(sender, instance, **kwargs):
+    remove_object(SearchTerm.POND, instance.pk)
+
+
+@receiver(post_save, sender=FishSpecies)
+def species_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_species(instance)
+
+
+@receiver(post_delete, sender=FishSpecies)
+def species_deleted(sender, instance, **kwargs):
+    remove_object(SearchTerm.SPECIES, instance.pk)
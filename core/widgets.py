@@ -0,0 +1,36 @@
+from django import forms
+from django.urls import reverse_lazy
+
+
+class TypeaheadSelect(forms.Widget):
+    """
+    Replaces a <select> that would list every object with a search box
+    backed by the /api/search/ endpoint. Only the selected object is loaded.
+    """
+    template_name = "core/widgets/typeahead_select.html"
+    search_url = reverse_lazy("api-search")
+
+    def __init__(self, kind, depends_on=None, attrs=None):
+        self.kind = kind
+        self.depends_on = depends_on
+        super().__init__(attrs)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"].update({
+            "kind": self.kind,
+            "depends_on": self.depends_on,
+            "search_url": self.search_url,
+            "label": self._selected_label(value),
+        })
+        return context
+
+    def _selected_label(self, value):
+        if value in (None, ""):
+            return ""
+        # Set by ModelChoiceField
+        queryset = getattr(getattr(self, "choices", None), "queryset", None)
+        if queryset is None:
+            return ""
+        obj = queryset.filter(pk=value).first()
+        return str(obj) if obj else ""
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     'sampling',
     'calculator',
     'api',
+    'telemetry',
 ]
 
 MIDDLEWARE = [
@@ -126,6 +127,17 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": 
         "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 5,
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.ORJSONRenderer",
+        "api.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "rest_framework.parsers.JSONParser",
+        "api.renderers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 LOGIN_REDIRECT_URL = "/sampling/dashboard/"
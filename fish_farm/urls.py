@@ -21,6 +21,8 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path("", include("core.urls")),
     path("sampling/", include("sampling.urls")),
+    path("api/telemetry/", include("telemetry.api_urls")),
+    path("api/batch/", include("api.api_urls")),
     path("api/", include("sampling.api_urls")),
     path("accounts/", include("django.contrib.auth.urls")),
 ]
@@ -1,5 +1,69 @@
+import csv
 from django.contrib import admin
-from sampling.models import FishSampling
+from django.core.paginator import Paginator
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
+from sampling.archive import restore_stocks
+from sampling.growth import with_growth_status
+from sampling.models import (
+    SAMPLING_STATUSES,
+    AlertRule,
+    ArchivedPondFishStock,
+    FeedEvent,
+    FishSampling,
+    GrowthAlert,
+    GrowthAnomaly,
+    GrowthThresholdProfile,
+    ReferenceGrowthCurve,
+    StockFeedSummary,
+)
+
+
+class CappedCountPaginator(Paginator):
+    """
+    Counts at most COUNT_CAP rows (COUNT over a LIMITed subquery), so the
+    changelist never scans a whole large table just to number its pages.
+    Narrow further with filters / date hierarchy to reach older rows.
+    """
+    COUNT_CAP = 10000
+
+    @cached_property
+    def count(self):
+        return self.object_list.order_by().values("pk")[:self.COUNT_CAP].count()
+
+
+class _Echo:
+    """File-like object that hands each written line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def streaming_csv_response(filename, header, rows):
+    writer = csv.writer(_Echo())
+    lines = (writer.writerow(row) for row in _with_header(header, rows))
+    response = StreamingHttpResponse(lines, content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _with_header(header, rows):
+    yield header
+    yield from rows
+
+
+class GrowthStatusFilter(admin.SimpleListFilter):
+    title = "growth status"
+    parameter_name = "growth_status"
+
+    def lookups(self, request, model_admin):
+        return [(status, status.title()) for status in SAMPLING_STATUSES]
+
+    def queryset(self, request, queryset):
+        # db_growth_status is annotated in FishSamplingAdmin.get_queryset
+        if self.value():
+            return queryset.filter(db_growth_status=self.value())
+        return queryset
 
 
 @admin.register(FishSampling)
@@ -12,8 +76,15 @@ class FishSamplingAdmin(admin.ModelAdmin):
         "average_weight_display",
         "growth_from_previous_display",
         "growth_percentage_display",
-        "growth_status",
+        "growth_status_display",
     )
+    list_select_related = ("fish_stock__pond", "fish_stock__species")
+    list_filter = (GrowthStatusFilter,)
+    date_hierarchy = "sampled_on"
+    ordering = ("-sampled_on", "-id")
+    paginator = CappedCountPaginator
+    show_full_result_count = False
+    actions = ["export_csv"]
 
     readonly_fields = (
     "sample_fish_count",
@@ -22,20 +93,183 @@ class FishSamplingAdmin(admin.ModelAdmin):
     "growth_from_previous",
     "growth_percentage",
     "growth_status",
+    "batch_size",
+    "batch_weights_display",
+    "batch_stats_display",
 )
 
+    def get_queryset(self, request):
+        # Growth columns come from SQL instead of per-row previous-sampling queries.
+        # The packed batch weights (and their CV) are only decoded on the change
+        # form, so changelist rows do not carry the blob
+        return with_growth_status(super().get_queryset(request)).defer("batch_weights")
 
     def average_weight_display(self, obj):
-        return obj.average_weight
+        return obj.db_average_weight
 
     average_weight_display.short_description = "Avg Weight (g)"
+    average_weight_display.admin_order_field = "average_weight"
 
     def growth_from_previous_display(self, obj):
-        return obj.growth_from_previous
+        return obj.db_growth_from_previous
 
     growth_from_previous_display.short_description = "Growth (g)"
+    growth_from_previous_display.admin_order_field = "growth_from_previous"
 
     def growth_percentage_display(self, obj):
-        return obj.growth_percentage
+        return obj.db_growth_percentage
 
     growth_percentage_display.short_description = "Growth (%)"
+    growth_percentage_display.admin_order_field = "growth_percentage"
+
+    def growth_status_display(self, obj):
+        return obj.db_growth_status
+
+    growth_status_display.short_description = "Growth status"
+    growth_status_display.admin_order_field = "db_growth_status"
+
+    def batch_weights_display(self, obj):
+        return ", ".join(f"{weight:g}" for weight in obj.batch_weight_list)
+
+    batch_weights_display.short_description = "Batch weights (g)"
+
+    def batch_stats_display(self, obj):
+        stats = obj.batch_stats()
+        if not stats:
+            return None
+        return (
+            f"n={stats['batch_count']}, mean={stats['mean']} g, "
+            f"sd={stats['std_dev']} g, CV={stats['cv_percentage']}%, "
+            f"range={stats['min']}–{stats['max']} g"
+        )
+
+    batch_stats_display.short_description = "Per-fish weight distribution"
+
+    @admin.action(description="Export selected samplings to CSV")
+    def export_csv(self, request, queryset):
+        rows = (
+            queryset
+            .order_by("-sampled_on", "-id")
+            .values_list(
+                "id",
+                "fish_stock__pond__name",
+                "fish_stock__species__name",
+                "fish_stock_id",
+                "sampled_on",
+                "sample_fish_count",
+                "sample_total_weight",
+                "db_average_weight",
+                "db_growth_from_previous",
+                "db_growth_percentage",
+                "db_growth_status",
+            )
+            .iterator(chunk_size=2000)
+        )
+        return streaming_csv_response(
+            "samplings.csv",
+            [
+                "id",
+                "pond",
+                "species",
+                "fish_stock",
+                "sampled_on",
+                "sample_fish_count",
+                "sample_total_weight",
+                "average_weight",
+                "growth_from_previous",
+                "growth_percentage",
+                "growth_status",
+            ],
+            rows,
+        )
+
+
+@admin.register(GrowthAnomaly)
+class GrowthAnomalyAdmin(admin.ModelAdmin):
+    list_display = (
+        "fish_stock",
+        "sampling",
+        "daily_growth_rate",
+        "stock_zscore",
+        "species_zscore",
+        "detected_at",
+    )
+    list_select_related = ("sampling", "fish_stock__pond", "fish_stock__species")
+
+
+@admin.register(GrowthThresholdProfile)
+class GrowthThresholdProfileAdmin(admin.ModelAdmin):
+    list_display = (
+        "__str__",
+        "sampling_good",
+        "sampling_average",
+        "overall_excellent",
+        "overall_good",
+        "overall_average",
+        "carrying_capacity_kg_per_acre",
+        "early_sampling_interval_days",
+        "sampling_interval_days",
+    )
+    list_select_related = ("species",)
+
+
+@admin.register(AlertRule)
+class AlertRuleAdmin(admin.ModelAdmin):
+    list_display = ("name", "kind", "threshold", "consecutive", "species", "user", "active")
+    list_filter = ("kind", "active")
+    list_select_related = ("species", "user")
+
+
+@admin.register(GrowthAlert)
+class GrowthAlertAdmin(admin.ModelAdmin):
+    list_display = ("message", "user", "created_at", "read_at")
+    list_select_related = ("user",)
+    list_filter = ("rule",)
+    date_hierarchy = "created_at"
+    raw_id_fields = ("fish_stock", "sampling")
+
+
+@admin.register(FeedEvent)
+class FeedEventAdmin(admin.ModelAdmin):
+    list_display = ("fish_stock", "fed_on", "quantity_kg")
+    list_select_related = ("fish_stock__pond", "fish_stock__species")
+    date_hierarchy = "fed_on"
+
+
+@admin.register(StockFeedSummary)
+class StockFeedSummaryAdmin(admin.ModelAdmin):
+    list_display = ("fish_stock", "feed_events", "total_feed_kg", "biomass_gain_kg", "fcr", "updated_at")
+    list_select_related = ("fish_stock__pond", "fish_stock__species")
+    readonly_fields = ("feed_events", "total_feed_kg", "biomass_gain_kg", "fcr")
+
+
+@admin.register(ReferenceGrowthCurve)
+class ReferenceGrowthCurveAdmin(admin.ModelAdmin):
+    list_display = ("species", "pond", "user", "cycles", "days", "updated_at")
+    list_select_related = ("species", "pond", "user")
+    exclude = ("bands",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedPondFishStock)
+class ArchivedPondFishStockAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "user", "stocked_on", "closed_on", "archived_at")
+    list_select_related = ("user", "pond", "species")
+    date_hierarchy = "closed_on"
+    actions = ["restore"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description="Restore selected stocks to the live tables")
+    def restore(self, request, queryset):
+        count = restore_stocks(list(queryset.values_list("pk", flat=True)))
+        self.message_user(request, f"Restored {count} stocks.")
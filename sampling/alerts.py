@@ -0,0 +1,165 @@
+from django.db import transaction
+from django.utils import timezone
+from sampling.cohorts import BEHIND, compare_to_cohort, reference_curves
+from sampling.live import publish_on_commit
+from sampling.models import (
+    POOR,
+    AlertRule,
+    FishSampling,
+    GrowthAlert,
+    StockAlertState,
+)
+
+# --------------------
+# Growth alert rules
+# --------------------
+# Each AlertRule is a per-sampling condition; it fires when `consecutive`
+# samplings of a stock in a row match it. StockAlertState keeps the streak
+# of every rule and the last sampling's date / weight, so a new sampling is
+# scored with a constant number of queries whatever the stock's history.
+# Samplings inserted before the latest one, edits and deletes replay the
+# stock's history into fresh streaks instead (without firing).
+
+
+def _matches(rule, sampling, cohort):
+    if rule.kind == AlertRule.POOR_STATUS:
+        return sampling.growth_status == POOR
+
+    if rule.kind == AlertRule.GROWTH_BELOW:
+        return sampling.growth_percentage is not None and sampling.growth_percentage < rule.threshold
+
+    if rule.kind == AlertRule.WEIGHT_LOSS:
+        return (
+            sampling.growth_from_previous is not None
+            and -sampling.growth_from_previous > (rule.threshold or 0)
+        )
+
+    if rule.kind == AlertRule.BEHIND_COHORT:
+        return cohort is not None and cohort["position"] == BEHIND
+
+    return False
+
+
+def _cohort(rules, sampling):
+    # Only looked up when a rule needs it (cached curves, O(1) lookup)
+    if not any(rule.kind == AlertRule.BEHIND_COHORT for rule in rules):
+        return None
+    stock = sampling.fish_stock
+    return compare_to_cohort(
+        reference_curves(sampling.user_id),
+        stock.species_id,
+        stock.pond_id,
+        (sampling.sampled_on - stock.stocked_on).days,
+        sampling.average_weight,
+    )
+
+
+def _message(rule, sampling, cohort):
+    stock = sampling.fish_stock
+    if rule.kind == AlertRule.POOR_STATUS:
+        detail = f"{rule.consecutive} POOR sampling(s) in a row"
+    elif rule.kind == AlertRule.GROWTH_BELOW:
+        detail = f"growth {sampling.growth_percentage}% is below {rule.threshold}%"
+    elif rule.kind == AlertRule.WEIGHT_LOSS:
+        detail = f"average weight fell by {-sampling.growth_from_previous} g"
+    else:
+        detail = f"at percentile {cohort['percentile']} of past cycles on day {cohort['day']}"
+    return f"{rule.name}: {stock} on {sampling.sampled_on} ({detail})"
+
+
+def _advance(streaks, rules, sampling, cohort):
+    """Update `streaks` in place; returns the rules whose streak just reached their count."""
+    fired = []
+    for rule in rules:
+        key = str(rule.pk)
+        streak = streaks.get(key, 0) + 1 if _matches(rule, sampling, cohort) else 0
+        streaks[key] = streak
+        if streak == rule.consecutive:
+            fired.append(rule)
+    return fired
+
+
+@transaction.atomic
+def evaluate_sampling(sampling):
+    """Score a new sampling against the stock's rules; returns the alerts fired."""
+    stock = sampling.fish_stock
+    state, _ = (
+        StockAlertState.objects
+        .select_for_update()
+        .get_or_create(fish_stock=stock)
+    )
+
+    if state.last_sampled_on and sampling.sampled_on < state.last_sampled_on:
+        # Backdated: the streaks after it are no longer in order
+        rebuild_alert_state(stock.pk)
+        return []
+
+    rules = AlertRule.for_stock(sampling.user_id, stock.species_id)
+    cohort = _cohort(rules, sampling)
+    fired = _advance(state.streaks, rules, sampling, cohort)
+
+    state.last_sampled_on = sampling.sampled_on
+    state.last_average_weight = sampling.average_weight
+    state.save()
+
+    alerts = GrowthAlert.objects.bulk_create([
+        GrowthAlert(
+            user_id=sampling.user_id,
+            fish_stock=stock,
+            sampling=sampling,
+            rule=rule,
+            message=_message(rule, sampling, cohort),
+        )
+        for rule in fired
+    ])
+    for alert in alerts:
+        publish_on_commit(sampling.user_id, {
+            "type": "alert",
+            "alert": {
+                "rule": alert.rule.name,
+                "fish_stock": stock.pk,
+                "sampling": sampling.pk,
+                "message": alert.message,
+            },
+        })
+    return alerts
+
+
+@transaction.atomic
+def rebuild_alert_state(stock_id, create=True):
+    """
+    Replay a stock's samplings in date order into fresh streaks. With
+    create=False a stock without state is left alone (it may be mid-delete).
+    """
+    state = StockAlertState.objects.select_for_update().filter(fish_stock_id=stock_id).first()
+    if state is None:
+        if not create:
+            return None
+        state = StockAlertState(fish_stock_id=stock_id)
+
+    samplings = list(
+        FishSampling.objects
+        .filter(fish_stock_id=stock_id)
+        .select_related("fish_stock")
+        .order_by("sampled_on", "pk")
+    )
+    streaks = {}
+    if samplings:
+        stock = samplings[0].fish_stock
+        rules = AlertRule.for_stock(stock.user_id, stock.species_id)
+        for sampling in samplings:
+            _advance(streaks, rules, sampling, _cohort(rules, sampling))
+
+    last = samplings[-1] if samplings else None
+    state.streaks = streaks
+    state.last_sampled_on = last and last.sampled_on
+    state.last_average_weight = last and last.average_weight
+    state.save()
+    return state
+
+
+def mark_alerts_read(user, ids=None):
+    alerts = GrowthAlert.objects.filter(user=user, read_at__isnull=True)
+    if ids is not None:
+        alerts = alerts.filter(pk__in=ids)
+    return alerts.update(read_at=timezone.now())
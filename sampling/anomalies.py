@@ -0,0 +1,202 @@
+from django.conf import settings
+from django.db import transaction
+from sampling.models import (
+    FishSampling,
+    GrowthAnomaly,
+    PondFishStock,
+    SpeciesGrowthStats,
+    StockGrowthStats,
+)
+
+# |z| at or above this is flagged as an anomaly
+Z_THRESHOLD = getattr(settings, "GROWTH_ANOMALY_Z_THRESHOLD", 3.0)
+
+# Minimum observations before a baseline is trusted
+MIN_OBSERVATIONS = getattr(settings, "GROWTH_ANOMALY_MIN_OBSERVATIONS", 5)
+
+
+def daily_growth_rate(sampling):
+    """
+    Growth in % per day since the previous sampling
+    (or since stocking for the first sampling).
+    """
+    return _rate(sampling.fish_stock, sampling.previous_sampling, sampling)
+
+
+def _rate(stock, previous, sampling):
+    if previous and previous.average_weight is not None:
+        base_weight = previous.average_weight
+        base_date = previous.sampled_on
+    else:
+        base_weight = stock.initial_avg_weight
+        base_date = stock.stocked_on
+
+    days = (sampling.sampled_on - base_date).days
+    if not base_weight or days <= 0 or sampling.average_weight is None:
+        return None
+
+    growth = (sampling.average_weight - base_weight) / base_weight
+    return float(growth) * 100 / days
+
+
+def _stock_growth_rates(stock):
+    """(sampling, daily growth rate) for every sampling of a stock in date order, in one query."""
+    previous = None  # last sampling of the latest earlier day
+    day_last = None
+    for sampling in FishSampling.objects.filter(fish_stock=stock).order_by("sampled_on", "pk"):
+        if day_last is not None and sampling.sampled_on != day_last.sampled_on:
+            previous = day_last
+        day_last = sampling
+        yield sampling, _rate(stock, previous, sampling)
+
+
+def _is_outlier(stats, zscore):
+    return (
+        zscore is not None
+        and stats.count >= MIN_OBSERVATIONS
+        and abs(zscore) >= Z_THRESHOLD
+    )
+
+
+def _locked_stats(stock):
+    stock_stats, _ = (
+        StockGrowthStats.objects
+        .select_for_update()
+        .get_or_create(fish_stock=stock)
+    )
+    species_stats, _ = (
+        SpeciesGrowthStats.objects
+        .select_for_update()
+        .get_or_create(user_id=stock.user_id, species_id=stock.species_id)
+    )
+    return stock_stats, species_stats
+
+
+def _observe(sampling, rate, stock_stats, species_stats):
+    """Score `rate` against the baselines, then fold it in; an unsaved anomaly or None."""
+    # Score against the baseline *before* this observation is added
+    stock_z = stock_stats.zscore(rate)
+    species_z = species_stats.zscore(rate)
+
+    anomaly = None
+    if _is_outlier(stock_stats, stock_z) or _is_outlier(species_stats, species_z):
+        anomaly = GrowthAnomaly(
+            user_id=sampling.user_id,
+            fish_stock_id=sampling.fish_stock_id,
+            sampling=sampling,
+            daily_growth_rate=rate,
+            stock_zscore=stock_z,
+            species_zscore=species_z,
+        )
+
+    stock_stats.push(rate)
+    species_stats.push(rate)
+    return anomaly
+
+
+@transaction.atomic
+def record_growth_observation(sampling):
+    """
+    Score a new latest sampling against the running stock / species
+    baselines, store an anomaly if it is an outlier, then fold it into the
+    baselines. Costs a constant number of queries regardless of history length.
+    """
+    rate = daily_growth_rate(sampling)
+    if rate is None:
+        return None
+
+    stock_stats, species_stats = _locked_stats(sampling.fish_stock)
+    anomaly = _observe(sampling, rate, stock_stats, species_stats)
+    if anomaly is not None:
+        anomaly.save()
+    stock_stats.save()
+    species_stats.save()
+    return anomaly
+
+
+@transaction.atomic
+def rebuild_stock_growth_stats(stock_id):
+    """
+    Replay one stock's samplings in date order into fresh stock stats and
+    anomalies, for edits, deletes and backdated inserts, which change the
+    rates of later samplings too. The stock's old observations are taken
+    out of the species baseline and the replayed ones put back, so no
+    other stock is replayed.
+    """
+    stock = PondFishStock.objects.filter(pk=stock_id).first()
+    if stock is None:
+        return None
+
+    stock_stats, species_stats = _locked_stats(stock)
+    species_stats.discard(stock_stats)
+    stock_stats.reset()
+    GrowthAnomaly.objects.filter(fish_stock=stock).delete()
+
+    anomalies = []
+    for sampling, rate in _stock_growth_rates(stock):
+        if rate is None:
+            continue
+        anomaly = _observe(sampling, rate, stock_stats, species_stats)
+        if anomaly is not None:
+            anomalies.append(anomaly)
+
+    GrowthAnomaly.objects.bulk_create(anomalies)
+    stock_stats.save()
+    species_stats.save()
+    return stock_stats
+
+
+@transaction.atomic
+def discard_stock_growth_stats(stock_ids):
+    """
+    Take whole stocks out of their species baselines, before they leave
+    the hot tables (archiving); their own stats go with the stocks.
+    """
+    stock_stats = (
+        StockGrowthStats.objects
+        .select_for_update()
+        .filter(fish_stock_id__in=stock_ids, count__gt=0)
+        .select_related("fish_stock")
+    )
+    species = {}
+    for stats in stock_stats:
+        key = (stats.fish_stock.user_id, stats.fish_stock.species_id)
+        if key not in species:
+            species[key] = (
+                SpeciesGrowthStats.objects
+                .select_for_update()
+                .filter(user_id=key[0], species_id=key[1])
+                .first()
+            )
+        if species[key] is not None:
+            species[key].discard(stats)
+
+    for species_stats in species.values():
+        if species_stats is not None:
+            species_stats.save()
+
+
+def rebuild_growth_stats(user=None):
+    """
+    Replay sampling history in date order to rebuild baselines and anomalies.
+    Only needed once for data that predates the anomaly engine.
+    """
+    stats_filter = {"fish_stock__user": user} if user else {}
+    species_filter = {"user": user} if user else {}
+
+    StockGrowthStats.objects.filter(**stats_filter).delete()
+    SpeciesGrowthStats.objects.filter(**species_filter).delete()
+    GrowthAnomaly.objects.filter(**species_filter).delete()
+
+    samplings = (
+        FishSampling.objects
+        .filter(**species_filter)
+        .select_related("fish_stock")
+        .order_by("sampled_on", "id")
+    )
+
+    count = 0
+    for sampling in samplings.iterator():
+        record_growth_observation(sampling)
+        count += 1
+    return count
@@ -1,12 +1,24 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils import timezone
 from rest_framework import serializers
-from sampling.models import FishSampling, PondFishStock
+from core.models import FishSpecies, Pond
+from sampling.models import (
+    AlertRule,
+    FeedEvent,
+    FishSampling,
+    GrowthAlert,
+    GrowthAnomaly,
+    PondFishStock,
+    StockFeedSummary,
+)
 from sampling.services import create_sampling_from_batches
+from sampling.simulation import DEFAULT_MAX_DAYS, DEFAULT_TRAJECTORIES, MAX_TRAJECTORIES
 
 class PondFishStockSerializer(serializers.ModelSerializer):
     display_name = serializers.SerializerMethodField()
     pond_name = serializers.CharField(source="pond.name", read_only=True)
     species_name = serializers.CharField(source="species.name", read_only=True)
+    overall_growth_status = serializers.CharField(read_only=True)
 
     class Meta:
         model = PondFishStock
@@ -21,6 +33,8 @@ class PondFishStockSerializer(serializers.ModelSerializer):
             "initial_avg_weight",
             "stocked_on",
             "status",
+            "next_sampling_due",
+            "overall_growth_status",
         ]
         read_only_fields = ["status"]
 
@@ -59,6 +73,7 @@ class FishSamplingSerializer(serializers.ModelSerializer):
     growth_from_previous = serializers.SerializerMethodField()
     growth_percentage = serializers.SerializerMethodField()
     growth_status = serializers.SerializerMethodField()
+    batch_stats = serializers.SerializerMethodField()
 
     class Meta:
         model = FishSampling
@@ -72,6 +87,8 @@ class FishSamplingSerializer(serializers.ModelSerializer):
             "growth_from_previous",
             "growth_percentage",
             "growth_status",
+            "batch_size",
+            "batch_stats",
         ]
 
     def get_average_weight(self, obj):
@@ -86,6 +103,9 @@ class FishSamplingSerializer(serializers.ModelSerializer):
     def get_growth_status(self, obj):
         return obj.growth_status
 
+    def get_batch_stats(self, obj):
+        return obj.batch_stats()
+
 
 class FishSamplingCreateSerializer(serializers.Serializer):
     fish_stock = serializers.PrimaryKeyRelatedField(
@@ -99,6 +119,13 @@ class FishSamplingCreateSerializer(serializers.Serializer):
         write_only=True,
     )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request:
+            # 🔒 Only the caller's stocks
+            self.fields["fish_stock"].queryset = PondFishStock.objects.filter(user=request.user)
+
     def validate_sampled_on(self, value):
         if value > timezone.now().date():
             raise serializers.ValidationError(
@@ -119,11 +146,193 @@ class FishSamplingCreateSerializer(serializers.Serializer):
         return attrs
 
     def create(self, validated_data):
-        return create_sampling_from_batches(
-            fish_stock=validated_data["fish_stock"],
-            sampled_on=validated_data["sampled_on"],
-            batch_size=validated_data["batch_size"],
-            batches=validated_data["batches"],
-        )
+        try:
+            return create_sampling_from_batches(
+                user=validated_data["user"],
+                fish_stock=validated_data["fish_stock"],
+                sampled_on=validated_data["sampled_on"],
+                batch_size=validated_data["batch_size"],
+                batches=validated_data["batches"],
+            )
+        except DjangoValidationError as exc:
+            # Model checks (closed stock, date before stocking, ...)
+            raise serializers.ValidationError(exc.messages)
+
+
+class GrowthAnomalySerializer(serializers.ModelSerializer):
+    fish_stock_name = serializers.SerializerMethodField()
+    sampled_on = serializers.DateField(source="sampling.sampled_on", read_only=True)
+
+    class Meta:
+        model = GrowthAnomaly
+        fields = [
+            "id",
+            "fish_stock",
+            "fish_stock_name",
+            "sampling",
+            "sampled_on",
+            "daily_growth_rate",
+            "stock_zscore",
+            "species_zscore",
+            "detected_at",
+        ]
+
+    def get_fish_stock_name(self, obj):
+        return str(obj.fish_stock)
+
+
+class GrowthAlertSerializer(serializers.ModelSerializer):
+    fish_stock_name = serializers.SerializerMethodField()
+    rule_name = serializers.CharField(source="rule.name", read_only=True)
+    kind = serializers.CharField(source="rule.kind", read_only=True)
+    sampled_on = serializers.DateField(source="sampling.sampled_on", read_only=True)
+
+    class Meta:
+        model = GrowthAlert
+        fields = [
+            "id",
+            "rule",
+            "rule_name",
+            "kind",
+            "fish_stock",
+            "fish_stock_name",
+            "sampling",
+            "sampled_on",
+            "message",
+            "created_at",
+            "read_at",
+        ]
+
+    def get_fish_stock_name(self, obj):
+        return str(obj.fish_stock)
 
 
+class AlertRuleSerializer(serializers.ModelSerializer):
+    # Farm-wide rules (no user) are listed but owned by the admin
+    shared = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AlertRule
+        fields = [
+            "id",
+            "name",
+            "kind",
+            "species",
+            "threshold",
+            "consecutive",
+            "active",
+            "shared",
+        ]
+
+    def get_shared(self, obj):
+        return obj.user_id is None
+
+    def validate(self, attrs):
+        try:
+            AlertRule(**attrs).clean()
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(exc.messages)
+        return attrs
+
+
+class FeedEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = FeedEvent
+        fields = [
+            "id",
+            "fish_stock",
+            "fed_on",
+            "quantity_kg",
+            "notes",
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request:
+            # 🔒 Only the caller's active stocks
+            self.fields["fish_stock"].queryset = PondFishStock.objects.filter(
+                user=request.user,
+                status=PondFishStock.ACTIVE
+            )
+
+    def validate_quantity_kg(self, value):
+        if value <= 0:
+            raise serializers.ValidationError(
+                "Feed quantity must be greater than zero."
+            )
+        return value
+
+    def validate(self, attrs):
+        fish_stock = attrs.get("fish_stock")
+        fed_on = attrs.get("fed_on")
+
+        if fed_on and fed_on > timezone.now().date():
+            raise serializers.ValidationError(
+                "Feed date cannot be in the future."
+            )
+
+        if fish_stock and fed_on and fed_on < fish_stock.stocked_on:
+            raise serializers.ValidationError(
+                "Feed date cannot be before stock date."
+            )
+        return attrs
+
+
+class StockFeedSummarySerializer(serializers.ModelSerializer):
+    fish_stock_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = StockFeedSummary
+        fields = [
+            "fish_stock",
+            "fish_stock_name",
+            "feed_events",
+            "total_feed_kg",
+            "biomass_gain_kg",
+            "fcr",
+            "updated_at",
+        ]
+
+    def get_fish_stock_name(self, obj):
+        return str(obj.fish_stock)
+
+
+class StockingSimulationSerializer(serializers.Serializer):
+    """Inputs of a what-if run for a proposed stock."""
+    species = serializers.PrimaryKeyRelatedField(queryset=FishSpecies.objects.all())
+    pond = serializers.PrimaryKeyRelatedField(queryset=Pond.objects.all(), required=False)
+    area_acres = serializers.DecimalField(max_digits=6, decimal_places=2, required=False)
+    quantity = serializers.IntegerField(min_value=1)
+    initial_avg_weight = serializers.DecimalField(max_digits=8, decimal_places=2)
+    target_weight = serializers.DecimalField(max_digits=8, decimal_places=2)
+    stocked_on = serializers.DateField(required=False)
+    trajectories = serializers.IntegerField(
+        min_value=100,
+        max_value=MAX_TRAJECTORIES,
+        default=DEFAULT_TRAJECTORIES,
+    )
+    max_days = serializers.IntegerField(min_value=7, max_value=730, default=DEFAULT_MAX_DAYS)
+    mortality_daily_pct = serializers.FloatField(min_value=0, max_value=10, required=False)
+    mortality_daily_pct_sd = serializers.FloatField(min_value=0, max_value=10, required=False)
+    seed = serializers.IntegerField(min_value=0, required=False)
+
+    def validate_species(self, value):
+        user = self.context["request"].user
+        if value.user_id not in (None, user.pk):
+            raise serializers.ValidationError("Unknown species.")
+        return value
+
+    def validate_pond(self, value):
+        if value.user_id != self.context["request"].user.pk:
+            raise serializers.ValidationError("Unknown pond.")
+        return value
+
+    def validate(self, attrs):
+        if attrs["initial_avg_weight"] <= 0:
+            raise serializers.ValidationError("Initial weight must be greater than zero.")
+        if attrs["target_weight"] <= attrs["initial_avg_weight"]:
+            raise serializers.ValidationError("Target weight must exceed the initial weight.")
+        if "pond" in attrs and "area_acres" not in attrs:
+            attrs["area_acres"] = attrs["pond"].area_acres
+        return attrs
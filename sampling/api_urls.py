@@ -1,5 +1,30 @@
 from django.urls import path
-from sampling.api_views import FishSamplingCreateAPI, FishSamplingListAPI, FishSamplingDetailAPI, PondStockListCreateAPI, PondStockCloseAPI
+from sampling.api_views import (
+    FishSamplingCreateAPI,
+    FishSamplingListAPI,
+    FishSamplingDetailAPI,
+    PondStockListCreateAPI,
+    PondStockCloseAPI,
+    GrowthAnomalyListAPI,
+    SearchAPI,
+    GrowthStatusSummaryAPI,
+    StockLeaderboardAPI,
+    StockProjectionAPI,
+    FeedEventListCreateAPI,
+    FeedConversionListAPI,
+    SamplingHistoryAPI,
+    StockingDensityAPI,
+    StockingSimulationAPI,
+    SampleSizePlanAPI,
+    SamplingExportAPI,
+    ReferenceCurveAPI,
+    CohortComparisonAPI,
+    GrowthAlertListAPI,
+    GrowthAlertReadAPI,
+    AlertRuleListCreateAPI,
+    SamplingCalendarAPI,
+    SamplingRouteAPI,
+)
 
 urlpatterns = [
     path("samplings/", FishSamplingListAPI.as_view(), name="api-samplings"),
@@ -15,4 +40,23 @@ urlpatterns = [
     ),
     path("stocks/", PondStockListCreateAPI.as_view(), name="api-stock-list-create"),
     path("stocks/<int:pk>/close/", PondStockCloseAPI.as_view(), name="api-stock-close"),
+    path("anomalies/", GrowthAnomalyListAPI.as_view(), name="api-anomaly-list"),
+    path("search/", SearchAPI.as_view(), name="api-search"),
+    path("growth-status/", GrowthStatusSummaryAPI.as_view(), name="api-growth-status"),
+    path("leaderboard/", StockLeaderboardAPI.as_view(), name="api-stock-leaderboard"),
+    path("projections/", StockProjectionAPI.as_view(), name="api-stock-projections"),
+    path("feed/", FeedEventListCreateAPI.as_view(), name="api-feed-list-create"),
+    path("fcr/", FeedConversionListAPI.as_view(), name="api-fcr-list"),
+    path("history/samplings/", SamplingHistoryAPI.as_view(), name="api-sampling-history"),
+    path("density/", StockingDensityAPI.as_view(), name="api-stocking-density"),
+    path("simulate/", StockingSimulationAPI.as_view(), name="api-stocking-simulation"),
+    path("sample-size/", SampleSizePlanAPI.as_view(), name="api-sample-size"),
+    path("export/samplings/", SamplingExportAPI.as_view(), name="api-sampling-export"),
+    path("reference-curves/", ReferenceCurveAPI.as_view(), name="api-reference-curves"),
+    path("cohort/", CohortComparisonAPI.as_view(), name="api-cohort-comparison"),
+    path("alerts/", GrowthAlertListAPI.as_view(), name="api-alert-list"),
+    path("alerts/read/", GrowthAlertReadAPI.as_view(), name="api-alert-read"),
+    path("alert-rules/", AlertRuleListCreateAPI.as_view(), name="api-alert-rules"),
+    path("schedule/", SamplingCalendarAPI.as_view(), name="api-sampling-calendar"),
+    path("schedule/routes/", SamplingRouteAPI.as_view(), name="api-sampling-routes"),
 ]
@@ -1,15 +1,58 @@
 from rest_framework.generics import ListAPIView, RetrieveAPIView, CreateAPIView, ListCreateAPIView
 from rest_framework.response import Response
 from rest_framework import status
-from sampling.models import FishSampling
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+from django.db.models import Count, Q, Sum
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from sampling.models import (
+    OVERALL_STATUSES,
+    SAMPLING_STATUSES,
+    AlertRule,
+    ArchivedFishSampling,
+    ArchivedPondFishStock,
+    GrowthAlert,
+    FeedEvent,
+    FishSampling,
+    GrowthAnomaly,
+    StockFeedSummary,
+    StockProjection,
+)
 from .models import PondFishStock
 from .api_serializers import PondFishStockSerializer
 from rest_framework.views import APIView
+from core.models import SearchTerm
+from core.search import search
+from sampling.alerts import mark_alerts_read
+from sampling.archive import sampling_history
+from sampling.cohorts import PERCENTILES, compare_to_cohort, reference_curves
+from sampling.density import stocking_density
+from sampling.frame import sampling_frame
+from sampling.export import FORMATS, PARQUET, export_querysets, record_batches, stream_export
+from sampling.planner import sample_size_plan
+from sampling.schedule import DEFAULT_WINDOW_DAYS, MAX_WINDOW_DAYS, route_lists, sampling_calendar
+from sampling.simulation import NotEnoughHistory, simulate_stocking
+from sampling.growth import (
+    LEADERBOARD_PARTITIONS,
+    LEADERBOARD_RANKINGS,
+    SGR_SINCE_PREVIOUS,
+    SGR_SINCE_STOCKING,
+    stock_leaderboard,
+    with_growth_status,
+    with_overall_status,
+)
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from sampling.api_serializers import (
+    AlertRuleSerializer,
     FishSamplingSerializer,
     FishSamplingCreateSerializer,
+    GrowthAlertSerializer,
+    GrowthAnomalySerializer,
+    FeedEventSerializer,
+    StockFeedSummarySerializer,
+    StockingSimulationSerializer,
 )
 
 
@@ -17,12 +60,31 @@ class FishSamplingListAPI(ListAPIView):
     # queryset = FishSampling.objects.all().order_by("-sampled_on")
     serializer_class = FishSamplingSerializer
 
+    # ?ordering= values → annotated / model fields
+    ORDERING_FIELDS = {
+        "sampled_on": "sampled_on",
+        "growth_percentage": "growth_percentage",
+        "growth_status": "db_growth_status",
+        "average_weight": "average_weight",
+    }
+
     def get_queryset(self):
-        queryset = FishSampling.objects.all().order_by("-sampled_on")
+        queryset = with_growth_status(
+            FishSampling.objects
+            .select_related(
+                "fish_stock",
+                "fish_stock__pond",
+                "fish_stock__species",
+            )
+        )
 
         fish_stock = self.request.query_params.get("fish_stock")
         from_date = self.request.query_params.get("from_date")
         to_date = self.request.query_params.get("to_date")
+        growth_status = self.request.query_params.get("growth_status")
+        min_growth = self.request.query_params.get("min_growth")
+        max_growth = self.request.query_params.get("max_growth")
+        ordering = self.request.query_params.get("ordering", "-sampled_on")
 
         if fish_stock:
             queryset = queryset.filter(fish_stock_id=fish_stock)
@@ -33,7 +95,34 @@ class FishSamplingListAPI(ListAPIView):
         if to_date:
             queryset = queryset.filter(sampled_on__lte=to_date)
 
-        return queryset
+        if growth_status:
+            queryset = queryset.filter(db_growth_status=growth_status.upper())
+
+        if min_growth:
+            queryset = queryset.filter(growth_percentage__gte=min_growth)
+
+        if max_growth:
+            queryset = queryset.filter(growth_percentage__lt=max_growth)
+
+        field = self.ORDERING_FIELDS.get(ordering.lstrip("-"), "sampled_on")
+        if ordering.startswith("-"):
+            field = f"-{field}"
+
+        return queryset.order_by(field, "-id")
+
+    def list(self, request, *args, **kwargs):
+        for name in ("min_growth", "max_growth"):
+            value = request.query_params.get(name)
+            if value and not _is_number(value):
+                return Response({"error": f"{name} must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+        return super().list(request, *args, **kwargs)
+
+
+def _is_number(value):
+    try:
+        return Decimal(value).is_finite()
+    except InvalidOperation:
+        return False
 
 
 class FishSamplingDetailAPI(RetrieveAPIView):
@@ -43,12 +132,13 @@ class FishSamplingDetailAPI(RetrieveAPIView):
 class FishSamplingCreateAPI(CreateAPIView):
     queryset = FishSampling.objects.all()
     serializer_class = FishSamplingCreateSerializer
+    permission_classes = [IsAuthenticated]
 
     def create(self, request, *args, **kwargs):
         # 1. Validate + save using CREATE serializer
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        instance = serializer.save()
+        instance = serializer.save(user=request.user)
 
         # 2. Serialize response using READ serializer
         response_serializer = FishSamplingSerializer(instance)
@@ -64,10 +154,18 @@ class PondStockListCreateAPI(ListCreateAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return PondFishStock.objects.filter(
-            user=self.request.user,
-            status=PondFishStock.ACTIVE
-        ).select_related("pond", "species")
+        queryset = with_overall_status(
+            PondFishStock.objects.filter(
+                user=self.request.user,
+                status=PondFishStock.ACTIVE
+            ).select_related("pond", "species")
+        )
+
+        growth_status = self.request.query_params.get("growth_status")
+        if growth_status:
+            queryset = queryset.filter(db_overall_status=growth_status.upper())
+
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -89,3 +187,614 @@ class PondStockCloseAPI(APIView):
             {"message": "Stock closed successfully"},
             status=status.HTTP_200_OK
         )
+
+
+class GrowthAnomalyListAPI(ListAPIView):
+    serializer_class = GrowthAnomalySerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        # Reads stored flags only; detection happens on sampling write
+        queryset = (
+            GrowthAnomaly.objects
+            .filter(user=self.request.user)
+            .select_related(
+                "sampling",
+                "fish_stock__pond",
+                "fish_stock__species",
+            )
+        )
+
+        fish_stock = self.request.query_params.get("fish_stock")
+        if fish_stock:
+            queryset = queryset.filter(fish_stock_id=fish_stock)
+
+        return queryset
+
+
+class SearchAPI(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        kinds = [
+            kind for kind in request.query_params.get("types", "").split(",")
+            if kind in dict(SearchTerm.KIND_CHOICES)
+        ]
+
+        try:
+            limit = int(request.query_params.get("limit", 10))
+            pond = int(request.query_params.get("pond") or 0) or None
+        except ValueError:
+            return Response(
+                {"error": "limit and pond must be integers"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = search(
+            request.user,
+            request.query_params.get("q", ""),
+            kinds=kinds,
+            parent_id=pond,
+            limit=limit,
+        )
+        return Response({"results": results})
+
+
+class GrowthStatusSummaryAPI(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        # Archived cycles keep their growth columns, so they are graded too
+        samplings = [
+            with_growth_status(model.objects.filter(user=request.user))
+            for model in (FishSampling, ArchivedFishSampling)
+        ]
+        stocks = with_overall_status(
+            PondFishStock.objects.filter(
+                user=request.user,
+                status=PondFishStock.ACTIVE
+            )
+        )
+
+        return Response({
+            "samplings": self._counts(samplings, "db_growth_status", SAMPLING_STATUSES),
+            "stocks": self._counts([stocks], "db_overall_status", OVERALL_STATUSES),
+        })
+
+    def _counts(self, querysets, field, statuses):
+        counts = dict.fromkeys(statuses, 0)
+        for queryset in querysets:
+            rows = (
+                queryset
+                .order_by()
+                .values(field)
+                .annotate(total=Count("pk"))
+            )
+            for row in rows:
+                counts[row[field]] += row["total"]
+        return counts
+
+
+class StockLeaderboardAPI(APIView):
+    permission_classes = [IsAuthenticated]
+    MAX_K = 100
+
+    def get(self, request):
+        params = request.query_params
+        basis = params.get("basis", SGR_SINCE_STOCKING)
+        partition = params.get("partition", "species")
+        ranking = params.get("ranking", "rank")
+        order = params.get("order", "top")
+
+        if (
+            basis not in (SGR_SINCE_STOCKING, SGR_SINCE_PREVIOUS)
+            or partition not in LEADERBOARD_PARTITIONS
+            or ranking not in LEADERBOARD_RANKINGS
+            or order not in ("top", "bottom")
+        ):
+            return Response(
+                {"error": "Invalid basis, partition, ranking or order"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            k = min(max(int(params.get("k", 5)), 1), self.MAX_K)
+        except ValueError:
+            return Response(
+                {"error": "k must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rows = stock_leaderboard(
+            request.user,
+            basis=basis,
+            partition=partition,
+            ranking=ranking,
+            bottom=order == "bottom",
+            k=k,
+        )
+
+        return Response({
+            "basis": basis,
+            "partition": partition,
+            "order": order,
+            "results": [
+                {
+                    "rank": row["position"],
+                    "stock": row["id"],
+                    "pond": row["pond_id"],
+                    "pond_name": row["pond__name"],
+                    "species": row["species_id"],
+                    "species_name": row["species__name"],
+                    "quantity": row["quantity"],
+                    "stocked_on": row["stocked_on"],
+                    "latest_sampled_on": row["db_latest_sampled_on"],
+                    "latest_average_weight": row["db_latest_average_weight"],
+                    "days": row["db_sgr_days"],
+                    "sgr": row["db_sgr"],
+                }
+                for row in rows
+            ],
+        })
+
+
+class StockProjectionAPI(APIView):
+    """
+    Slices of the precomputed projection table
+    (refreshed by `manage.py refresh_projections`).
+    """
+    permission_classes = [IsAuthenticated]
+    MAX_DAYS = 120
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            start = date.fromisoformat(params["from"]) if params.get("from") else timezone.localdate()
+            end = date.fromisoformat(params["to"]) if params.get("to") else start + timedelta(days=29)
+        except ValueError:
+            return Response(
+                {"error": "from / to must be YYYY-MM-DD dates"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if end < start or (end - start).days >= self.MAX_DAYS:
+            return Response(
+                {"error": f"Date range must be 1-{self.MAX_DAYS} days"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        for name in ("stock", "pond"):
+            if params.get(name) and not params[name].isdigit():
+                return Response({"error": f"{name} must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = StockProjection.objects.filter(
+            fish_stock__user=request.user,
+            day__range=(start, end),
+        )
+
+        if params.get("stock"):
+            queryset = queryset.filter(fish_stock_id=params["stock"])
+        if params.get("pond"):
+            queryset = queryset.filter(fish_stock__pond_id=params["pond"])
+
+        # Farm (or pond) total biomass per day
+        if params.get("aggregate") == "day":
+            rows = (
+                queryset
+                .values("day")
+                .annotate(biomass_kg=Sum("biomass_kg"))
+                .order_by("day")
+            )
+            return Response({
+                "from": start,
+                "to": end,
+                "results": list(rows),
+            })
+
+        stocks = {}
+        rows = (
+            queryset
+            .order_by("fish_stock_id", "day")
+            .values_list("fish_stock_id", "day", "average_weight", "biomass_kg")
+        )
+        for stock_id, day, average_weight, biomass_kg in rows:
+            stock = stocks.setdefault(stock_id, {
+                "stock": stock_id,
+                "days": [],
+                "average_weight": [],
+                "biomass_kg": [],
+            })
+            stock["days"].append(day)
+            stock["average_weight"].append(average_weight)
+            stock["biomass_kg"].append(biomass_kg)
+
+        return Response({
+            "from": start,
+            "to": end,
+            "results": list(stocks.values()),
+        })
+
+
+class FeedEventListCreateAPI(ListCreateAPIView):
+    serializer_class = FeedEventSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = (
+            FeedEvent.objects
+            .filter(user=self.request.user)
+            .order_by("-fed_on", "-id")
+        )
+
+        fish_stock = self.request.query_params.get("fish_stock")
+        if fish_stock:
+            queryset = queryset.filter(fish_stock_id=fish_stock)
+
+        return queryset
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class FeedConversionListAPI(ListAPIView):
+    """Per-stock FCR, read straight from the running summaries."""
+    serializer_class = StockFeedSummarySerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = (
+            StockFeedSummary.objects
+            .filter(fish_stock__user=self.request.user)
+            .select_related("fish_stock__pond", "fish_stock__species")
+            .order_by("fish_stock_id")
+        )
+
+        if self.request.query_params.get("status") != "all":
+            queryset = queryset.filter(fish_stock__status=PondFishStock.ACTIVE)
+
+        return queryset
+
+
+class SamplingHistoryAPI(ListAPIView):
+    """
+    Sampling history across live and archived cycles
+    (?fish_stock=, ?from_date=, ?to_date=).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        filters = {}
+        params = self.request.query_params
+        if params.get("fish_stock"):
+            filters["fish_stock_id"] = params["fish_stock"]
+        if params.get("from_date"):
+            filters["sampled_on__gte"] = params["from_date"]
+        if params.get("to_date"):
+            filters["sampled_on__lte"] = params["to_date"]
+
+        return sampling_history(self.request.user, **filters)
+
+    def list(self, request, *args, **kwargs):
+        params = request.query_params
+        if params.get("fish_stock") and not params["fish_stock"].isdigit():
+            return Response({"error": "fish_stock must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            for name in ("from_date", "to_date"):
+                if params.get(name):
+                    date.fromisoformat(params[name])
+        except ValueError:
+            return Response(
+                {"error": "from_date / to_date must be YYYY-MM-DD dates"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        page = self.paginate_queryset(self.get_queryset())
+        rows = [
+            {
+                "id": row["id"],
+                "fish_stock": row["fish_stock_id"],
+                "pond_name": row["fish_stock__pond__name"],
+                "species_name": row["fish_stock__species__name"],
+                "sampled_on": row["sampled_on"],
+                "sample_fish_count": row["sample_fish_count"],
+                "sample_total_weight": row["sample_total_weight"],
+                "archived": row["archived"],
+            }
+            for row in page
+        ]
+        return self.get_paginated_response(rows)
+
+
+class StockingDensityAPI(APIView):
+    """Fish / biomass per acre of every pond, flagging ponds over capacity."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        rows = stocking_density(request.user)
+        if request.query_params.get("over_capacity") in ("1", "true"):
+            rows = [row for row in rows if row["over_capacity"]]
+        return Response({"results": rows})
+
+
+class StockingSimulationAPI(APIView):
+    """
+    Monte Carlo what-if for a proposed stock, using the growth history of
+    the species. Identical inputs are served from cache.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = StockingSimulationSerializer(data=request.data, context={"request": request})
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        mortality = None
+        if "mortality_daily_pct" in data:
+            mortality = (
+                data["mortality_daily_pct"],
+                data.get("mortality_daily_pct_sd", data["mortality_daily_pct"] / 2),
+            )
+
+        try:
+            result = simulate_stocking(
+                request.user,
+                data["species"].pk,
+                quantity=data["quantity"],
+                initial_weight=data["initial_avg_weight"],
+                target_weight=data["target_weight"],
+                stocked_on=data.get("stocked_on") or timezone.localdate(),
+                area_acres=data.get("area_acres"),
+                trajectories=data["trajectories"],
+                max_days=data["max_days"],
+                mortality_pct=mortality,
+                seed=data.get("seed"),
+            )
+        except NotEnoughHistory as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(result)
+
+
+class SampleSizePlanAPI(APIView):
+    """
+    Batches to weigh per active stock for a ±margin % confidence interval
+    on mean weight (?confidence=0.95&margin=5&stock=).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            confidence = float(params.get("confidence", 0.95))
+            margin = float(params.get("margin", 5))
+        except ValueError:
+            return Response(
+                {"error": "confidence and margin must be numbers"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not (0.5 <= confidence < 1) or not (0.5 <= margin <= 50):
+            return Response(
+                {"error": "confidence must be in [0.5, 1) and margin in [0.5, 50]"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        plan = sample_size_plan(request.user, confidence, margin)
+        if params.get("stock"):
+            plan = [row for row in plan if str(row["stock"]) == params["stock"]]
+
+        return Response({"confidence": confidence, "margin_pct": margin, "results": plan})
+
+
+class SamplingExportAPI(APIView):
+    """
+    The user's samplings with stock / pond / species columns as one
+    streamed Parquet file or Arrow IPC stream (?output=parquet|arrow, ?year=).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def perform_content_negotiation(self, request, force=False):
+        # Clients ask for the binary type, which no renderer produces
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request):
+        params = request.query_params
+        fmt = params.get("output", PARQUET)
+        if fmt not in FORMATS:
+            return Response(
+                {"error": f"output must be one of {', '.join(FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        year = params.get("year")
+        if year is not None and not year.isdigit():
+            return Response({"error": "year must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+
+        content_type, extension = FORMATS[fmt]
+        batches = record_batches(export_querysets(user=request.user, year=year and int(year)))
+        response = StreamingHttpResponse(stream_export(batches, fmt), content_type=content_type)
+        name = f"samplings-{year}" if year else "samplings"
+        response["Content-Disposition"] = f'attachment; filename="{name}.{extension}"'
+        return response
+
+
+class ReferenceCurveAPI(APIView):
+    """
+    Percentile bands of average weight by day since stocking from closed
+    cycles (?species=, ?pond=, ?step= days between points, default 7).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        step = params.get("step", "7")
+        if not step.isdigit() or int(step) < 1:
+            return Response({"error": "step must be a positive number"}, status=status.HTTP_400_BAD_REQUEST)
+        step = int(step)
+
+        results = []
+        for (species_id, pond_id), (cycles, bands) in reference_curves(request.user.pk).items():
+            if params.get("species") and str(species_id) != params["species"]:
+                continue
+            if params.get("pond") and str(pond_id) != params["pond"]:
+                continue
+
+            days = list(range(0, bands.shape[1], step))
+            results.append({
+                "species": species_id,
+                "pond": pond_id,
+                "cycles": cycles,
+                "days": bands.shape[1],
+                "points": [
+                    {"day": day, **{f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, bands[:, day])}}
+                    for day in days
+                ],
+            })
+
+        results.sort(key=lambda row: (row["species"], row["pond"] is not None, row["pond"] or 0))
+        return Response({"results": results})
+
+
+class CohortComparisonAPI(APIView):
+    """
+    Samplings against past cycles of the species at the same day since
+    stocking: every sampling of ?fish_stock= (active, closed or archived),
+    or the latest sampling of each active stock.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        fish_stock = request.query_params.get("fish_stock")
+        if fish_stock and not fish_stock.isdigit():
+            return Response({"error": "fish_stock must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+
+        stocks = PondFishStock.objects.filter(user=request.user).select_related("pond", "species")
+        if fish_stock:
+            stocks = stocks.filter(pk=fish_stock)
+        else:
+            stocks = stocks.filter(status=PondFishStock.ACTIVE)
+        stocks = {stock.pk: stock for stock in stocks}
+
+        if fish_stock and not stocks:
+            stocks = {
+                stock.pk: stock
+                for stock in ArchivedPondFishStock.objects.filter(
+                    user=request.user, pk=fish_stock
+                ).select_related("pond", "species")
+            }
+            rows = ArchivedFishSampling.objects.filter(fish_stock__in=stocks).order_by("sampled_on", "pk")
+        elif fish_stock:
+            frame = sampling_frame(request.user)
+            rows = [frame[int(i)] for i in frame.order() if frame.stock_id[i] in stocks]
+        else:
+            frame = sampling_frame(request.user)
+            rows = [row for stock_id, row in frame.latest_per_stock().items() if stock_id in stocks]
+
+        curves = reference_curves(request.user.pk)
+        results = []
+        for row in rows:
+            stock = stocks[row.fish_stock_id]
+            day = (row.sampled_on - stock.stocked_on).days
+            results.append({
+                "stock": stock.pk,
+                "stock_name": str(stock),
+                "sampling": row.pk,
+                "sampled_on": row.sampled_on,
+                "day": day,
+                "average_weight": row.average_weight,
+                "comparison": compare_to_cohort(
+                    curves, stock.species_id, stock.pond_id, day, row.average_weight
+                ),
+            })
+        return Response({"results": results})
+
+
+class GrowthAlertListAPI(ListAPIView):
+    """Fired growth alerts, newest first (?unread=1, ?fish_stock=)."""
+    serializer_class = GrowthAlertSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = (
+            GrowthAlert.objects
+            .filter(user=self.request.user)
+            .select_related(
+                "rule",
+                "sampling",
+                "fish_stock__pond",
+                "fish_stock__species",
+            )
+        )
+
+        params = self.request.query_params
+        if params.get("unread") in ("1", "true"):
+            queryset = queryset.filter(read_at__isnull=True)
+        if params.get("fish_stock"):
+            queryset = queryset.filter(fish_stock_id=params["fish_stock"])
+
+        return queryset
+
+
+class GrowthAlertReadAPI(APIView):
+    """Mark alerts read: the given {"ids": [...]}, or all unread ones."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ids = request.data.get("ids")
+        if ids is not None and (
+            not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids)
+        ):
+            return Response({"error": "ids must be a list of alert ids"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"updated": mark_alerts_read(request.user, ids)})
+
+
+class AlertRuleListCreateAPI(ListCreateAPIView):
+    """The user's alert rules plus the farm-wide ones."""
+    serializer_class = AlertRuleSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return (
+            AlertRule.objects
+            .filter(Q(user=self.request.user) | Q(user__isnull=True))
+            .order_by("pk")
+        )
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class SamplingCalendarAPI(APIView):
+    """
+    Active stocks overdue for sampling, due today and due within the next
+    ?days= days (default 7), from each stock's next due date.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        days = request.query_params.get("days", str(DEFAULT_WINDOW_DAYS))
+        if not days.isdigit() or int(days) > MAX_WINDOW_DAYS:
+            return Response(
+                {"error": f"days must be a number between 0 and {MAX_WINDOW_DAYS}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(sampling_calendar(request.user, int(days)))
+
+
+class SamplingRouteAPI(APIView):
+    """
+    Crew route list for ?date= (default today): stocks due then or
+    overdue, grouped by pond, with the recommended batches to weigh.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            on = date.fromisoformat(request.query_params["date"]) if request.query_params.get("date") else timezone.localdate()
+        except ValueError:
+            return Response({"error": "date must be a YYYY-MM-DD date"}, status=status.HTTP_400_BAD_REQUEST)
+
+        routes = route_lists(request.user, on, sample_size_plan(request.user))
+        return Response({"date": on, "results": routes})
@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class SamplingConfig(AppConfig):
     name = 'sampling'
+
+    def ready(self):
+        from sampling import signals  # noqa: F401
+        from sampling.live import get_broker
+
+        # Fail at startup, not on the first published event, when the
+        # configured broker cannot work (e.g. CacheBroker on LocMem)
+        get_broker()
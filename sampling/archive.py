@@ -0,0 +1,206 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import BooleanField, Count, Sum, Value
+from django.utils import timezone
+from core.models import SearchTerm
+from core.search import remove_objects
+from sampling.anomalies import discard_stock_growth_stats, rebuild_stock_growth_stats
+from sampling.dashboard import bump_row_versions
+from sampling.density import clear_stocking_density
+from sampling.feeding import biomass_gain_kg
+from sampling.frame import invalidate_sampling_frames
+from sampling.planner import invalidate_sample_size_plan
+from sampling.models import (
+    ArchivedFeedEvent,
+    ArchivedFishSampling,
+    ArchivedPondFishStock,
+    FeedEvent,
+    FishSampling,
+    PondFishStock,
+    StockFeedSummary,
+)
+
+# Closed stocks older than this (by closed_on) move to the archive tables
+ARCHIVE_AFTER_DAYS = getattr(settings, "ARCHIVE_CLOSED_STOCKS_AFTER_DAYS", 365)
+
+BATCH_SIZE = 200
+
+STOCK_FIELDS = [
+    "id", "user_id", "pond_id", "species_id", "quantity",
+    "initial_avg_weight", "stocked_on", "status", "closed_on",
+]
+SAMPLING_FIELDS = [
+    "id", "user_id", "fish_stock_id", "sampled_on", "sample_fish_count",
+    "sample_total_weight", "batch_size", "batch_weights",
+]
+# Growth columns are frozen into the archive; a restore recomputes them
+ARCHIVED_SAMPLING_FIELDS = SAMPLING_FIELDS + ["average_weight", *FishSampling.DERIVED_FIELDS]
+FEED_FIELDS = ["id", "user_id", "fish_stock_id", "fed_on", "quantity_kg", "notes"]
+
+
+def _copy(queryset, fields, model):
+    return model.objects.bulk_create(
+        [model(**row) for row in queryset.values(*fields).iterator()],
+        batch_size=1000,
+    )
+
+
+def archivable_stocks(days=ARCHIVE_AFTER_DAYS, today=None):
+    cutoff = (today or timezone.localdate()) - timedelta(days=days)
+    return PondFishStock.objects.filter(
+        status=PondFishStock.CLOSED,
+        closed_on__lt=cutoff,
+    )
+
+
+def _raw_delete(queryset):
+    """
+    Delete `queryset` and every row cascading from it with plain DELETE
+    statements: nothing is loaded and no per-row delete signals are sent.
+    Only CASCADE, SET_NULL and DO_NOTHING relations are followed; anything
+    else (PROTECT, RESTRICT, SET_DEFAULT, SET(), many-to-many) raises, so a
+    new relation cannot be skipped silently.
+    """
+    model = queryset.model
+    if model._meta.many_to_many:
+        raise ValueError(f"Cannot raw delete {model.__name__}: it has many-to-many fields")
+
+    for relation in model._meta.related_objects:
+        related = relation.related_model._base_manager.filter(
+            **{f"{relation.field.name}__in": queryset.values("pk")}
+        )
+        if relation.many_to_many:
+            raise ValueError(
+                f"Cannot raw delete {model.__name__}: "
+                f"{relation.related_model.__name__}.{relation.field.name} is many-to-many"
+            )
+        if relation.on_delete is models.CASCADE:
+            _raw_delete(related)
+        elif relation.on_delete is models.SET_NULL:
+            related.update(**{relation.field.name: None})
+        elif relation.on_delete is not models.DO_NOTHING:
+            raise ValueError(
+                f"Cannot raw delete {model.__name__}: "
+                f"{relation.related_model.__name__}.{relation.field.name} "
+                f"has on_delete={relation.on_delete.__name__}"
+            )
+    queryset._raw_delete(queryset.db)
+
+
+@transaction.atomic
+def archive_stocks(stock_ids):
+    """
+    Move closed stocks with their samplings and feed events to the archive
+    tables. Derived rows (anomaly flags, alerts, growth stats, FCR summary,
+    projections) are dropped with the hot rows; FCR is rebuilt on restore.
+    """
+    stocks = PondFishStock.objects.filter(pk__in=stock_ids, status=PondFishStock.CLOSED)
+    rows = list(stocks.values_list("pk", "user_id"))
+    if not rows:
+        return 0
+    ids = [pk for pk, _ in rows]
+    user_ids = {user_id for _, user_id in rows}
+
+    _copy(stocks, STOCK_FIELDS, ArchivedPondFishStock)
+    _copy(FishSampling.objects.filter(fish_stock_id__in=ids), ARCHIVED_SAMPLING_FIELDS, ArchivedFishSampling)
+    _copy(FeedEvent.objects.filter(fish_stock_id__in=ids), FEED_FIELDS, ArchivedFeedEvent)
+
+    # The per-row delete receivers (successor growth, row versions, live
+    # "deleted" events, ...) are for edits, not whole closed cycles: delete
+    # without them and invalidate once per user instead
+    discard_stock_growth_stats(ids)
+    _raw_delete(PondFishStock.objects.filter(pk__in=ids))
+    remove_objects(SearchTerm.STOCK, ids)
+    invalidate_sampling_frames(user_ids)
+    clear_stocking_density(user_ids)
+    for user_id in user_ids:
+        invalidate_sample_size_plan(user_id)
+    return len(ids)
+
+
+def archive_closed_stocks(days=ARCHIVE_AFTER_DAYS):
+    ids = list(archivable_stocks(days).values_list("pk", flat=True))
+    for start in range(0, len(ids), BATCH_SIZE):
+        archive_stocks(ids[start:start + BATCH_SIZE])
+    return len(ids)
+
+
+@transaction.atomic
+def restore_stocks(stock_ids):
+    """Bring archived stocks back into the hot tables with their original ids."""
+    archived = ArchivedPondFishStock.objects.filter(pk__in=stock_ids)
+    ids = list(archived.values_list("pk", flat=True))
+    if not ids:
+        return 0
+
+    # bulk_create skips save(), which would refuse samplings on closed stocks
+    _copy(archived, STOCK_FIELDS, PondFishStock)
+    _copy(ArchivedFishSampling.objects.filter(fish_stock_id__in=ids), SAMPLING_FIELDS, FishSampling)
+    _copy(ArchivedFeedEvent.objects.filter(fish_stock_id__in=ids), FEED_FIELDS, FeedEvent)
+    FishSampling.rebuild_derived(ids)
+    # bulk_create sends no signals
+    invalidate_sampling_frames(archived.values_list("user_id", flat=True))
+    bump_row_versions(ids)
+    # Growth baselines and anomaly flags, as archiving took them out
+    for stock_id in ids:
+        rebuild_stock_growth_stats(stock_id)
+
+    feed_totals = {
+        row["fish_stock_id"]: row
+        for row in (
+            FeedEvent.objects
+            .filter(fish_stock_id__in=ids)
+            .values("fish_stock_id")
+            .annotate(total=Sum("quantity_kg"), events=Count("pk"))
+        )
+    }
+    summaries = []
+    for stock in PondFishStock.objects.filter(pk__in=feed_totals):
+        totals = feed_totals[stock.pk]
+        summary = StockFeedSummary(
+            fish_stock=stock,
+            feed_events=totals["events"],
+            total_feed_kg=totals["total"],
+            biomass_gain_kg=biomass_gain_kg(stock),
+        )
+        summary.fcr = summary.compute_fcr()
+        summaries.append(summary)
+    StockFeedSummary.objects.bulk_create(summaries)
+
+    archived.delete()
+    return len(ids)
+
+
+# --------------------
+# Reporting across hot + archived data
+# --------------------
+HISTORY_FIELDS = [
+    "id",
+    "fish_stock_id",
+    "fish_stock__pond__name",
+    "fish_stock__species__name",
+    "sampled_on",
+    "sample_fish_count",
+    "sample_total_weight",
+]
+
+
+def sampling_history(user, **filters):
+    """
+    Samplings of `user` from both the hot and archive tables as one
+    UNION query of dicts (with an `archived` flag), newest first.
+    """
+    hot = (
+        FishSampling.objects
+        .filter(user=user, **filters)
+        .annotate(archived=Value(False, output_field=BooleanField()))
+        .values(*HISTORY_FIELDS, "archived")
+    )
+    cold = (
+        ArchivedFishSampling.objects
+        .filter(user=user, **filters)
+        .annotate(archived=Value(True, output_field=BooleanField()))
+        .values(*HISTORY_FIELDS, "archived")
+    )
+    return hot.union(cold, all=True).order_by("-sampled_on", "-id")
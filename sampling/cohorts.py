@@ -0,0 +1,232 @@
+from collections import defaultdict
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from core.caching import invalidated_timeout
+from sampling.models import (
+    CycleGrowthCurve,
+    FishSampling,
+    PondFishStock,
+    ReferenceGrowthCurve,
+)
+
+# --------------------
+# Reference growth curves
+# --------------------
+# Every closed cycle is reduced once to a daily average-weight curve
+# (log-linear between samplings, anchored at the stocking weight) and
+# stored as a CycleGrowthCurve. A species' reference curves - farm-wide
+# and per pond - are the percentile bands of those cycle curves at each
+# day since stocking, kept while at least MIN_CYCLES cycles reach that day.
+# Closing a cycle adds its curve and rebuilds only its species' bands, from
+# the stored cycle curves rather than the samplings.
+#
+# Comparing a sampling with its cohort is an index into the band table at
+# its day since stocking plus an interpolation across five percentiles.
+
+PERCENTILES = [5, 25, 50, 75, 95]
+MIN_CYCLES = getattr(settings, "REFERENCE_CURVE_MIN_CYCLES", 3)
+MAX_DAYS = 1000
+
+CURVE_DTYPE = np.dtype("<f4")
+
+CURVES_KEY = "reference-curves:{}"
+CURVES_TIMEOUT = None  # cleared on rebuild; expires too with a per-process cache
+
+AHEAD = "AHEAD"
+ON_TRACK = "ON TRACK"
+BEHIND = "BEHIND"
+
+
+def cycle_curve(initial_weight, points):
+    """
+    Daily weights from day 0 to the last sampling day. `points` are
+    (day since stocking, average weight) pairs in day order.
+    """
+    days = np.array([0] + [day for day, _ in points], dtype=np.float64)
+    weights = np.array([float(initial_weight)] + [float(weight) for _, weight in points])
+
+    # Samplings on the same day count once, at their mean
+    days, first = np.unique(days, return_index=True)
+    sums = np.add.reduceat(np.log(weights), first)
+    counts = np.diff(np.append(first, weights.size))
+    grid = np.arange(min(int(days[-1]), MAX_DAYS - 1) + 1)
+    return np.exp(np.interp(grid, days, sums / counts)).astype(CURVE_DTYPE)
+
+
+def build_cycle_curves(stock_ids):
+    """Store the curve of each closed stock in `stock_ids`; returns how many."""
+    stocks = {
+        stock.pk: stock
+        for stock in PondFishStock.objects.filter(pk__in=stock_ids, status=PondFishStock.CLOSED)
+    }
+    points = defaultdict(list)
+    rows = (
+        FishSampling.objects
+        .filter(fish_stock_id__in=stocks)
+        .order_by("fish_stock_id", "sampled_on", "pk")
+        .values_list("fish_stock_id", "sampled_on", "average_weight")
+    )
+    for stock_id, sampled_on, average_weight in rows:
+        day = (sampled_on - stocks[stock_id].stocked_on).days
+        if average_weight and day > 0:
+            points[stock_id].append((day, average_weight))
+
+    curves = []
+    for stock_id, stock_points in points.items():
+        stock = stocks[stock_id]
+        if not stock.initial_avg_weight:
+            continue
+        weights = cycle_curve(stock.initial_avg_weight, stock_points)
+        curves.append(CycleGrowthCurve(
+            stock_id=stock_id,
+            user_id=stock.user_id,
+            species_id=stock.species_id,
+            pond_id=stock.pond_id,
+            days=weights.size,
+            weights=weights.tobytes(),
+        ))
+
+    # A cycle without samplings keeps no curve
+    CycleGrowthCurve.objects.filter(pk__in=stocks).exclude(pk__in=points).delete()
+    CycleGrowthCurve.objects.bulk_create(
+        curves,
+        update_conflicts=True,
+        unique_fields=["stock_id"],
+        update_fields=["user", "species", "pond", "days", "weights", "built_at"],
+    )
+    return len(curves)
+
+
+def percentile_bands(curves):
+    """
+    (percentiles × days) float32 bands over the cycle curves, cut at the
+    last day reached by MIN_CYCLES of them; None when there are too few.
+    """
+    if len(curves) < MIN_CYCLES:
+        return None
+
+    lengths = np.array([curve.size for curve in curves])
+    days = int(np.sort(lengths)[-MIN_CYCLES])
+    matrix = np.full((len(curves), days), np.nan, dtype=np.float64)
+    for row, curve in enumerate(curves):
+        matrix[row, :min(curve.size, days)] = curve[:days]
+
+    return np.nanpercentile(matrix, PERCENTILES, axis=0).astype(CURVE_DTYPE)
+
+
+@transaction.atomic
+def rebuild_reference_curves(user_id, species_id):
+    """Recompute the species-wide and per-pond curves of one species."""
+    cycles = list(
+        CycleGrowthCurve.objects
+        .filter(user_id=user_id, species_id=species_id)
+        .values_list("pond_id", "weights")
+    )
+    groups = defaultdict(list)
+    for pond_id, weights in cycles:
+        curve = np.frombuffer(weights, dtype=CURVE_DTYPE)
+        groups[None].append(curve)
+        groups[pond_id].append(curve)
+
+    ReferenceGrowthCurve.objects.filter(user_id=user_id, species_id=species_id).delete()
+    references = []
+    for pond_id, curves in groups.items():
+        bands = percentile_bands(curves)
+        if bands is None:
+            continue
+        references.append(ReferenceGrowthCurve(
+            user_id=user_id,
+            species_id=species_id,
+            pond_id=pond_id,
+            cycles=len(curves),
+            days=bands.shape[1],
+            bands=bands.tobytes(),
+        ))
+    ReferenceGrowthCurve.objects.bulk_create(references)
+
+    transaction.on_commit(lambda: cache.delete(CURVES_KEY.format(user_id)))
+    return len(references)
+
+
+def cycle_closed(stock):
+    """Fold a newly closed cycle into its species' reference curves."""
+    build_cycle_curves([stock.pk])
+    rebuild_reference_curves(stock.user_id, stock.species_id)
+
+
+def rebuild_all_reference_curves(user=None):
+    """Rebuild cycle curves of every closed stock, then all reference curves."""
+    stocks = PondFishStock.objects.filter(status=PondFishStock.CLOSED)
+    cycles = CycleGrowthCurve.objects.all()
+    if user is not None:
+        stocks = stocks.filter(user=user)
+        cycles = cycles.filter(user=user)
+
+    stock_ids = list(stocks.values_list("pk", flat=True))
+    built = 0
+    for start in range(0, len(stock_ids), 500):
+        built += build_cycle_curves(stock_ids[start:start + 500])
+
+    # Archived cycles keep their stored curves
+    for user_id, species_id in cycles.values_list("user_id", "species_id").distinct():
+        rebuild_reference_curves(user_id, species_id)
+    return built
+
+
+# --------------------
+# Cohort comparison
+# --------------------
+def reference_curves(user_id):
+    """{(species id, pond id or None): (cycles, bands)} for a user, cached."""
+    key = CURVES_KEY.format(user_id)
+    curves = cache.get(key)
+    if curves is None:
+        curves = {
+            (species_id, pond_id): (cycles, np.frombuffer(bands, dtype=CURVE_DTYPE).reshape(len(PERCENTILES), -1))
+            for species_id, pond_id, cycles, bands in (
+                ReferenceGrowthCurve.objects
+                .filter(user_id=user_id)
+                .values_list("species_id", "pond_id", "cycles", "bands")
+            )
+        }
+        cache.set(key, curves, invalidated_timeout(CURVES_TIMEOUT))
+    return curves
+
+
+def compare_to_cohort(curves, species_id, pond_id, day, average_weight):
+    """
+    Position of `average_weight` at `day` since stocking against the pond
+    curve of the species, or its species-wide curve. None without a curve
+    reaching that day.
+    """
+    for scope, key in (("pond", (species_id, pond_id)), ("species", (species_id, None))):
+        reference = curves.get(key)
+        if reference is None or not 0 <= day < reference[1].shape[1]:
+            continue
+
+        cycles, bands = reference
+        values = bands[:, day].astype(np.float64)
+        weight = float(average_weight)
+        percentile = float(np.interp(weight, values, PERCENTILES))
+        median = values[PERCENTILES.index(50)]
+
+        if weight > values[PERCENTILES.index(75)]:
+            position = AHEAD
+        elif weight < values[PERCENTILES.index(25)]:
+            position = BEHIND
+        else:
+            position = ON_TRACK
+
+        return {
+            "cohort": scope,
+            "cycles": cycles,
+            "day": day,
+            "bands": {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, values)},
+            # Clamped to the outer bands
+            "percentile": round(percentile, 1),
+            "vs_median_pct": round((weight / median - 1) * 100, 2) if median else None,
+            "position": position,
+        }
+    return None
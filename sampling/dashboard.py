@@ -0,0 +1,127 @@
+import uuid
+from datetime import date
+from django.core.cache import cache
+from django.db.models import Q
+from core.caching import invalidated_timeout
+
+# --------------------
+# Seek (keyset) pagination
+# --------------------
+# Pages are addressed by the (sampled_on, id) of a boundary row instead of a
+# page number, so no COUNT(*) is needed and deep pages cost the same as the
+# first one.
+
+
+def encode_cursor(sampling):
+    return f"{sampling.sampled_on.isoformat()}.{sampling.pk}"
+
+
+def decode_cursor(value):
+    if not value:
+        return None
+    try:
+        sampled_on, pk = value.split(".")
+        return date.fromisoformat(sampled_on), int(pk)
+    except ValueError:
+        return None
+
+
+class SeekPage:
+    def __init__(self, rows, has_next, has_previous):
+        self.object_list = rows
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def next_cursor(self):
+        if self.has_next and self.object_list:
+            return encode_cursor(self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous and self.object_list:
+            return encode_cursor(self.object_list[0])
+        return None
+
+
+def seek_paginate(queryset, after=None, before=None, per_page=10):
+    """
+    Newest-first page of `queryset` strictly after / before a cursor.
+    Fetches per_page + 1 rows to know whether another page exists.
+    """
+    before = decode_cursor(before)
+    after = decode_cursor(after)
+
+    if before:
+        sampled_on, pk = before
+        rows = list(
+            queryset
+            .filter(Q(sampled_on__gt=sampled_on) | Q(sampled_on=sampled_on, pk__gt=pk))
+            .order_by("sampled_on", "pk")[:per_page + 1]
+        )
+        if rows:
+            has_previous = len(rows) > per_page
+            return SeekPage(rows[:per_page][::-1], True, has_previous)
+
+    queryset = queryset.order_by("-sampled_on", "-pk")
+    if after:
+        sampled_on, pk = after
+        queryset = queryset.filter(
+            Q(sampled_on__lt=sampled_on) | Q(sampled_on=sampled_on, pk__lt=pk)
+        )
+
+    rows = list(queryset[:per_page + 1])
+    return SeekPage(rows[:per_page], len(rows) > per_page, after is not None)
+
+
+# --------------------
+# Row fragment versions
+# --------------------
+# A rendered dashboard row depends on its sampling, the previous sampling of
+# the same stock and the stock / pond / species names. Every change to any of
+# those bumps the stock's version, which invalidates its cached rows. With a
+# per-process cache a bump only reaches one worker, so versions and rows
+# also expire on their own (see core.caching).
+
+ROW_VERSION_KEY = "sampling-row-version:{}"
+ROW_VERSION_TIMEOUT = None  # bumped on change
+ROW_FRAGMENT_TIMEOUT = 24 * 60 * 60
+
+
+def row_fragment_timeout():
+    return invalidated_timeout(ROW_FRAGMENT_TIMEOUT)
+
+
+def row_versions(stock_ids):
+    keys = {ROW_VERSION_KEY.format(stock_id): stock_id for stock_id in set(stock_ids)}
+    versions = {
+        keys[key]: version
+        for key, version in cache.get_many(keys).items()
+    }
+
+    # Evicted or never set: start a fresh version so stale fragments
+    # cached under an older one can never be served
+    missing = {
+        key: uuid.uuid4().hex
+        for key, stock_id in keys.items()
+        if stock_id not in versions
+    }
+    if missing:
+        cache.set_many(missing, invalidated_timeout(ROW_VERSION_TIMEOUT))
+        versions.update({keys[key]: version for key, version in missing.items()})
+
+    return versions
+
+
+def bump_row_versions(stock_ids):
+    cache.set_many(
+        {ROW_VERSION_KEY.format(stock_id): uuid.uuid4().hex for stock_id in stock_ids},
+        invalidated_timeout(ROW_VERSION_TIMEOUT),
+    )
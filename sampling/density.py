@@ -0,0 +1,120 @@
+from collections import defaultdict
+from django.core.cache import cache
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+from core.caching import invalidated_timeout
+from core.models import Pond
+from sampling.growth import average_weight_expression
+from sampling.models import FishSampling, GrowthThresholdProfile, PondFishStock
+
+# --------------------
+# Stocking density / carrying capacity
+# --------------------
+# Density of every pond of a user from its ACTIVE stocks, in one grouped
+# query. Biomass uses each stock's latest average weight (stocking weight
+# until the first sampling). A pond is over capacity when the sum of
+# biomass / (species capacity * area) over its stocks exceeds 1.
+
+DENSITY_CACHE_KEY = "stocking-density:{}"
+DENSITY_CACHE_TIMEOUT = None  # cleared on change; expires too with a per-process cache
+
+
+def _capacity_case():
+    """Per-species carrying capacity (kg / acre) from the cached profiles."""
+    profiles = GrowthThresholdProfile.cached_profiles()
+    default = float(GrowthThresholdProfile.default().carrying_capacity_kg_per_acre)
+
+    groups = defaultdict(list)
+    for species_id, profile in profiles.items():
+        capacity = float(profile.carrying_capacity_kg_per_acre)
+        if species_id is not None and capacity != default:
+            groups[capacity].append(species_id)
+
+    return Case(
+        *[
+            When(pondfishstock__species_id__in=species_ids, then=Value(capacity))
+            for capacity, species_ids in groups.items()
+        ],
+        default=Value(default),
+        output_field=FloatField(),
+    )
+
+
+def stocking_density_queryset(user):
+    active = Q(pondfishstock__status=PondFishStock.ACTIVE)
+
+    latest_average = (
+        FishSampling.objects
+        .filter(fish_stock=OuterRef("pondfishstock"))
+        .order_by("-sampled_on")
+        .annotate(avg=average_weight_expression())
+        .values("avg")[:1]
+    )
+    stock_biomass_kg = (
+        Cast("pondfishstock__quantity", FloatField())
+        * Coalesce(
+            Subquery(latest_average, output_field=FloatField()),
+            Cast("pondfishstock__initial_avg_weight", FloatField()),
+        )
+        / 1000.0
+    )
+    area = NullIf(Cast("area_acres", FloatField()), 0.0)
+
+    return (
+        Pond.objects
+        .filter(user=user)
+        .annotate(
+            active_stocks=Count("pondfishstock", filter=active),
+            fish_count=Coalesce(Sum("pondfishstock__quantity", filter=active), 0),
+            biomass_kg=Coalesce(Sum(stock_biomass_kg, filter=active), 0.0),
+            capacity_load=Coalesce(Sum(stock_biomass_kg / _capacity_case(), filter=active), 0.0),
+        )
+        .annotate(
+            fish_per_acre=Round(Cast("fish_count", FloatField()) / area, 2),
+            kg_per_acre=Round(F("biomass_kg") / area, 2),
+            capacity_used=Round(F("capacity_load") / area, 4),
+        )
+        .order_by("name", "pk")
+    )
+
+
+def stocking_density(user):
+    """Density rows for every pond of `user`, cached until stocks change."""
+    key = DENSITY_CACHE_KEY.format(user.pk)
+    rows = cache.get(key)
+    if rows is not None:
+        return rows
+
+    rows = [
+        {
+            "pond": pond.pk,
+            "pond_name": pond.name,
+            "area_acres": pond.area_acres,
+            "active_stocks": pond.active_stocks,
+            "fish_count": pond.fish_count,
+            "fish_per_acre": pond.fish_per_acre,
+            "biomass_kg": round(pond.biomass_kg, 3),
+            "kg_per_acre": pond.kg_per_acre,
+            # Share of the species-weighted carrying capacity in use
+            "capacity_used": pond.capacity_used,
+            "over_capacity": (pond.capacity_used or 0) > 1,
+        }
+        for pond in stocking_density_queryset(user)
+    ]
+    cache.set(key, rows, invalidated_timeout(DENSITY_CACHE_TIMEOUT))
+    return rows
+
+
+def clear_stocking_density(user_ids):
+    cache.delete_many([DENSITY_CACHE_KEY.format(user_id) for user_id in set(user_ids)])
@@ -0,0 +1,250 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from django.conf import settings
+from django.db.models import FloatField
+from django.db.models.functions import Cast, ExtractYear
+from core.models import FishSpecies, Pond
+from sampling.models import ArchivedFishSampling, FishSampling, PondFishStock
+
+# --------------------
+# Columnar (Parquet / Arrow) export
+# --------------------
+# Samplings joined with their stock, pond and species (the hot table, then
+# the archived cycles), each read in pk order CHUNK_SIZE rows at a time and converted straight into typed Arrow
+# record batches, so memory stays flat however many rows there are.
+# Pond, species and status names are dictionary-encoded against one
+# dictionary per export (same codes in every batch / row group).
+
+CHUNK_SIZE = getattr(settings, "SAMPLING_EXPORT_CHUNK_SIZE", 100_000)
+PARQUET_COMPRESSION = "zstd"
+
+PARQUET = "parquet"
+ARROW = "arrow"
+FORMATS = {
+    PARQUET: ("application/vnd.apache.parquet", "parquet"),
+    ARROW: ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+NAME = pa.dictionary(pa.int32(), pa.string())
+
+SCHEMA = pa.schema([
+    ("sampling_id", pa.int64()),
+    ("user_id", pa.int64()),
+    ("stock_id", pa.int64()),
+    ("pond_id", pa.int64()),
+    ("pond", NAME),
+    ("pond_area_acres", pa.float64()),
+    ("species_id", pa.int64()),
+    ("species", NAME),
+    ("stock_status", NAME),
+    ("stocked_on", pa.date32()),
+    ("stock_quantity", pa.int64()),
+    ("initial_avg_weight", pa.float64()),
+    ("sampled_on", pa.date32()),
+    ("year", pa.int16()),
+    ("sample_fish_count", pa.int32()),
+    ("sample_total_weight", pa.float64()),
+    ("average_weight", pa.float64()),
+    ("growth_from_previous", pa.float64()),
+    ("growth_percentage", pa.float64()),
+    ("days_since_previous", pa.int32()),
+])
+
+# Query column for each plain schema field (dictionary columns are
+# built from the pond / species / status id columns)
+COLUMNS = {
+    "sampling_id": "pk",
+    "user_id": "user_id",
+    "stock_id": "fish_stock_id",
+    "pond_id": "fish_stock__pond_id",
+    "pond_area_acres": "area",
+    "species_id": "fish_stock__species_id",
+    "stocked_on": "fish_stock__stocked_on",
+    "stock_quantity": "fish_stock__quantity",
+    "initial_avg_weight": "initial",
+    "sampled_on": "sampled_on",
+    "year": "year",
+    "sample_fish_count": "sample_fish_count",
+    "sample_total_weight": "total",
+    "average_weight": "average",
+    "growth_from_previous": "growth",
+    "growth_percentage": "growth_pct",
+    "days_since_previous": "days_since_previous",
+}
+STATUS_COLUMN = "fish_stock__status"
+
+
+def export_querysets(user=None, year=None):
+    """Hot and archived samplings; both have the same column paths."""
+    querysets = []
+    for model in (FishSampling, ArchivedFishSampling):
+        queryset = model.objects.all()
+        if user is not None:
+            queryset = queryset.filter(user=user)
+        if year is not None:
+            queryset = queryset.filter(sampled_on__year=year)
+
+        # Decimals come back as floats: no per-row Decimal objects
+        querysets.append(queryset.annotate(
+            area=Cast("fish_stock__pond__area_acres", FloatField()),
+            initial=Cast("fish_stock__initial_avg_weight", FloatField()),
+            total=Cast("sample_total_weight", FloatField()),
+            average=Cast("average_weight", FloatField()),
+            growth=Cast("growth_from_previous", FloatField()),
+            growth_pct=Cast("growth_percentage", FloatField()),
+            year=ExtractYear("sampled_on"),
+        ))
+    return querysets
+
+
+class _Dictionary:
+    """Maps ids to codes into one sorted, de-duplicated name dictionary."""
+
+    def __init__(self, pairs):
+        pairs = sorted(pairs)
+        names = sorted({name for _, name in pairs})
+        position = {name: code for code, name in enumerate(names)}
+        self.ids = np.array([pk for pk, _ in pairs], dtype=np.int64)
+        self.codes = np.array([position[name] for _, name in pairs], dtype=np.int32)
+        self.names = pa.array(names, pa.string())
+
+    def encode(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        return pa.DictionaryArray.from_arrays(
+            self.codes[np.searchsorted(self.ids, ids)],
+            self.names,
+        )
+
+
+def record_batches(querysets, chunk_size=CHUNK_SIZE):
+    """Yield the export as Arrow record batches of up to `chunk_size` rows."""
+    ponds = _Dictionary(Pond.objects.values_list("pk", "name"))
+    species = _Dictionary(FishSpecies.objects.values_list("pk", "name"))
+    statuses = sorted(value for value, _ in PondFishStock.STATUS_CHOICES)
+    status_codes = {value: code for code, value in enumerate(statuses)}
+
+    fields = list(COLUMNS.values()) + [STATUS_COLUMN]
+    for queryset in querysets:
+        last_pk = 0
+        while True:
+            rows = list(
+                queryset
+                .filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list(*fields)[:chunk_size]
+            )
+            if not rows:
+                break
+
+            columns = dict(zip(fields, zip(*rows)))
+            del rows
+            arrays = {
+                name: pa.array(columns[column], SCHEMA.field(name).type)
+                for name, column in COLUMNS.items()
+            }
+            arrays["pond"] = ponds.encode(columns["fish_stock__pond_id"])
+            arrays["species"] = species.encode(columns["fish_stock__species_id"])
+            arrays["stock_status"] = pa.DictionaryArray.from_arrays(
+                pa.array([status_codes[value] for value in columns[STATUS_COLUMN]], pa.int32()),
+                pa.array(statuses, pa.string()),
+            )
+
+            yield pa.RecordBatch.from_arrays(
+                [arrays[name] for name in SCHEMA.names],
+                schema=SCHEMA,
+            )
+            last_pk = columns["pk"][-1]
+
+
+def _writer(sink, fmt, compression):
+    if fmt == PARQUET:
+        return pq.ParquetWriter(sink, SCHEMA, compression=compression)
+    return pa.ipc.new_stream(sink, SCHEMA)
+
+
+def write_export(batches, sink, fmt=PARQUET, compression=PARQUET_COMPRESSION):
+    """Write batches to one file (path or writable file object); returns the row count."""
+    rows = 0
+    with _writer(sink, fmt, compression) as writer:
+        for batch in batches:
+            # One row group per chunk
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def write_partitioned_export(batches, directory, fmt=PARQUET, compression=PARQUET_COMPRESSION):
+    """Write a hive-partitioned dataset (year=YYYY/...) under `directory`."""
+    rows = 0
+
+    def counted():
+        nonlocal rows
+        for batch in batches:
+            rows += batch.num_rows
+            yield batch
+
+    if fmt == PARQUET:
+        file_format = ds.ParquetFileFormat()
+        options = file_format.make_write_options(compression=compression)
+    else:
+        file_format = ds.IpcFileFormat()
+        options = file_format.make_write_options()
+
+    ds.write_dataset(
+        counted(),
+        directory,
+        schema=SCHEMA,
+        format=file_format,
+        file_options=options,
+        partitioning=ds.partitioning(pa.schema([SCHEMA.field("year")]), flavor="hive"),
+        existing_data_behavior="delete_matching",
+    )
+    return rows
+
+
+class _StreamSink:
+    """Writable file object whose contents are drained between batches."""
+
+    closed = False
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def writable(self):
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_export(batches, fmt=PARQUET):
+    """Yield the encoded export in pieces, for a streaming response."""
+    sink = _StreamSink()
+    writer = _writer(pa.PythonFile(sink, mode="w"), fmt, PARQUET_COMPRESSION)
+    for batch in batches:
+        writer.write_batch(batch)
+        data = sink.drain()
+        if data:
+            yield data
+    writer.close()
+    yield sink.drain()
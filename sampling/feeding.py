@@ -0,0 +1,51 @@
+from decimal import Decimal
+from django.db import transaction
+from sampling.models import PondFishStock, StockFeedSummary
+
+
+def biomass_gain_kg(stock):
+    """Biomass gained since stocking, from the latest sampling (one query)."""
+    latest = stock.latest_sampling()
+    if not latest or latest.average_weight is None:
+        return None
+    gain_g = (latest.average_weight - stock.initial_avg_weight) * stock.quantity
+    return round(gain_g / Decimal("1000"), 3)
+
+
+def _locked_summary(stock_id, create=False):
+    queryset = StockFeedSummary.objects.select_for_update()
+    summary = queryset.filter(fish_stock_id=stock_id).first()
+    if summary is None and create:
+        stock = PondFishStock.objects.get(pk=stock_id)
+        summary = StockFeedSummary.objects.create(
+            fish_stock=stock,
+            biomass_gain_kg=biomass_gain_kg(stock),
+        )
+    return summary
+
+
+@transaction.atomic
+def apply_feed_change(stock_id, delta_kg, delta_events, create=True):
+    """Fold a feed event insert / edit / delete into the running totals."""
+    summary = _locked_summary(stock_id, create=create)
+    if summary is None:
+        return None
+
+    summary.total_feed_kg += delta_kg
+    summary.feed_events += delta_events
+    summary.fcr = summary.compute_fcr()
+    summary.save()
+    return summary
+
+
+@transaction.atomic
+def refresh_biomass_gain(stock_id):
+    """Called when a sampling changes; stocks never fed have no summary."""
+    summary = _locked_summary(stock_id)
+    if summary is None:
+        return None
+
+    summary.biomass_gain_kg = biomass_gain_kg(summary.fish_stock)
+    summary.fcr = summary.compute_fcr()
+    summary.save()
+    return summary
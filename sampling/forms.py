@@ -1,6 +1,7 @@
 from django import forms
-from core.models import FishSpecies
-from sampling.models import PondFishStock, FishSampling, Pond
+from core.models import FishSpecies, SearchTerm
+from core.widgets import TypeaheadSelect
+from sampling.models import SAMPLING_STATUSES, PondFishStock, FishSampling, Pond
 from django.core.exceptions import ValidationError
 from django.db.models import Q
 
@@ -14,13 +15,14 @@ class SamplingForm(forms.Form):
             self.fields["fish_stock"].queryset = PondFishStock.objects.filter(
                 user=self.user,
                 status=PondFishStock.ACTIVE
-            )
+            ).select_related("pond", "species")
         else:
             self.fields["fish_stock"].queryset = PondFishStock.objects.none()
 
     fish_stock = forms.ModelChoiceField(
         queryset=PondFishStock.objects.none(),
-        help_text="Select active fish stock"
+        widget=TypeaheadSelect(SearchTerm.STOCK),
+        help_text="Search active fish stock by species or pond"
     )
 
     sampled_on = forms.DateField(
@@ -91,6 +93,33 @@ class SamplingForm(forms.Form):
             return cleaned_data
 
 
+class SamplingFilterForm(forms.Form):
+    pond = forms.ModelChoiceField(
+        queryset=Pond.objects.none(),
+        required=False,
+        widget=TypeaheadSelect(SearchTerm.POND),
+    )
+    stock = forms.ModelChoiceField(
+        queryset=PondFishStock.objects.none(),
+        required=False,
+        widget=TypeaheadSelect(SearchTerm.STOCK, depends_on="pond"),
+    )
+    growth_status = forms.ChoiceField(
+        required=False,
+        choices=[("", "All")] + [(status, status.title()) for status in SAMPLING_STATUSES],
+    )
+
+    def __init__(self, *args, **kwargs):
+        self.user = kwargs.pop("user")
+        super().__init__(*args, **kwargs)
+
+        self.fields["pond"].queryset = Pond.objects.filter(user=self.user)
+        self.fields["stock"].queryset = PondFishStock.objects.filter(
+            user=self.user,
+            status=PondFishStock.ACTIVE
+        ).select_related("pond", "species")
+
+
 class PondStockForm(forms.ModelForm):
     class Meta:
         model = PondFishStock
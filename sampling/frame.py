@@ -0,0 +1,361 @@
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import date, timedelta
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from core.caching import invalidated_timeout
+from sampling.models import FishSampling
+
+# --------------------
+# Per-user columnar sampling history
+# --------------------
+# A SamplingFrame holds every (hot) sampling of one user as NumPy columns,
+# so growth / statistics code can work on arrays instead of model
+# instances. Frames live in a bounded per-process LRU and are kept current
+# through two shared cache keys per user:
+#   epoch    - replaced when samplings are edited / deleted or a stock
+#              changes; a frame from another epoch is rebuilt
+#   appended - counts new samplings; a frame behind it fetches only the
+#              rows near and above its highest pk (see SamplingFrame.fetch)
+# The process that saves a sampling appends it to its own frame directly.
+# Other workers only see these keys through a shared cache; with a
+# per-process cache they expire after LOCAL_CACHE_TIMEOUT, which starts a
+# new epoch, so a frame is never more than that out of date.
+
+FRAME_CACHE_SIZE = getattr(settings, "SAMPLING_FRAME_CACHE_SIZE", 64)
+
+# Pks below a frame's highest one that a catch-up fetch looks at again
+REFETCH_WINDOW = getattr(settings, "SAMPLING_FRAME_REFETCH_WINDOW", 1000)
+
+EPOCH_KEY = "sampling-frame:{}:epoch"
+APPENDED_KEY = "sampling-frame:{}:appended"
+
+# Day numbers count from here, as numpy datetime64[D] does
+ORIGIN = date(1970, 1, 1)
+
+COLUMNS = [
+    ("sampling_id", np.int64),
+    ("stock_id", np.int64),
+    ("species_id", np.int64),
+    ("day", np.int32),
+    ("stocked_day", np.int32),
+    ("fish_count", np.int32),
+    ("total_weight", np.float64),
+    ("initial_weight", np.float64),
+]
+
+# Query field for each column, in COLUMNS order
+QUERY_FIELDS = [
+    "pk",
+    "fish_stock_id",
+    "fish_stock__species_id",
+    "sampled_on",
+    "fish_stock__stocked_on",
+    "sample_fish_count",
+    "sample_total_weight",
+    "fish_stock__initial_avg_weight",
+]
+
+INITIAL_CAPACITY = 256
+
+
+def day_number(value):
+    return (value - ORIGIN).days
+
+
+def average_weight(total_weight, fish_count):
+    # Halves round up, like SQL ROUND() in the stored average_weight column
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.floor(np.asarray(total_weight) / fish_count * 100 + 0.5) / 100
+
+
+class SamplingRow:
+    """Read-only view of one frame row, named like the model fields."""
+
+    __slots__ = ("frame", "index")
+
+    def __init__(self, frame, index):
+        self.frame = frame
+        self.index = index
+
+    def _value(self, column):
+        return self.frame._data[column][self.index].item()
+
+    @property
+    def pk(self):
+        return self._value("sampling_id")
+
+    id = pk
+
+    @property
+    def fish_stock_id(self):
+        return self._value("stock_id")
+
+    @property
+    def sampled_on(self):
+        return ORIGIN + timedelta(days=self._value("day"))
+
+    @property
+    def sample_fish_count(self):
+        return self._value("fish_count")
+
+    @property
+    def sample_total_weight(self):
+        return self._value("total_weight")
+
+    @property
+    def average_weight(self):
+        count = self.sample_fish_count
+        return float(average_weight(self.sample_total_weight, count)) if count else None
+
+    def __repr__(self):
+        return f"<SamplingRow {self.pk} stock={self.fish_stock_id} on {self.sampled_on}>"
+
+
+class SamplingFrame:
+    """
+    Columns (all length len(frame), in append order): sampling_id, stock_id,
+    species_id, day, stocked_day, fish_count, total_weight, initial_weight.
+    """
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.epoch = None
+        self.appended = 0
+        self.max_pk = 0
+        self._size = 0
+        self._data = {name: np.empty(INITIAL_CAPACITY, dtype) for name, dtype in COLUMNS}
+        self._order = None
+
+    @classmethod
+    def load(cls, user_id):
+        frame = cls(user_id)
+        frame.fetch()
+        return frame
+
+    # --------------------
+    # Building
+    # --------------------
+    def fetch(self):
+        """
+        Append the user's samplings the frame does not have yet (all of them
+        when empty). Pks are taken in insert order but committed in any
+        order, so the last REFETCH_WINDOW pks below max_pk are looked at
+        again. A sampling committed after more higher pks than that were
+        fetched is only picked up at the next epoch.
+        """
+        floor = max(self.max_pk - REFETCH_WINDOW, 0)
+        rows = (
+            FishSampling.objects
+            .filter(user_id=self.user_id, pk__gt=floor)
+            .order_by("pk")
+            .values_list(*QUERY_FIELDS)
+        )
+        if self._size:
+            known = set(self.sampling_id[self.sampling_id > floor].tolist())
+            rows = [row for row in rows if row[0] not in known]
+        return self.append_rows(rows)
+
+    def append_sampling(self, sampling):
+        stock = sampling.fish_stock
+        return self.append_rows([(
+            sampling.pk,
+            stock.pk,
+            stock.species_id,
+            sampling.sampled_on,
+            stock.stocked_on,
+            sampling.sample_fish_count,
+            sampling.sample_total_weight,
+            stock.initial_avg_weight,
+        )])
+
+    def append_rows(self, rows):
+        """Append QUERY_FIELDS-ordered tuples; dates and decimals are converted."""
+        rows = list(rows)
+        if not rows:
+            return 0
+
+        self._reserve(self._size + len(rows))
+        start, end = self._size, self._size + len(rows)
+        columns = list(zip(*rows))
+        for (name, dtype), values in zip(COLUMNS, columns):
+            if name in ("day", "stocked_day"):
+                values = [day_number(value) for value in values]
+            self._data[name][start:end] = np.array(values, dtype=dtype)
+
+        self._size = end
+        self.max_pk = max(self.max_pk, int(self._data["sampling_id"][start:end].max()))
+        self._order = None
+        return len(rows)
+
+    def _reserve(self, size):
+        capacity = len(self._data["sampling_id"])
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name, dtype in COLUMNS:
+            grown = np.empty(capacity, dtype)
+            grown[:self._size] = self._data[name][:self._size]
+            self._data[name] = grown
+
+    # --------------------
+    # Access
+    # --------------------
+    def __len__(self):
+        return self._size
+
+    def __getattr__(self, name):
+        # Column views: frame.day, frame.total_weight, ...
+        data = self.__dict__.get("_data")
+        if data is not None and name in data:
+            return data[name][:self._size]
+        raise AttributeError(name)
+
+    def __getitem__(self, index):
+        if not -self._size <= index < self._size:
+            raise IndexError(index)
+        return SamplingRow(self, index % self._size)
+
+    def __iter__(self):
+        return (SamplingRow(self, index) for index in range(self._size))
+
+    @property
+    def average_weight(self):
+        return average_weight(self.total_weight, self.fish_count)
+
+    def order(self):
+        """Row indices sorted by stock, day, sampling id."""
+        if self._order is None:
+            self._order = np.lexsort((self.sampling_id, self.day, self.stock_id))
+        return self._order
+
+    def previous(self):
+        """
+        Index of each row's previous sampling (-1 for none): the latest row
+        of the same stock on an earlier day, like FishSampling.previous_sampling.
+        """
+        order = self.order()
+        stock, day = self.stock_id[order], self.day[order]
+        positions = np.arange(order.size)
+
+        new_run = np.ones(order.size, dtype=bool)
+        new_run[1:] = (stock[1:] != stock[:-1]) | (day[1:] != day[:-1])
+        run_start = np.maximum.accumulate(np.where(new_run, positions, 0))
+
+        before = run_start - 1
+        valid = before >= 0
+        valid[valid] = stock[before[valid]] == stock[valid]
+
+        previous = np.full(order.size, -1, dtype=np.int64)
+        previous[order[valid]] = order[before[valid]]
+        return previous
+
+    def growth(self):
+        """
+        Growth columns for every row, as FishSampling.compute_derived stores
+        them (NaN where the model has NULL; a cent apart where its Decimal
+        average rounds a tie differently): base_weight, days_since_previous,
+        growth_from_previous, growth_percentage.
+        """
+        average = self.average_weight
+        previous = self.previous()
+        has_previous = previous >= 0
+
+        base = np.where(has_previous, average[previous], self.initial_weight)
+        days = np.where(has_previous, self.day - self.day[previous], np.nan)
+        growth = np.round(average - base, 2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            percentage = np.where(base > 0, np.round(growth / base * 100, 2), np.nan)
+
+        return {
+            "base_weight": base,
+            "days_since_previous": days,
+            "growth_from_previous": growth,
+            "growth_percentage": percentage,
+        }
+
+    def latest_per_stock(self):
+        """{stock id: SamplingRow} of each stock's latest sampling."""
+        order = self.order()
+        stock = self.stock_id[order]
+        last = np.ones(order.size, dtype=bool)
+        last[:-1] = stock[1:] != stock[:-1]
+        return {
+            int(stock_id): SamplingRow(self, int(index))
+            for stock_id, index in zip(stock[last], order[last])
+        }
+
+
+# --------------------
+# Per-process LRU
+# --------------------
+_frames = OrderedDict()
+_lock = threading.Lock()
+
+
+def _stamps(user_id):
+    epoch_key, appended_key = EPOCH_KEY.format(user_id), APPENDED_KEY.format(user_id)
+    stamps = cache.get_many([epoch_key, appended_key])
+    if epoch_key not in stamps:
+        timeout = invalidated_timeout()
+        cache.add(epoch_key, uuid.uuid4().hex, timeout)
+        cache.add(appended_key, 0, timeout)
+        stamps = cache.get_many([epoch_key, appended_key])
+    return stamps.get(epoch_key), stamps.get(appended_key, 0)
+
+
+def sampling_frame(user):
+    """The user's SamplingFrame, built once and caught up with new samplings."""
+    user_id = getattr(user, "pk", user)
+    epoch, appended = _stamps(user_id)
+
+    with _lock:
+        frame = _frames.get(user_id)
+        if frame is None or frame.epoch != epoch:
+            frame = SamplingFrame.load(user_id)
+            frame.epoch = epoch
+        elif frame.appended != appended:
+            frame.fetch()
+        frame.appended = appended
+
+        _frames[user_id] = frame
+        _frames.move_to_end(user_id)
+        while len(_frames) > FRAME_CACHE_SIZE:
+            _frames.popitem(last=False)
+    return frame
+
+
+def _sampling_added(sampling):
+    key = APPENDED_KEY.format(sampling.user_id)
+    cache.add(key, 0, invalidated_timeout())
+    appended = cache.incr(key)
+
+    with _lock:
+        frame = _frames.get(sampling.user_id)
+        # Only a frame that saw every earlier append can take this one as is
+        if frame is not None and frame.appended == appended - 1 and sampling.pk > frame.max_pk:
+            frame.append_sampling(sampling)
+            frame.appended = appended
+
+
+def _invalidate(user_ids):
+    cache.set_many(
+        {EPOCH_KEY.format(user_id): uuid.uuid4().hex for user_id in user_ids},
+        invalidated_timeout(),
+    )
+    with _lock:
+        for user_id in user_ids:
+            _frames.pop(user_id, None)
+
+
+def sampling_added(sampling):
+    transaction.on_commit(lambda: _sampling_added(sampling))
+
+
+def invalidate_sampling_frames(user_ids):
+    user_ids = set(user_ids)
+    transaction.on_commit(lambda: _invalidate(user_ids))
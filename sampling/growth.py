@@ -0,0 +1,263 @@
+from collections import defaultdict
+from django.db.models import (
+    Case,
+    CharField,
+    F,
+    FloatField,
+    Func,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+    Window,
+)
+from django.db.models.functions import Cast, Coalesce, Ln, NullIf, Rank, Round, RowNumber
+from sampling.models import (
+    NO_DATA,
+    POOR,
+    FishSampling,
+    GrowthThresholdProfile,
+    PondFishStock,
+)
+
+# SQL counterparts of the FishSampling / PondFishStock growth properties,
+# so status can be filtered, sorted and counted in the database.
+
+
+def average_weight_expression(prefix=""):
+    return Cast(F(f"{prefix}average_weight"), FloatField())
+
+
+def _growth_percentage(current, base):
+    return Round((current - base) * 100.0 / NullIf(base, 0.0), 2)
+
+
+def _status_case(percentage_field, species_field, levels):
+    """
+    Case/When ladder built from the cached threshold profiles.
+    Species sharing the default thresholds fall through to the default ladder.
+    """
+    profiles = GrowthThresholdProfile.cached_profiles()
+    default_levels = levels(GrowthThresholdProfile.default())
+
+    whens = [When(**{f"{percentage_field}__isnull": True}, then=Value(NO_DATA))]
+
+    groups = defaultdict(list)
+    for species_id, profile in profiles.items():
+        if species_id is not None and levels(profile) != default_levels:
+            groups[levels(profile)].append(species_id)
+
+    for species_levels, species_ids in groups.items():
+        in_species = Q(**{f"{species_field}__in": species_ids})
+        for label, threshold in species_levels:
+            whens.append(When(
+                in_species & Q(**{f"{percentage_field}__gte": float(threshold)}),
+                then=Value(label),
+            ))
+        whens.append(When(in_species, then=Value(POOR)))
+
+    for label, threshold in default_levels:
+        whens.append(When(
+            **{f"{percentage_field}__gte": float(threshold)},
+            then=Value(label),
+        ))
+
+    return Case(*whens, default=Value(POOR), output_field=CharField())
+
+
+def with_growth_status(queryset):
+    """
+    Annotate FishSampling rows with db_average_weight, db_growth_from_previous,
+    db_growth_percentage (from the stored columns) and db_growth_status (same
+    rules as the Python property).
+    """
+    return (
+        queryset
+        .annotate(
+            db_average_weight=average_weight_expression(),
+            db_growth_from_previous=Cast("growth_from_previous", FloatField()),
+            db_growth_percentage=Cast("growth_percentage", FloatField()),
+        )
+        .annotate(db_growth_status=_status_case(
+            "db_growth_percentage",
+            "fish_stock__species_id",
+            GrowthThresholdProfile.sampling_levels,
+        ))
+    )
+
+
+def with_overall_status(queryset):
+    """
+    Annotate PondFishStock rows with db_latest_average_weight,
+    db_total_growth_percentage and db_overall_status.
+    """
+    latest_average = (
+        FishSampling.objects
+        .filter(fish_stock=OuterRef("pk"))
+        .order_by("-sampled_on")
+        .annotate(avg=average_weight_expression())
+        .values("avg")[:1]
+    )
+
+    return (
+        queryset
+        .annotate(db_latest_average_weight=Subquery(latest_average, output_field=FloatField()))
+        .annotate(db_total_growth_percentage=_growth_percentage(
+            F("db_latest_average_weight"),
+            Cast("initial_avg_weight", FloatField()),
+        ))
+        .annotate(db_overall_status=_status_case(
+            "db_total_growth_percentage",
+            "species_id",
+            GrowthThresholdProfile.overall_levels,
+        ))
+    )
+
+
+class DaysBetween(Func):
+    """Whole days from `start` to `end` (two DateField expressions) as a float."""
+    output_field = FloatField()
+    arity = 2
+
+    def __init__(self, end, start, **extra):
+        super().__init__(end, start, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template="(julianday(%(expressions)s))",
+            arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        # date - date is an integer number of days
+        return self.as_sql(
+            compiler, connection,
+            template="((%(expressions)s)::double precision)",
+            arg_joiner=" - ",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function="DATEDIFF", **extra_context)
+
+
+# --------------------
+# Specific growth rate leaderboard
+# --------------------
+SGR_SINCE_STOCKING = "stocking"
+SGR_SINCE_PREVIOUS = "previous"
+
+LEADERBOARD_PARTITIONS = {
+    "species": "species_id",
+    "pond": "pond_id",
+    "none": None,
+}
+
+LEADERBOARD_RANKINGS = {
+    "rank": Rank,
+    "row_number": RowNumber,
+}
+
+
+def _sampling_at(offset, field):
+    """Subquery for `field` of the stock's nth latest sampling (0 = latest)."""
+    samplings = (
+        FishSampling.objects
+        .filter(fish_stock=OuterRef("pk"))
+        .order_by("-sampled_on", "-pk")
+    )
+    if field == "avg":
+        samplings = samplings.annotate(avg=average_weight_expression())
+    return samplings.values(field)[offset:offset + 1]
+
+
+def with_specific_growth_rate(queryset, basis=SGR_SINCE_STOCKING):
+    """
+    Annotate PondFishStock rows with db_sgr: specific growth rate
+    (% per day) = 100 * (ln W_latest - ln W_base) / days.
+    Base is stocking, or the sampling before the latest one.
+    """
+    latest_weight = Subquery(_sampling_at(0, "avg"), output_field=FloatField())
+    latest_date = Subquery(_sampling_at(0, "sampled_on"))
+
+    base_weight = Cast("initial_avg_weight", FloatField())
+    base_date = F("stocked_on")
+    if basis == SGR_SINCE_PREVIOUS:
+        # Falls back to stocking when the stock has a single sampling
+        base_weight = Coalesce(
+            Subquery(_sampling_at(1, "avg"), output_field=FloatField()),
+            base_weight,
+        )
+        base_date = Coalesce(Subquery(_sampling_at(1, "sampled_on")), base_date)
+
+    return (
+        queryset
+        .annotate(
+            db_latest_average_weight=latest_weight,
+            db_latest_sampled_on=latest_date,
+            db_base_average_weight=base_weight,
+            db_base_date=base_date,
+        )
+        .annotate(db_sgr_days=NullIf(
+            DaysBetween(F("db_latest_sampled_on"), F("db_base_date")),
+            0.0,
+        ))
+        .annotate(db_sgr=Round(
+            (Ln(F("db_latest_average_weight")) - Ln(NullIf(F("db_base_average_weight"), 0.0)))
+            * 100.0 / F("db_sgr_days"),
+            4,
+        ))
+    )
+
+
+def stock_leaderboard(
+    user,
+    basis=SGR_SINCE_STOCKING,
+    partition="species",
+    ranking="rank",
+    bottom=False,
+    k=5,
+):
+    """
+    Top (or bottom) k active stocks by SGR within each partition,
+    ranked with a window function in a single query.
+    """
+    partition_field = LEADERBOARD_PARTITIONS[partition]
+    rank_function = LEADERBOARD_RANKINGS[ranking]
+    order = [F("db_sgr").asc() if bottom else F("db_sgr").desc()]
+    if rank_function is RowNumber:
+        # Deterministic order among ties
+        order.append(F("pk").asc())
+
+    queryset = (
+        with_specific_growth_rate(
+            PondFishStock.objects.filter(user=user, status=PondFishStock.ACTIVE),
+            basis=basis,
+        )
+        .filter(db_sgr__isnull=False)
+        .annotate(position=Window(
+            expression=rank_function(),
+            partition_by=[F(partition_field)] if partition_field else None,
+            order_by=order,
+        ))
+        .filter(position__lte=k)
+    )
+
+    ordering = [partition_field] if partition_field else []
+    return queryset.order_by(*ordering, "position").values(
+        "id",
+        "position",
+        "pond_id",
+        "pond__name",
+        "species_id",
+        "species__name",
+        "quantity",
+        "stocked_on",
+        "db_latest_sampled_on",
+        "db_latest_average_weight",
+        "db_sgr_days",
+        "db_sgr",
+    )
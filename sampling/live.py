@@ -0,0 +1,168 @@
+import asyncio
+import itertools
+import threading
+from collections import defaultdict
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.utils.module_loading import import_string
+from core.caching import cache_is_shared
+
+# --------------------
+# Live dashboard events
+# --------------------
+# Model signals publish small per-user events; the SSE view
+# (sampling.views.sampling_events) streams them to connected browsers.
+# Streams are only served by the ASGI application (fish_farm.asgi, run
+# under uvicorn / daphne): a WSGI worker would have to buffer the endless
+# response, so there the dashboard does not open one.
+#
+# The broker is pluggable through LIVE_EVENTS_BACKEND:
+#   LocalBroker - in-process fan-out (single worker)
+#   CacheBroker - per-user event log in the Django cache, polled by each
+#                 connection; needs a cache shared by all workers
+
+QUEUE_SIZE = 100
+
+
+class LocalBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self._ids = itertools.count(1)
+
+    def publish(self, user_id, event):
+        event = {**event, "id": next(self._ids)}
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        # Publishers run in sync threads; hand over to each stream's loop
+        for subscription in subscribers:
+            subscription.loop.call_soon_threadsafe(subscription.offer, event)
+
+    def subscribe(self, user_id):
+        subscription = LocalSubscription(self, user_id)
+        with self._lock:
+            self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+
+class LocalSubscription:
+    def __init__(self, broker, user_id):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def offer(self, event):
+        # A stalled browser loses its oldest events, never blocks publishers
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout):
+        """Next event, or None after `timeout` seconds without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class CacheBroker:
+    SEQUENCE_KEY = "live-events:{}:seq"
+    EVENT_KEY = "live-events:{}:{}"
+    EVENT_TIMEOUT = 60
+    POLL_SECONDS = 0.25
+
+    def __init__(self):
+        if not cache_is_shared():
+            raise ImproperlyConfigured(
+                "CacheBroker needs a cache shared by all workers; "
+                f"CACHES['default'] uses {settings.CACHES['default']['BACKEND']}."
+            )
+
+    def publish(self, user_id, event):
+        sequence_key = self.SEQUENCE_KEY.format(user_id)
+        cache.add(sequence_key, 0, None)
+        sequence = cache.incr(sequence_key)
+        cache.set(
+            self.EVENT_KEY.format(user_id, sequence),
+            {**event, "id": sequence},
+            self.EVENT_TIMEOUT,
+        )
+
+    def subscribe(self, user_id):
+        return CacheSubscription(self, user_id)
+
+
+class CacheSubscription:
+    def __init__(self, broker, user_id):
+        self.broker = broker
+        self.user_id = user_id
+        self.pending = []
+        self.missing = None
+        # Only events published after connecting
+        self.last_seen = cache.get(broker.SEQUENCE_KEY.format(user_id)) or 0
+
+    async def get(self, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self.pending:
+            await self._poll()
+            if self.pending:
+                break
+            if loop.time() >= deadline:
+                return None
+            await asyncio.sleep(self.broker.POLL_SECONDS)
+        return self.pending.pop(0)
+
+    async def _poll(self):
+        sequence = await cache.aget(self.broker.SEQUENCE_KEY.format(self.user_id)) or 0
+        if sequence <= self.last_seen:
+            return
+
+        first = max(self.last_seen + 1, sequence - QUEUE_SIZE + 1)
+        keys = [self.broker.EVENT_KEY.format(self.user_id, n) for n in range(first, sequence + 1)]
+        events = await cache.aget_many(keys)
+        for number, key in zip(range(first, sequence + 1), keys):
+            if key in events:
+                self.pending.append(events[key])
+            elif self.missing != number:
+                # Numbered but not written yet: retry on the next poll once
+                self.missing = number
+                break
+            self.last_seen = number
+
+    def close(self):
+        pass
+
+
+_broker = None
+
+
+def streaming_supported(request):
+    return isinstance(request, ASGIRequest)
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        backend = getattr(settings, "LIVE_EVENTS_BACKEND", "sampling.live.LocalBroker")
+        _broker = import_string(backend)()
+    return _broker
+
+
+def publish_on_commit(user_id, event):
+    transaction.on_commit(lambda: get_broker().publish(user_id, event))
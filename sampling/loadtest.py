@@ -0,0 +1,563 @@
+import json
+import math
+import platform
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from wsgiref.simple_server import WSGIRequestHandler
+import numpy as np
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.servers.basehttp import ThreadedWSGIServer
+from django.core.wsgi import get_wsgi_application
+from django.db import OperationalError, connection, connections, transaction
+from django.db.models import Max
+from django.middleware.csrf import CSRF_ALLOWED_CHARS
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+from core.models import FishSpecies, Pond
+from sampling.models import FishSampling, PondFishStock
+from sampling.services import create_sampling_from_batches
+
+# --------------------
+# Concurrent load test
+# --------------------
+# Simulated field crews - one thread and one login each - hit the real
+# WSGI stack over HTTP with a weighted mix of dashboard / API reads and
+# sampling writes, on a generated dataset of loadtest-* users. The
+# application runs in-process behind a threaded WSGI server (or is any
+# local server given by URL, ASGI included), so middleware, sessions, CSRF
+# and database locking behave as deployed.
+#
+# In-process runs also time every query of every request and count the
+# ones that failed on a lock ("database is locked", deadlocks, lock wait
+# timeouts); the server reports both back in response headers.
+#
+# Results are plain JSON (see summarize) so runs of different releases can
+# be diffed with compare_results.
+
+USERNAME_PREFIX = "loadtest-"
+PASSWORD = "loadtest"
+
+BATCH_SIZE = 10
+BATCHES_PER_SAMPLING = 5
+HISTORY_INTERVAL_DAYS = 7
+STOCKED_DAYS_AGO = 365
+
+# Relative weights; a crew mostly reads between writes
+DEFAULT_MIX = {
+    "dashboard": 30,
+    "dashboard_filtered": 10,
+    "stock_list": 20,
+    "sampling_list": 10,
+    "schedule": 10,
+    "create_sampling": 20,
+}
+
+PERCENTILES = [50, 95, 99]
+REQUEST_TIMEOUT = 60
+
+DB_TIME_HEADER = "X-Loadtest-DB-Ms"
+QUERIES_HEADER = "X-Loadtest-Queries"
+LOCK_ERRORS_HEADER = "X-Loadtest-Lock-Errors"
+
+LOCK_MESSAGES = ("database is locked", "database table is locked", "deadlock", "lock wait timeout", "could not obtain lock")
+
+
+# --------------------
+# Dataset
+# --------------------
+def _average_weight(rng, day):
+    # Roughly exponential growth from 10 g, levelling off near 800 g
+    return min(10 * math.exp(0.025 * day), 800) * rng.uniform(0.9, 1.1)
+
+
+def _batches(rng, average_weight):
+    return [
+        max(1, round(BATCH_SIZE * average_weight * rng.uniform(0.9, 1.1)))
+        for _ in range(BATCHES_PER_SAMPLING)
+    ]
+
+
+def delete_dataset(prefix=USERNAME_PREFIX):
+    """Remove every load-test user; ponds, stocks and samplings cascade."""
+    deleted, _ = get_user_model().objects.filter(username__startswith=prefix).delete()
+    return deleted
+
+
+def generate_dataset(crews, stocks_per_crew=3, history=12, seed=0, prefix=USERNAME_PREFIX, progress=None):
+    """
+    `crews` users, each with `stocks_per_crew` ponds holding one active
+    stock and `history` weekly samplings, saved through the same service
+    as the API so every derived table is filled in.
+    """
+    rng = random.Random(seed)
+    today = timezone.localdate()
+    stocked_on = today - timedelta(days=STOCKED_DAYS_AGO)
+    User = get_user_model()
+
+    for number in range(crews):
+        with transaction.atomic():
+            user = User.objects.create_user(f"{prefix}{number:04d}", password=PASSWORD)
+            species = FishSpecies.objects.create(name="Tilapia", user=user)
+            for pond_number in range(stocks_per_crew):
+                pond = Pond.objects.create(
+                    user=user,
+                    name=f"Pond {pond_number + 1}",
+                    area_acres=Decimal(rng.randint(50, 500)) / 100,
+                )
+                stock = PondFishStock.objects.create(
+                    user=user,
+                    pond=pond,
+                    species=species,
+                    quantity=rng.randint(1000, 10000),
+                    initial_avg_weight=Decimal("10.00"),
+                    stocked_on=stocked_on,
+                )
+                for index in range(1, history + 1):
+                    day = index * HISTORY_INTERVAL_DAYS
+                    create_sampling_from_batches(
+                        user=user,
+                        fish_stock=stock,
+                        sampled_on=stocked_on + timedelta(days=day),
+                        batch_size=BATCH_SIZE,
+                        batches=_batches(rng, _average_weight(rng, day)),
+                    )
+        if progress:
+            progress(number + 1)
+
+
+def load_crews(prefix=USERNAME_PREFIX, seed=0):
+    """Crew state for every load-test user with at least one active stock."""
+    stocks = defaultdict(list)
+    rows = (
+        PondFishStock.objects
+        .filter(user__username__startswith=prefix, status=PondFishStock.ACTIVE)
+        .order_by("user_id", "pk")
+        .values_list("user_id", "pk", "pond_id", "stocked_on")
+    )
+    last_sampled = dict(
+        FishSampling.objects
+        .filter(user__username__startswith=prefix)
+        .order_by()
+        .values_list("fish_stock_id")
+        .annotate(last=Max("sampled_on"))
+    )
+    for user_id, stock_id, pond_id, stocked_on in rows:
+        stocks[user_id].append((stock_id, pond_id, stocked_on, last_sampled.get(stock_id, stocked_on)))
+
+    users = get_user_model().objects.filter(pk__in=stocks).order_by("username")
+    return [Crew(user, stocks[user.pk], random.Random(f"{seed}:{user.pk}")) for user in users]
+
+
+class Crew:
+    """One simulated field crew: its login, stocks and next free sampling dates."""
+
+    def __init__(self, user, stocks, rng):
+        self.user = user
+        self.rng = rng
+        self.stock_ids = [stock_id for stock_id, _, _, _ in stocks]
+        self.pond_ids = sorted({pond_id for _, pond_id, _, _ in stocks})
+        self.stocked_on = {stock_id: stocked_on for stock_id, _, stocked_on, _ in stocks}
+        self.next_date = {stock_id: last + timedelta(days=1) for stock_id, _, _, last in stocks}
+        self.cookies = {}
+        self.csrf_token = None
+
+    def login(self):
+        # A real session row / cookie, so a separate server sees it too
+        client = Client()
+        client.force_login(self.user)
+        self.cookies = {name: morsel.value for name, morsel in client.cookies.items()}
+        self.csrf_token = get_random_string(32, CSRF_ALLOWED_CHARS)
+        self.cookies[settings.CSRF_COOKIE_NAME] = self.csrf_token
+
+    def sampling_payload(self):
+        """The next new sampling of a random stock; None once all reach today."""
+        today = timezone.localdate()
+        open_stocks = [stock_id for stock_id in self.stock_ids if self.next_date[stock_id] <= today]
+        if not open_stocks:
+            return None
+
+        stock_id = self.rng.choice(open_stocks)
+        sampled_on = self.next_date[stock_id]
+        self.next_date[stock_id] = sampled_on + timedelta(days=1)
+        day = (sampled_on - self.stocked_on[stock_id]).days
+        return {
+            "fish_stock": stock_id,
+            "sampled_on": sampled_on.isoformat(),
+            "batch_size": BATCH_SIZE,
+            "batches": _batches(self.rng, _average_weight(self.rng, day)),
+        }
+
+
+# --------------------
+# Operations
+# --------------------
+# Each returns (method, path, JSON body or None), or None to skip
+def _dashboard(crew):
+    return "GET", reverse("sampling-dashboard"), None
+
+
+def _dashboard_filtered(crew):
+    return "GET", f"{reverse('sampling-dashboard')}?pond={crew.rng.choice(crew.pond_ids)}", None
+
+
+def _stock_list(crew):
+    return "GET", reverse("api-stock-list-create"), None
+
+
+def _sampling_list(crew):
+    return "GET", reverse("api-samplings"), None
+
+
+def _schedule(crew):
+    return "GET", reverse("api-sampling-calendar"), None
+
+
+def _create_sampling(crew):
+    payload = crew.sampling_payload()
+    return payload and ("POST", reverse("api-sampling-create"), payload)
+
+
+OPERATIONS = {
+    "dashboard": _dashboard,
+    "dashboard_filtered": _dashboard_filtered,
+    "stock_list": _stock_list,
+    "sampling_list": _sampling_list,
+    "schedule": _schedule,
+    "create_sampling": _create_sampling,
+}
+
+
+def parse_mix(value):
+    """'dashboard=30,create_sampling=20' -> {name: weight}."""
+    mix = {}
+    for part in filter(None, (part.strip() for part in value.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}; choose from {', '.join(OPERATIONS)}")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise ValueError(f"Weight of {name!r} must be a number")
+        if mix[name] < 0:
+            raise ValueError(f"Weight of {name!r} cannot be negative")
+    if not any(mix.values()):
+        raise ValueError("At least one operation needs a positive weight")
+    return mix
+
+
+# --------------------
+# In-process server
+# --------------------
+class _QueryRecorder:
+    def __init__(self):
+        self.seconds = 0.0
+        self.queries = 0
+        self.lock_errors = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        except OperationalError as error:
+            if any(message in str(error).lower() for message in LOCK_MESSAGES):
+                self.lock_errors += 1
+            raise
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.queries += 1
+
+
+def instrumented(application):
+    """WSGI app reporting each request's query time / lock errors in headers."""
+
+    def app(environ, start_response):
+        recorder = _QueryRecorder()
+
+        def record_start_response(status, headers, exc_info=None):
+            headers = list(headers) + [
+                (DB_TIME_HEADER, f"{recorder.seconds * 1000:.3f}"),
+                (QUERIES_HEADER, str(recorder.queries)),
+                (LOCK_ERRORS_HEADER, str(recorder.lock_errors)),
+            ]
+            return start_response(status, headers, exc_info)
+
+        with connection.execute_wrapper(recorder):
+            return application(environ, record_start_response)
+
+    return app
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServer:
+    """The project's WSGI application on an ephemeral 127.0.0.1 port."""
+
+    def __init__(self):
+        self.httpd = ThreadedWSGIServer(("127.0.0.1", 0), _QuietRequestHandler)
+        self.httpd.set_app(instrumented(get_wsgi_application()))
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# --------------------
+# Running
+# --------------------
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # A redirect (to the login page) is a failure, not something to follow
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+_opener = urllib.request.build_opener(_NoRedirect)
+
+
+def _send(base_url, crew, method, path, payload):
+    headers = {
+        "Cookie": "; ".join(f"{name}={value}" for name, value in crew.cookies.items()),
+        "Accept": "application/json" if path.startswith("/api/") else "text/html",
+    }
+    data = None
+    if payload is not None:
+        data = json.dumps(payload).encode()
+        headers["Content-Type"] = "application/json"
+        headers["X-CSRFToken"] = crew.csrf_token
+
+    request = urllib.request.Request(base_url + path, data=data, headers=headers, method=method)
+    try:
+        with _opener.open(request, timeout=REQUEST_TIMEOUT) as response:
+            response.read()
+            return response.status, response.headers
+    except urllib.error.HTTPError as error:
+        error.read()
+        return error.code, error.headers
+
+
+class Recorder:
+    """Thread-safe per-operation samples."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.db_times = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+        self.lock_errors = defaultdict(int)
+        self.queries = defaultdict(int)
+        self.skipped = defaultdict(int)
+
+    def add(self, name, seconds, status, headers):
+        with self.lock:
+            self.latencies[name].append(seconds)
+            self.statuses[name][str(status)] += 1
+            if not 200 <= status < 300:
+                self.errors[name] += 1
+            if headers is not None and DB_TIME_HEADER in headers:
+                self.db_times[name].append(float(headers[DB_TIME_HEADER]) / 1000)
+                self.queries[name] += int(headers[QUERIES_HEADER])
+                self.lock_errors[name] += int(headers[LOCK_ERRORS_HEADER])
+
+    def skip(self, name):
+        with self.lock:
+            self.skipped[name] += 1
+
+
+def _crew_loop(base_url, crew, mix, recorder, measure_from, stop_at, think, barrier):
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    barrier.wait()
+
+    while time.perf_counter() < stop_at:
+        name = crew.rng.choices(names, weights)[0]
+        request = OPERATIONS[name](crew)
+        if request is None:
+            if time.perf_counter() >= measure_from:
+                recorder.skip(name)
+            continue
+
+        began = time.perf_counter()
+        try:
+            status, headers = _send(base_url, crew, *request)
+        except OSError:
+            # Refused / reset / timed out connections count as failures
+            status, headers = 599, None
+        finished = time.perf_counter()
+
+        if began >= measure_from:
+            recorder.add(name, finished - began, status, headers)
+        if think:
+            time.sleep(crew.rng.expovariate(1 / think))
+
+
+def run(crews, duration, warmup=0.0, mix=None, think=0.0, url=None):
+    """
+    Drive `crews` concurrently for warmup + duration seconds; only requests
+    started after the warmup are recorded. Returns (Recorder, seconds measured).
+    """
+    mix = {name: weight for name, weight in (mix or DEFAULT_MIX).items() if weight > 0}
+    for crew in crews:
+        crew.login()
+    # Sessions are written; leave no transaction or connection behind
+    connections.close_all()
+
+    def drive(base_url):
+        recorder = Recorder()
+        barrier = threading.Barrier(len(crews) + 1)
+        measure_from = time.perf_counter() + warmup
+        stop_at = measure_from + duration
+        threads = [
+            threading.Thread(
+                target=_crew_loop,
+                args=(base_url, crew, mix, recorder, measure_from, stop_at, think, barrier),
+                daemon=True,
+            )
+            for crew in crews
+        ]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        for thread in threads:
+            thread.join()
+        return recorder, max(time.perf_counter() - measure_from, 1e-9)
+
+    if url:
+        return drive(url.rstrip("/"))
+    with LocalServer() as server:
+        return drive(server.url)
+
+
+# --------------------
+# Results
+# --------------------
+def _percentiles(seconds):
+    if not seconds:
+        return {f"p{p}_ms": None for p in PERCENTILES}
+    values = np.percentile(np.array(seconds) * 1000, PERCENTILES)
+    return {f"p{p}_ms": round(float(value), 2) for p, value in zip(PERCENTILES, values)}
+
+
+def _stats(latencies, errors, elapsed, db_times=None, queries=0, lock_errors=0, statuses=None, skipped=0):
+    count = len(latencies)
+    stats = {
+        "requests": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else None,
+        "throughput_rps": round(count / elapsed, 2),
+        **_percentiles(latencies),
+        "mean_ms": round(float(np.mean(latencies)) * 1000, 2) if count else None,
+        "max_ms": round(max(latencies) * 1000, 2) if count else None,
+    }
+    if db_times is not None:
+        stats.update({
+            "db_mean_ms": round(float(np.mean(db_times)) * 1000, 2) if db_times else None,
+            "db_share": round(sum(db_times) / sum(latencies), 4) if latencies else None,
+            "queries_per_request": round(queries / count, 1) if count else None,
+            "lock_errors": lock_errors,
+        })
+    if statuses is not None:
+        stats["statuses"] = dict(sorted(statuses.items()))
+        stats["skipped"] = skipped
+    return stats
+
+
+def summarize(recorder, elapsed, config, label=""):
+    """JSON-ready results of one run."""
+    instrumented_run = bool(recorder.db_times)
+    operations = {
+        name: _stats(
+            recorder.latencies[name],
+            recorder.errors[name],
+            elapsed,
+            recorder.db_times[name] if instrumented_run else None,
+            recorder.queries[name],
+            recorder.lock_errors[name],
+            recorder.statuses[name],
+            recorder.skipped[name],
+        )
+        for name in sorted(set(recorder.latencies) | set(recorder.skipped))
+    }
+
+    everything = [seconds for latencies in recorder.latencies.values() for seconds in latencies]
+    all_db_times = [seconds for times in recorder.db_times.values() for seconds in times]
+    totals = _stats(
+        everything,
+        sum(recorder.errors.values()),
+        elapsed,
+        all_db_times if instrumented_run else None,
+        sum(recorder.queries.values()),
+        sum(recorder.lock_errors.values()),
+    )
+
+    return {
+        "label": label,
+        "finished_at": timezone.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "debug": settings.DEBUG,
+        },
+        "config": config,
+        "elapsed_seconds": round(elapsed, 2),
+        "totals": totals,
+        "operations": operations,
+    }
+
+
+def _change(old, new):
+    if old in (None, 0) or new is None:
+        return None
+    return round((new - old) / old * 100, 1)
+
+
+def compare_results(baseline, current, tolerance=10.0):
+    """
+    Per-operation change from `baseline` to `current` results. A regression
+    is p95 latency or error rate up, or throughput down, by more than
+    `tolerance` percent (error rate: percentage points).
+    """
+    rows = []
+    names = sorted(set(baseline["operations"]) | set(current["operations"])) + ["totals"]
+    for name in names:
+        old = baseline["totals"] if name == "totals" else baseline["operations"].get(name)
+        new = current["totals"] if name == "totals" else current["operations"].get(name)
+        if not old or not new or not old["requests"] or not new["requests"]:
+            rows.append({"operation": name, "regressed": False, "missing": True})
+            continue
+
+        p95 = _change(old["p95_ms"], new["p95_ms"])
+        throughput = _change(old["throughput_rps"], new["throughput_rps"])
+        error_points = round(((new["error_rate"] or 0) - (old["error_rate"] or 0)) * 100, 2)
+        rows.append({
+            "operation": name,
+            "p95_change_pct": p95,
+            "throughput_change_pct": throughput,
+            "error_rate_change_points": error_points,
+            "regressed": (
+                (p95 is not None and p95 > tolerance)
+                or (throughput is not None and throughput < -tolerance)
+                or error_points > tolerance
+            ),
+            "missing": False,
+        })
+    return rows
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from sampling.archive import ARCHIVE_AFTER_DAYS, archivable_stocks, archive_closed_stocks
+
+
+class Command(BaseCommand):
+    help = "Move closed stocks (and their samplings / feed) to the archive tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=ARCHIVE_AFTER_DAYS,
+            help="Archive stocks closed more than this many days ago",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            count = archivable_stocks(options["days"]).count()
+            self.stdout.write(f"{count} stocks would be archived")
+            return
+
+        count = archive_closed_stocks(options["days"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {count} stocks"))
@@ -0,0 +1,59 @@
+import os
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from sampling.export import (
+    ARROW,
+    CHUNK_SIZE,
+    PARQUET,
+    PARQUET_COMPRESSION,
+    export_querysets,
+    record_batches,
+    write_export,
+    write_partitioned_export,
+)
+
+
+class Command(BaseCommand):
+    help = "Export samplings with stock / pond / species columns to Parquet or Arrow"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="File path, or directory with --partition-by-year")
+        parser.add_argument("--format", choices=[PARQUET, ARROW], default=PARQUET)
+        parser.add_argument("--user", help="Only this username's samplings")
+        parser.add_argument("--year", type=int, help="Only samplings taken in this year")
+        parser.add_argument(
+            "--partition-by-year",
+            action="store_true",
+            help="Write a year=YYYY/ partitioned dataset",
+        )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument(
+            "--compression",
+            default=PARQUET_COMPRESSION,
+            help="Parquet codec (zstd, snappy, gzip, none)",
+        )
+
+    def handle(self, *args, **options):
+        user = None
+        if options["user"]:
+            try:
+                user = get_user_model().objects.get(username=options["user"])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"Unknown user {options['user']!r}")
+
+        batches = record_batches(
+            export_querysets(user=user, year=options["year"]),
+            chunk_size=options["chunk_size"],
+        )
+        output = options["output"]
+        if options["partition_by_year"]:
+            rows = write_partitioned_export(batches, output, options["format"], options["compression"])
+        else:
+            rows = write_export(batches, output, options["format"], options["compression"])
+
+        size = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(output)
+            for name in names
+        ) if os.path.isdir(output) else os.path.getsize(output)
+        self.stdout.write(self.style.SUCCESS(f"Exported {rows} samplings to {output} ({size} bytes)"))
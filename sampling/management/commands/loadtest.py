@@ -0,0 +1,218 @@
+import json
+import logging
+from collections import Counter
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from sampling.loadtest import (
+    DEFAULT_MIX,
+    USERNAME_PREFIX,
+    compare_results,
+    delete_dataset,
+    generate_dataset,
+    load_crews,
+    parse_mix,
+    run,
+    summarize,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the web / API layer with concurrent simulated crews on a "
+        "generated dataset of loadtest-* users"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10, help="Concurrent simulated crews")
+        parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+        parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds first")
+        parser.add_argument(
+            "--think-ms",
+            type=float,
+            default=0,
+            help="Mean pause between a crew's requests (exponential)",
+        )
+        parser.add_argument(
+            "--mix",
+            default=",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items()),
+            help="Operation weights, e.g. dashboard=30,create_sampling=20",
+        )
+        parser.add_argument(
+            "--url",
+            help="Drive a running local server (same database) instead of an in-process one",
+        )
+        parser.add_argument("--stocks", type=int, default=3, help="Active stocks per crew")
+        parser.add_argument("--history", type=int, default=12, help="Weekly samplings per stock")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--reuse-data",
+            action="store_true",
+            help="Run on the existing loadtest-* users instead of generating new ones",
+        )
+        parser.add_argument(
+            "--keep-data",
+            action="store_true",
+            help="Leave the loadtest-* users in the database afterwards",
+        )
+        parser.add_argument("--label", default="", help="Release / run name stored with the results")
+        parser.add_argument("--output", help="Write the JSON results to this file")
+        parser.add_argument("--compare", help="Baseline JSON results to compare with")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=10.0,
+            help="Percent change counted as a regression by --compare",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error when --compare finds a regression",
+        )
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["duration"] <= 0 or options["warmup"] < 0:
+            raise CommandError("--users and --duration must be positive, --warmup not negative")
+        try:
+            mix = parse_mix(options["mix"])
+        except ValueError as error:
+            raise CommandError(error)
+
+        baseline = None
+        if options["compare"]:
+            try:
+                with open(options["compare"]) as file:
+                    baseline = json.load(file)
+            except (OSError, ValueError) as error:
+                raise CommandError(f"Cannot read {options['compare']}: {error}")
+
+        if settings.DEBUG:
+            self.stderr.write(self.style.WARNING("DEBUG is on; timings will be slower than in production."))
+
+        if not options["reuse_data"]:
+            delete_dataset()
+            self.stdout.write(f"Generating {options['users']} crews...")
+            generate_dataset(
+                options["users"],
+                stocks_per_crew=options["stocks"],
+                history=options["history"],
+                seed=options["seed"],
+                progress=lambda done: self.stdout.write(f"  {done}/{options['users']}", ending="\r"),
+            )
+            self.stdout.write("")
+
+        crews = load_crews(seed=options["seed"])[:options["users"]]
+        if not crews:
+            raise CommandError(f"No {USERNAME_PREFIX}* users with active stocks to run as")
+
+        # Failed requests are counted below; their tracebacks only with -v 2
+        request_logger = logging.getLogger("django.request")
+        request_logger.disabled = options["verbosity"] < 2
+        try:
+            self.stdout.write(
+                f"Running {len(crews)} crews for {options['warmup']:g}s warmup + "
+                f"{options['duration']:g}s against {options['url'] or 'an in-process server'}..."
+            )
+            recorder, elapsed = run(
+                crews,
+                options["duration"],
+                warmup=options["warmup"],
+                mix=mix,
+                think=options["think_ms"] / 1000,
+                url=options["url"],
+            )
+        finally:
+            request_logger.disabled = False
+            if not options["keep_data"]:
+                delete_dataset()
+
+        config = {
+            "users": len(crews),
+            "duration": options["duration"],
+            "warmup": options["warmup"],
+            "think_ms": options["think_ms"],
+            "mix": mix,
+            "target": options["url"] or "in-process",
+            "stocks_per_crew": options["stocks"],
+            "history": options["history"],
+            "seed": options["seed"],
+        }
+        results = summarize(recorder, elapsed, config, label=options["label"])
+        self.write_report(results)
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(results, file, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if baseline is not None:
+            rows = compare_results(baseline, results, options["tolerance"])
+            self.write_comparison(baseline, results, rows)
+            regressed = [row["operation"] for row in rows if row["regressed"]]
+            if regressed and options["fail_on_regression"]:
+                raise CommandError(f"Regression in: {', '.join(regressed)}")
+
+    # --------------------
+    # Output
+    # --------------------
+    def write_report(self, results):
+        instrumented = "lock_errors" in results["totals"]
+        header = f"{'operation':<20}{'req':>7}{'err%':>7}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}"
+        if instrumented:
+            header += f"{'db%':>6}{'q/req':>7}{'locks':>7}"
+        self.stdout.write(header)
+
+        rows = list(results["operations"].items()) + [("TOTAL", results["totals"])]
+        for name, stats in rows:
+            line = (
+                f"{name:<20}{stats['requests']:>7}{_pct(stats['error_rate']):>7}"
+                f"{stats['throughput_rps']:>8}{_ms(stats['p50_ms']):>9}"
+                f"{_ms(stats['p95_ms']):>9}{_ms(stats['p99_ms']):>9}"
+            )
+            if instrumented:
+                line += (
+                    f"{_pct(stats['db_share'], 0):>6}{_value(stats['queries_per_request']):>7}"
+                    f"{stats['lock_errors']:>7}"
+                )
+            if stats.get("skipped"):
+                line += f"  ({stats['skipped']} skipped)"
+            style = self.style.ERROR if stats["errors"] else (lambda text: text)
+            self.stdout.write(style(line))
+
+        failures = Counter()
+        for stats in results["operations"].values():
+            failures.update({
+                status: count for status, count in stats["statuses"].items() if not status.startswith("2")
+            })
+        if failures:
+            self.stdout.write(self.style.WARNING(f"Non-2xx responses: {dict(sorted(failures.items()))}"))
+
+    def write_comparison(self, baseline, results, rows):
+        self.stdout.write(f"\nCompared with {baseline.get('label') or baseline.get('finished_at')}:")
+        if baseline.get("config") != results["config"]:
+            self.stdout.write(self.style.WARNING("The runs used different settings; changes may not be comparable."))
+        for row in rows:
+            if row["missing"]:
+                self.stdout.write(f"{row['operation']:<20}not in both runs")
+                continue
+            line = (
+                f"{row['operation']:<20}p95 {_signed(row['p95_change_pct'])}%  "
+                f"rps {_signed(row['throughput_change_pct'])}%  "
+                f"errors {_signed(row['error_rate_change_points'])} pts"
+            )
+            self.stdout.write(self.style.ERROR(line + "  REGRESSED") if row["regressed"] else line)
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def _pct(value, digits=1):
+    return "-" if value is None else f"{value * 100:.{digits}f}"
+
+
+def _value(value):
+    return "-" if value is None else value
+
+
+def _signed(value):
+    return "n/a" if value is None else f"{value:+.1f}"
@@ -0,0 +1,21 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from sampling.anomalies import rebuild_growth_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild running growth statistics and anomaly flags from sampling history"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only rebuild for this username")
+
+    def handle(self, *args, **options):
+        user = None
+        if options["user"]:
+            try:
+                user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+
+        count = rebuild_growth_stats(user=user)
+        self.stdout.write(self.style.SUCCESS(f"Replayed {count} samplings"))
@@ -0,0 +1,21 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from sampling.cohorts import rebuild_all_reference_curves
+
+
+class Command(BaseCommand):
+    help = "Rebuild cycle growth curves of closed stocks and the reference curves built from them"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only rebuild for this username")
+
+    def handle(self, *args, **options):
+        user = None
+        if options["user"]:
+            try:
+                user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+
+        count = rebuild_all_reference_curves(user=user)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} cycle curves"))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from core.models import FishSpecies, Pond, SearchTerm
+from core.search import index_pond, index_species
+from sampling.models import PondFishStock
+from sampling.services import index_stock
+
+
+class Command(BaseCommand):
+    help = "Rebuild the typeahead search index for ponds, species and active stocks"
+
+    def handle(self, *args, **options):
+        SearchTerm.objects.all().delete()
+
+        for pond in Pond.objects.iterator():
+            index_pond(pond)
+
+        for species in FishSpecies.objects.iterator():
+            index_species(species)
+
+        stocks = (
+            PondFishStock.objects
+            .filter(status=PondFishStock.ACTIVE)
+            .select_related("pond", "species")
+        )
+        for stock in stocks.iterator():
+            index_stock(stock)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {SearchTerm.objects.count()} search terms")
+        )
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from sampling.projections import (
+    DEFAULT_HORIZON_DAYS,
+    MAX_HORIZON_DAYS,
+    MIN_HORIZON_DAYS,
+    refresh_projections,
+)
+
+
+class Command(BaseCommand):
+    help = "Refresh the daily biomass projection table (run once a day)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=DEFAULT_HORIZON_DAYS,
+            help=f"Days to project ahead ({MIN_HORIZON_DAYS}-{MAX_HORIZON_DAYS})",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute every stock instead of only stale ones",
+        )
+
+    def handle(self, *args, **options):
+        written = refresh_projections(horizon=options["days"], full=options["full"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} projection rows"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from sampling.archive import restore_stocks
+
+
+class Command(BaseCommand):
+    help = "Move archived stocks back into the hot tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument("stock_ids", nargs="+", type=int)
+
+    def handle(self, *args, **options):
+        count = restore_stocks(options["stock_ids"])
+        self.stdout.write(self.style.SUCCESS(f"Restored {count} stocks"))
@@ -0,0 +1,63 @@
+# Generated by Django 6.0.1 on 2026-10-19 09:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_fishspecies_user_alter_fishspecies_name_and_more'),
+        ('sampling', '0002_pondfishstock_quantity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockGrowthStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('mean', models.FloatField(default=0.0)),
+                ('m2', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('fish_stock', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='growth_stats', to='sampling.pondfishstock')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='GrowthAnomaly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('daily_growth_rate', models.FloatField(help_text='Growth in % per day')),
+                ('stock_zscore', models.FloatField(blank=True, null=True)),
+                ('species_zscore', models.FloatField(blank=True, null=True)),
+                ('detected_at', models.DateTimeField(auto_now_add=True)),
+                ('fish_stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='growth_anomalies', to='sampling.pondfishstock')),
+                ('sampling', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='growth_anomaly', to='sampling.fishsampling')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='growth_anomalies', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-detected_at'],
+                'indexes': [models.Index(fields=['user', '-detected_at'], name='anomaly_user_detected_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SpeciesGrowthStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('mean', models.FloatField(default=0.0)),
+                ('m2', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('species', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.fishspecies')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'species'), name='unique_species_growth_stats_per_user')],
+            },
+        ),
+    ]
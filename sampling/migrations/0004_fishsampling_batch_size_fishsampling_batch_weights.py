@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sampling', '0003_growth_anomalies'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fishsampling',
+            name='batch_size',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='fishsampling',
+            name='batch_weights',
+            field=models.BinaryField(blank=True, help_text='Packed little-endian float32 batch weights (grams)', null=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sampling', '0004_fishsampling_batch_size_fishsampling_batch_weights'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fishsampling',
+            index=models.Index(fields=['user', '-sampled_on', '-id'], name='sampling_user_seek_idx'),
+        ),
+    ]
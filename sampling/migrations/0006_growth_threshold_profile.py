@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-19 13:55
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_search_term'),
+        ('sampling', '0005_sampling_seek_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GrowthThresholdProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sampling_good', models.DecimalField(decimal_places=2, default=Decimal('8'), max_digits=6)),
+                ('sampling_average', models.DecimalField(decimal_places=2, default=Decimal('4'), max_digits=6)),
+                ('overall_excellent', models.DecimalField(decimal_places=2, default=Decimal('25'), max_digits=6)),
+                ('overall_good', models.DecimalField(decimal_places=2, default=Decimal('15'), max_digits=6)),
+                ('overall_average', models.DecimalField(decimal_places=2, default=Decimal('8'), max_digits=6)),
+                ('species', models.OneToOneField(blank=True, help_text='Leave empty for the default profile', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='growth_profile', to='core.fishspecies')),
+            ],
+        ),
+    ]
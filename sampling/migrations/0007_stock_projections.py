@@ -0,0 +1,39 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sampling', '0006_growth_threshold_profile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectionState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stale', models.BooleanField(default=True)),
+                ('projected_through', models.DateField(blank=True, null=True)),
+                ('sgr', models.FloatField(blank=True, help_text='Growth rate used (% per day)', null=True)),
+                ('computed_at', models.DateTimeField(blank=True, null=True)),
+                ('fish_stock', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='projection_state', to='sampling.pondfishstock')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StockProjection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('average_weight', models.FloatField(help_text='Projected average weight (grams)')),
+                ('biomass_kg', models.FloatField()),
+                ('fish_stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='projections', to='sampling.pondfishstock')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='projection_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('fish_stock', 'day'), name='unique_projection_per_stock_day')],
+            },
+        ),
+    ]
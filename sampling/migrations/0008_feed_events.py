@@ -0,0 +1,43 @@
+# Generated by Django 6.0.1 on 2026-10-19 17:05
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sampling', '0007_stock_projections'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockFeedSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feed_events', models.PositiveIntegerField(default=0)),
+                ('total_feed_kg', models.DecimalField(decimal_places=3, default=Decimal('0'), max_digits=14)),
+                ('biomass_gain_kg', models.DecimalField(blank=True, decimal_places=3, help_text='(latest avg weight - initial avg weight) × quantity stocked', max_digits=14, null=True)),
+                ('fcr', models.DecimalField(blank=True, decimal_places=3, help_text='Feed conversion ratio: feed kg per kg of biomass gained', max_digits=8, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('fish_stock', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='feed_summary', to='sampling.pondfishstock')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='FeedEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fed_on', models.DateField()),
+                ('quantity_kg', models.DecimalField(decimal_places=3, max_digits=10)),
+                ('notes', models.CharField(blank=True, max_length=200)),
+                ('fish_stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_events', to='sampling.pondfishstock')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['fish_stock', '-fed_on'], name='feed_stock_date_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 6.0.1 on 2026-10-19 18:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_search_term'),
+        ('sampling', '0008_feed_events'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPondFishStock',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('quantity', models.PositiveIntegerField()),
+                ('initial_avg_weight', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('stocked_on', models.DateField()),
+                ('status', models.CharField(choices=[('ACTIVE', 'Active'), ('CLOSED', 'Closed')], max_length=10)),
+                ('closed_on', models.DateField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('pond', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.pond')),
+                ('species', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.fishspecies')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedFishSampling',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('sampled_on', models.DateField()),
+                ('sample_fish_count', models.PositiveIntegerField()),
+                ('sample_total_weight', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('batch_size', models.PositiveIntegerField(blank=True, null=True)),
+                ('batch_weights', models.BinaryField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('fish_stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='samplings', to='sampling.archivedpondfishstock')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedFeedEvent',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('fed_on', models.DateField()),
+                ('quantity_kg', models.DecimalField(decimal_places=3, max_digits=10)),
+                ('notes', models.CharField(blank=True, max_length=200)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('fish_stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_events', to='sampling.archivedpondfishstock')),
+            ],
+        ),
+    ]
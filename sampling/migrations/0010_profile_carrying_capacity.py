@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-19 18:45
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sampling', '0009_archive_tables'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='growththresholdprofile',
+            name='carrying_capacity_kg_per_acre',
+            field=models.DecimalField(decimal_places=2, default=Decimal('2000'), max_digits=8),
+        ),
+    ]
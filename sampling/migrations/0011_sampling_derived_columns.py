@@ -0,0 +1,85 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:30
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+import django.db.models.functions.math
+from django.conf import settings
+from decimal import Decimal
+from django.db import migrations, models
+
+
+def backfill_growth_columns(apps, schema_editor):
+    # Same rules as FishSampling.rebuild_derived, on the historical model
+    FishSampling = apps.get_model("sampling", "FishSampling")
+    rows = (
+        FishSampling.objects
+        .select_related("fish_stock")
+        .order_by("fish_stock_id", "sampled_on", "pk")
+    )
+
+    updated = []
+    stock_id = current_date = previous = last = None
+    for row in rows.iterator(chunk_size=2000):
+        if row.fish_stock_id != stock_id:
+            stock_id, current_date, last = row.fish_stock_id, None, None
+        if row.sampled_on != current_date:
+            current_date, previous = row.sampled_on, last
+
+        average = round(Decimal(row.sample_total_weight) / row.sample_fish_count, 2)
+        if previous:
+            base = round(Decimal(previous.sample_total_weight) / previous.sample_fish_count, 2)
+            row.days_since_previous = (row.sampled_on - previous.sampled_on).days
+        else:
+            base = row.fish_stock.initial_avg_weight
+            row.days_since_previous = None
+        row.growth_from_previous = round(average - base, 2)
+        row.growth_percentage = round((average - base) / base * 100, 2) if base else None
+
+        last = row
+        updated.append(row)
+
+    FishSampling.objects.bulk_update(
+        updated,
+        ["growth_from_previous", "growth_percentage", "days_since_previous"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sampling', '0010_profile_carrying_capacity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fishsampling',
+            name='average_weight',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.math.Round(django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast('sample_total_weight', models.FloatField()), '/', django.db.models.functions.comparison.NullIf('sample_fish_count', 0)), 2), output_field=models.DecimalField(decimal_places=2, max_digits=10)),
+        ),
+        migrations.AddField(
+            model_name='fishsampling',
+            name='days_since_previous',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='fishsampling',
+            name='growth_from_previous',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='fishsampling',
+            name='growth_percentage',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='fishsampling',
+            index=models.Index(fields=['fish_stock', 'sampled_on'], name='sampling_stock_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fishsampling',
+            index=models.Index(fields=['user', 'growth_percentage'], name='sampling_user_growth_idx'),
+        ),
+        migrations.RunPython(backfill_growth_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.1 on 2026-10-19 21:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_search_term'),
+        ('sampling', '0011_sampling_derived_columns'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CycleGrowthCurve',
+            fields=[
+                ('stock_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('days', models.PositiveIntegerField(help_text='Days covered, from the stocking day')),
+                ('weights', models.BinaryField(help_text='Packed little-endian float32 grams per day')),
+                ('built_at', models.DateTimeField(auto_now=True)),
+                ('pond', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.pond')),
+                ('species', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.fishspecies')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'species'], name='cycle_curve_user_species_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReferenceGrowthCurve',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cycles', models.PositiveIntegerField()),
+                ('days', models.PositiveIntegerField(help_text='Days covered, from the stocking day')),
+                ('bands', models.BinaryField(help_text='Packed little-endian float32, percentiles × days')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('pond', models.ForeignKey(blank=True, help_text='Empty for the species-wide curve', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.pond')),
+                ('species', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.fishspecies')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reference_curves', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'species', 'pond'), name='unique_reference_curve_per_pond'), models.UniqueConstraint(condition=models.Q(('pond__isnull', True)), fields=('user', 'species'), name='unique_reference_curve_per_species')],
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 6.0.1 on 2026-10-19 21:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_default_rules(apps, schema_editor):
+    AlertRule = apps.get_model("sampling", "AlertRule")
+    AlertRule.objects.bulk_create([
+        AlertRule(name="Three POOR samplings in a row", kind="POOR_STATUS", consecutive=3),
+        AlertRule(name="Weight loss between samplings", kind="WEIGHT_LOSS", consecutive=1),
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_search_term'),
+        ('sampling', '0012_reference_growth_curves'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('kind', models.CharField(choices=[('POOR_STATUS', 'Sampling graded POOR'), ('GROWTH_BELOW', 'Growth % since previous sampling below threshold'), ('WEIGHT_LOSS', 'Average weight lost since previous sampling'), ('BEHIND_COHORT', 'Below p25 of past cycles at the same day')], max_length=20)),
+                ('threshold', models.DecimalField(blank=True, decimal_places=2, help_text='Growth % for GROWTH_BELOW; grams of loss tolerated for WEIGHT_LOSS', max_digits=8, null=True)),
+                ('consecutive', models.PositiveIntegerField(default=1, help_text='Matching samplings in a row before the alert fires')),
+                ('active', models.BooleanField(default=True)),
+                ('species', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.fishspecies')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='alert_rules', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StockAlertState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('streaks', models.JSONField(default=dict)),
+                ('last_sampled_on', models.DateField(blank=True, null=True)),
+                ('last_average_weight', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('fish_stock', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='alert_state', to='sampling.pondfishstock')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GrowthAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('message', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('fish_stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='growth_alerts', to='sampling.pondfishstock')),
+                ('rule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='sampling.alertrule')),
+                ('sampling', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='growth_alerts', to='sampling.fishsampling')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='growth_alerts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at', '-pk'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='alert_user_created_idx')],
+                'constraints': [models.UniqueConstraint(fields=('rule', 'sampling'), name='unique_alert_per_rule_sampling')],
+            },
+        ),
+        migrations.RunPython(create_default_rules, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 6.0.1 on 2026-10-19 22:10
+
+from django.conf import settings
+from datetime import timedelta
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def backfill_due_dates(apps, schema_editor):
+    # Same rule as sampling.schedule.next_due_date, with the model defaults
+    # for species without a profile
+    GrowthThresholdProfile = apps.get_model("sampling", "GrowthThresholdProfile")
+    PondFishStock = apps.get_model("sampling", "PondFishStock")
+
+    cadence = {
+        profile.species_id: (
+            profile.early_phase_days,
+            profile.early_sampling_interval_days,
+            profile.sampling_interval_days,
+        )
+        for profile in GrowthThresholdProfile.objects.all()
+    }
+    default = cadence.get(None, (60, 7, 14))
+
+    stocks = list(
+        PondFishStock.objects
+        .filter(status="ACTIVE")
+        .annotate(last_sampled_on=Max("samplings__sampled_on"))
+    )
+    for stock in stocks:
+        early_phase, early_interval, interval = cadence.get(stock.species_id, default)
+        base = stock.last_sampled_on or stock.stocked_on
+        days = early_interval if (base - stock.stocked_on).days < early_phase else interval
+        stock.next_sampling_due = base + timedelta(days=days)
+    PondFishStock.objects.bulk_update(stocks, ["next_sampling_due"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_search_term'),
+        ('sampling', '0013_growth_alerts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='growththresholdprofile',
+            name='early_phase_days',
+            field=models.PositiveIntegerField(default=60, help_text='Days since stocking that use the early interval'),
+        ),
+        migrations.AddField(
+            model_name='growththresholdprofile',
+            name='early_sampling_interval_days',
+            field=models.PositiveIntegerField(default=7),
+        ),
+        migrations.AddField(
+            model_name='growththresholdprofile',
+            name='sampling_interval_days',
+            field=models.PositiveIntegerField(default=14),
+        ),
+        migrations.AddField(
+            model_name='pondfishstock',
+            name='next_sampling_due',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='pondfishstock',
+            index=models.Index(fields=['user', 'next_sampling_due'], name='stock_user_due_idx'),
+        ),
+        migrations.RunPython(backfill_due_dates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:10
+
+from decimal import Decimal
+from itertools import groupby
+from django.db import migrations, models
+
+
+def backfill_growth(apps, schema_editor):
+    # Same rules as FishSampling.compute_derived: the previous sampling is
+    # the latest one of the stock on an earlier day
+    ArchivedFishSampling = apps.get_model("sampling", "ArchivedFishSampling")
+    rows = (
+        ArchivedFishSampling.objects
+        .select_related("fish_stock")
+        .order_by("fish_stock_id", "sampled_on", "pk")
+    )
+    updated = []
+    for _, samplings in groupby(rows.iterator(), key=lambda row: row.fish_stock_id):
+        day_last = None  # last sampling of the latest earlier day
+        current_day, current_last = None, None
+        for sampling in samplings:
+            if sampling.sampled_on != current_day:
+                day_last, current_day = current_last, sampling.sampled_on
+            previous = day_last
+            current_last = sampling
+
+            average = round(Decimal(sampling.sample_total_weight) / sampling.sample_fish_count, 2)
+            base = previous.average_weight if previous else sampling.fish_stock.initial_avg_weight
+            sampling.average_weight = average
+            sampling.days_since_previous = (sampling.sampled_on - previous.sampled_on).days if previous else None
+            sampling.growth_from_previous = round(average - base, 2)
+            sampling.growth_percentage = round((average - base) / base * Decimal("100"), 2) if base else None
+            updated.append(sampling)
+
+    ArchivedFishSampling.objects.bulk_update(
+        updated,
+        ["average_weight", "growth_from_previous", "growth_percentage", "days_since_previous"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sampling', '0014_sampling_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedfishsampling',
+            name='average_weight',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedfishsampling',
+            name='days_since_previous',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedfishsampling',
+            name='growth_from_previous',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedfishsampling',
+            name='growth_percentage',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.RunPython(backfill_growth, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 6.0.1 on 2026-10-19 23:40
+
+import re
+from django.db import migrations
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+MAX_TERM_LENGTH = 200
+
+
+def _terms(texts):
+    # Same rule as core.search: the whole normalized phrase plus each word
+    terms = set()
+    for text in texts:
+        words = TOKEN_RE.findall((text or "").lower())
+        if words:
+            terms.add(" ".join(words)[:MAX_TERM_LENGTH])
+            terms.update(word[:MAX_TERM_LENGTH] for word in words)
+    return terms
+
+
+def backfill_search_terms(apps, schema_editor):
+    # Rows saved before the index existed; anything already indexed by the
+    # signals is left alone
+    SearchTerm = apps.get_model("core", "SearchTerm")
+    Pond = apps.get_model("core", "Pond")
+    FishSpecies = apps.get_model("core", "FishSpecies")
+    PondFishStock = apps.get_model("sampling", "PondFishStock")
+
+    indexed = set(SearchTerm.objects.values_list("kind", "object_id").distinct())
+
+    def entries():
+        for pond in Pond.objects.iterator():
+            yield "pond", pond.pk, pond.name, [pond.name], pond.user_id, None
+        for species in FishSpecies.objects.iterator():
+            yield "species", species.pk, species.name, [species.name], species.user_id, None
+        stocks = PondFishStock.objects.filter(status="ACTIVE").select_related("pond", "species")
+        for stock in stocks.iterator():
+            texts = [stock.species.name, stock.pond.name]
+            label = f"{stock.species.name} in {stock.pond.name} ({stock.status})"
+            yield "stock", stock.pk, label, texts, stock.user_id, stock.pond_id
+
+    SearchTerm.objects.bulk_create(
+        (
+            SearchTerm(
+                user_id=user_id,
+                kind=kind,
+                object_id=object_id,
+                parent_id=parent_id,
+                label=label[:200],
+                term=term,
+            )
+            for kind, object_id, label, texts, user_id, parent_id in entries()
+            if (kind, object_id) not in indexed
+            for term in _terms(texts)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_search_term'),
+        ('sampling', '0015_archived_sampling_growth'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_terms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-19 23:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sampling', '0016_backfill_search_terms'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fishsampling',
+            index=models.Index(fields=['-sampled_on', '-id'], name='sampling_date_idx'),
+        ),
+    ]
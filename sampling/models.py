@@ -1,8 +1,144 @@
-from decimal import Decimal
+import time
+from decimal import ROUND_HALF_UP, Decimal
 from django.db import models
+from django.db.models.functions import Cast, NullIf, Round
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import User
 from core.models import Pond, FishSpecies
+from calculator.utils import unpack_batch_weights
+
+# Growth status labels
+NO_DATA = "NO DATA"
+EXCELLENT = "EXCELLENT"
+GOOD = "GOOD"
+AVERAGE = "AVERAGE"
+POOR = "POOR"
+
+SAMPLING_STATUSES = [GOOD, AVERAGE, POOR, NO_DATA]
+OVERALL_STATUSES = [EXCELLENT, GOOD, AVERAGE, POOR, NO_DATA]
+
+
+class GrowthThresholdProfile(models.Model):
+    """
+    Growth % thresholds used to grade samplings and stocks, and the
+    carrying capacity used to flag overstocked ponds.
+    A profile without species is the farm-wide default.
+    """
+    species = models.OneToOneField(
+        FishSpecies,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="growth_profile",
+        help_text="Leave empty for the default profile"
+    )
+
+    # Growth % since previous sampling
+    sampling_good = models.DecimalField(max_digits=6, decimal_places=2, default=Decimal("8"))
+    sampling_average = models.DecimalField(max_digits=6, decimal_places=2, default=Decimal("4"))
+
+    # Growth % since stocking
+    overall_excellent = models.DecimalField(max_digits=6, decimal_places=2, default=Decimal("25"))
+    overall_good = models.DecimalField(max_digits=6, decimal_places=2, default=Decimal("15"))
+    overall_average = models.DecimalField(max_digits=6, decimal_places=2, default=Decimal("8"))
+
+    # Standing biomass a pond can hold for this species
+    carrying_capacity_kg_per_acre = models.DecimalField(
+        max_digits=8,
+        decimal_places=2,
+        default=Decimal("2000"),
+    )
+
+    # Sampling cadence (see sampling.schedule): young stocks more often
+    sampling_interval_days = models.PositiveIntegerField(default=14)
+    early_sampling_interval_days = models.PositiveIntegerField(default=7)
+    early_phase_days = models.PositiveIntegerField(
+        default=60,
+        help_text="Days since stocking that use the early interval"
+    )
+
+    # In-memory cache shared by the process, refreshed on change
+    # (see sampling.signals) and at most CACHE_SECONDS old otherwise
+    CACHE_SECONDS = 60
+    _cache = None
+    _cached_at = 0.0
+
+    def clean(self):
+        if not (self.sampling_good >= self.sampling_average):
+            raise ValidationError("GOOD threshold must be >= AVERAGE threshold.")
+
+        if not (self.overall_excellent >= self.overall_good >= self.overall_average):
+            raise ValidationError(
+                "Overall thresholds must be EXCELLENT >= GOOD >= AVERAGE."
+            )
+
+        if self.carrying_capacity_kg_per_acre <= 0:
+            raise ValidationError("Carrying capacity must be greater than zero.")
+
+        if not self.sampling_interval_days or not self.early_sampling_interval_days:
+            raise ValidationError("Sampling intervals must be at least one day.")
+
+        if self.species_id is None:
+            qs = GrowthThresholdProfile.objects.filter(species__isnull=True)
+            if self.pk:
+                qs = qs.exclude(pk=self.pk)
+            if qs.exists():
+                raise ValidationError("A default profile already exists.")
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        super().save(*args, **kwargs)
+
+    # --------------------
+    # Cached lookup
+    # --------------------
+    @classmethod
+    def cached_profiles(cls):
+        """{species_id or None: profile}"""
+        if cls._cache is None or time.monotonic() - cls._cached_at > cls.CACHE_SECONDS:
+            cls._cache = {profile.species_id: profile for profile in cls.objects.all()}
+            cls._cached_at = time.monotonic()
+        return cls._cache
+
+    @classmethod
+    def clear_cache(cls):
+        cls._cache = None
+
+    @classmethod
+    def default(cls):
+        return cls.cached_profiles().get(None) or cls()
+
+    @classmethod
+    def for_species(cls, species_id):
+        return cls.cached_profiles().get(species_id) or cls.default()
+
+    # --------------------
+    # Grading
+    # --------------------
+    def sampling_levels(self):
+        return ((GOOD, self.sampling_good), (AVERAGE, self.sampling_average))
+
+    def overall_levels(self):
+        return (
+            (EXCELLENT, self.overall_excellent),
+            (GOOD, self.overall_good),
+            (AVERAGE, self.overall_average),
+        )
+
+    @staticmethod
+    def grade(percentage, levels):
+        if percentage is None:
+            return NO_DATA
+        for label, threshold in levels:
+            if percentage >= threshold:
+                return label
+        return POOR
+
+    def __str__(self):
+        if self.species_id:
+            return f"Growth profile for {self.species.name}"
+        return "Default growth profile"
+
 
 class PondFishStock(models.Model):
     ACTIVE = "ACTIVE"
@@ -27,6 +163,18 @@ class PondFishStock(models.Model):
     )
     closed_on = models.DateField(null=True, blank=True)
 
+    # Maintained by sampling.schedule; NULL once closed
+    next_sampling_due = models.DateField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Sampling calendar / route lists
+            models.Index(
+                fields=["user", "next_sampling_due"],
+                name="stock_user_due_idx"
+            ),
+        ]
+
     # --------------------
     # Lifecycle enforcement
     # --------------------
@@ -106,18 +254,12 @@ class PondFishStock(models.Model):
 
     @property
     def overall_growth_status(self):
-        percentage = self.total_growth_percentage
+        # Already computed in SQL (sampling.growth.with_overall_status)
+        if "db_overall_status" in self.__dict__:
+            return self.db_overall_status
 
-        if percentage is None:
-            return "NO DATA"
-        if percentage >= 25:
-            return "EXCELLENT"
-        elif percentage >= 15:
-            return "GOOD"
-        elif percentage >= 8:
-            return "AVERAGE"
-        else:
-            return "POOR"
+        profile = GrowthThresholdProfile.for_species(self.species_id)
+        return profile.grade(self.total_growth_percentage, profile.overall_levels())
 
     def __str__(self):
         return f"{self.species.name} in {self.pond.name} ({self.status})"
@@ -145,6 +287,71 @@ class FishSampling(models.Model):
         help_text="Total weight of sampled fish (grams)"
     )
 
+    # Raw batch input, kept for distribution analysis
+    batch_size = models.PositiveIntegerField(null=True, blank=True)
+    batch_weights = models.BinaryField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Packed little-endian float32 batch weights (grams)"
+    )
+
+    # --------------------
+    # Derived columns
+    # --------------------
+    # Stored so they can be filtered, sorted and indexed. Growth columns
+    # depend on the previous sampling of the stock and are recomputed for
+    # this row on save and for its successor by sampling.signals.
+    average_weight = models.GeneratedField(
+        expression=Round(
+            Cast("sample_total_weight", models.FloatField())
+            / NullIf("sample_fish_count", 0),
+            2,
+        ),
+        output_field=models.DecimalField(max_digits=10, decimal_places=2),
+        db_persist=True,
+    )
+    growth_from_previous = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    growth_percentage = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    days_since_previous = models.PositiveIntegerField(null=True, blank=True, editable=False)
+
+    DERIVED_FIELDS = ["growth_from_previous", "growth_percentage", "days_since_previous"]
+
+    class Meta:
+        indexes = [
+            # Dashboard seek pagination
+            models.Index(
+                fields=["user", "-sampled_on", "-id"],
+                name="sampling_user_seek_idx"
+            ),
+            # Previous / successor lookups
+            models.Index(
+                fields=["fish_stock", "sampled_on"],
+                name="sampling_stock_date_idx"
+            ),
+            models.Index(
+                fields=["user", "growth_percentage"],
+                name="sampling_user_growth_idx"
+            ),
+            # Admin changelist: date hierarchy and default ordering
+            models.Index(
+                fields=["-sampled_on", "-id"],
+                name="sampling_date_idx"
+            ),
+        ]
+
     # --------------------
     # Validation
     # --------------------
@@ -171,19 +378,87 @@ class FishSampling(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()
+        self.compute_derived(self.previous_sampling)
         super().save(*args, **kwargs)
 
     # --------------------
-    # Derived properties
+    # Derived values
     # --------------------
+    def compute_derived(self, previous):
+        """Fill the growth columns against `previous` (None = stocking)."""
+        # Half away from zero, as SQL ROUND fills the generated average_weight
+        average = (Decimal(self.sample_total_weight) / self.sample_fish_count).quantize(
+            Decimal("0.01"), ROUND_HALF_UP
+        )
+        if previous:
+            base = previous.average_weight
+            self.days_since_previous = (self.sampled_on - previous.sampled_on).days
+        else:
+            base = self.fish_stock.initial_avg_weight
+            self.days_since_previous = None
+
+        self.growth_from_previous = round(average - base, 2)
+        self.growth_percentage = (
+            round((average - base) / base * Decimal("100"), 2) if base else None
+        )
+
+    @classmethod
+    def refresh_derived_after(cls, stock_id, sampled_on=None):
+        """
+        Recompute the samplings whose previous sampling may have changed:
+        those on the first date after `sampled_on` (the first date if None).
+        """
+        successors = cls.objects.filter(fish_stock_id=stock_id)
+        if sampled_on is not None:
+            successors = successors.filter(sampled_on__gt=sampled_on)
+
+        first_date = successors.order_by("sampled_on").values_list("sampled_on", flat=True).first()
+        if first_date is None:
+            return 0
+
+        rows = list(successors.filter(sampled_on=first_date).select_related("fish_stock"))
+        for row in rows:
+            row.compute_derived(row.previous_sampling)
+        # Plain UPDATE: no validation (the stock may be closed) and no signals
+        cls.objects.bulk_update(rows, cls.DERIVED_FIELDS)
+        return len(rows)
+
+    @classmethod
+    def rebuild_derived(cls, stock_ids):
+        """Recompute the growth columns of every sampling of the given stocks."""
+        rows = (
+            cls.objects
+            .filter(fish_stock_id__in=stock_ids)
+            .select_related("fish_stock")
+            .order_by("fish_stock_id", "sampled_on", "pk")
+        )
+
+        updated = []
+        stock_id = current_date = previous = last = None
+        for row in rows:
+            if row.fish_stock_id != stock_id:
+                stock_id, current_date, last = row.fish_stock_id, None, None
+            if row.sampled_on != current_date:
+                # Rows sharing a date all compare with the latest earlier row
+                current_date, previous = row.sampled_on, last
+            row.compute_derived(previous)
+            last = row
+            updated.append(row)
+
+        cls.objects.bulk_update(updated, cls.DERIVED_FIELDS, batch_size=1000)
+        return len(updated)
+
     @property
-    def average_weight(self):
-        if not self.sample_total_weight or not self.sample_fish_count:
+    def batch_weight_list(self):
+        if not self.batch_weights:
+            return []
+        return unpack_batch_weights(self.batch_weights)
+
+    def batch_stats(self, bins=10):
+        if not self.batch_weights:
             return None
-        return round(
-            self.sample_total_weight / self.sample_fish_count,
-            2
-        )
+        from calculator.distribution import batch_weight_stats
+        return batch_weight_stats(self.batch_weights, self.batch_size, bins=bins)
 
     @property
     def previous_sampling(self):
@@ -193,69 +468,536 @@ class FishSampling(models.Model):
                 fish_stock=self.fish_stock,
                 sampled_on__lt=self.sampled_on,
             )
-            .order_by("-sampled_on")
+            .order_by("-sampled_on", "-pk")
             .first()
         )
 
     @property
-    def growth_from_previous(self):
-        previous = self.previous_sampling
-        initial_avg = self.fish_stock.initial_avg_weight
-        if previous and previous.average_weight is not None:
-            return round(
-            self.average_weight - previous.average_weight,
-            2
-        )
-        # initial_avg = self.fish_stock.initial_avg_weight
-        elif  initial_avg is not None:
-            return round(
-                    self.average_weight - initial_avg,
-                    2
-                )
-        return None
+    def growth_status(self):
+        # Already computed in SQL (sampling.growth.with_growth_status)
+        if "db_growth_status" in self.__dict__:
+            return self.db_growth_status
+
+        profile = GrowthThresholdProfile.for_species(self.fish_stock.species_id)
+        return profile.grade(self.growth_percentage, profile.sampling_levels())
+
+    def __str__(self):
+        return f"Sampling on {self.sampled_on}"
+
+
+# --------------------
+# Growth anomaly detection
+# --------------------
+class RunningGrowthStats(models.Model):
+    """
+    Running mean / variance of daily growth rate (% per day),
+    maintained with Welford's online algorithm.
+    """
+    count = models.PositiveIntegerField(default=0)
+    mean = models.FloatField(default=0.0)
+    m2 = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+    def push(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def discard(self, other):
+        """Take out the observations summarised by `other`, a subset of these."""
+        remaining = self.count - other.count
+        if remaining <= 0:
+            self.reset()
+            return
+        mean = (self.count * self.mean - other.count * other.mean) / remaining
+        delta = other.mean - mean
+        m2 = self.m2 - other.m2 - delta * delta * remaining * other.count / self.count
+        # Float error must not leave a negative variance
+        self.count, self.mean, self.m2 = remaining, mean, max(m2, 0.0)
+
+    def reset(self):
+        self.count, self.mean, self.m2 = 0, 0.0, 0.0
 
     @property
-    def days_since_previous(self):
-        previous = self.previous_sampling
-        if not previous:
+    def variance(self):
+        if self.count < 2:
             return None
-        return (self.sampled_on - previous.sampled_on).days
+        return self.m2 / (self.count - 1)
 
     @property
-    def growth_percentage(self):
-        previous = self.previous_sampling
+    def std_dev(self):
+        variance = self.variance
+        if variance is None:
+            return None
+        return variance ** 0.5
 
-        # Case 1: Compare with previous sampling
-        if previous and previous.average_weight is not None:
-            base = previous.average_weight
+    def zscore(self, value):
+        std_dev = self.std_dev
+        if not std_dev:
+            return None
+        return (value - self.mean) / std_dev
 
-        # Case 2: First sampling → compare with initial stock
-        elif self.fish_stock.initial_avg_weight is not None:
-            base = self.fish_stock.initial_avg_weight
 
-        # Case 3: No baseline
-        else:
+class StockGrowthStats(RunningGrowthStats):
+    fish_stock = models.OneToOneField(
+        PondFishStock,
+        on_delete=models.CASCADE,
+        related_name="growth_stats"
+    )
+
+    def __str__(self):
+        return f"Growth stats for {self.fish_stock_id} (n={self.count})"
+
+
+class SpeciesGrowthStats(RunningGrowthStats):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    species = models.ForeignKey(FishSpecies, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "species"],
+                name="unique_species_growth_stats_per_user"
+            )
+        ]
+
+    def __str__(self):
+        return f"Growth stats for {self.species.name} (n={self.count})"
+
+
+class GrowthAnomaly(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="growth_anomalies"
+    )
+    fish_stock = models.ForeignKey(
+        PondFishStock,
+        on_delete=models.CASCADE,
+        related_name="growth_anomalies"
+    )
+    sampling = models.OneToOneField(
+        FishSampling,
+        on_delete=models.CASCADE,
+        related_name="growth_anomaly"
+    )
+    daily_growth_rate = models.FloatField(help_text="Growth in % per day")
+    stock_zscore = models.FloatField(null=True, blank=True)
+    species_zscore = models.FloatField(null=True, blank=True)
+    detected_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-detected_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "-detected_at"],
+                name="anomaly_user_detected_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Anomaly on {self.sampling.sampled_on} ({self.daily_growth_rate:.2f}%/day)"
+
+
+# --------------------
+# Growth alerts (rules evaluated per sampling, see sampling.alerts)
+# --------------------
+class AlertRule(models.Model):
+    POOR_STATUS = "POOR_STATUS"
+    GROWTH_BELOW = "GROWTH_BELOW"
+    WEIGHT_LOSS = "WEIGHT_LOSS"
+    BEHIND_COHORT = "BEHIND_COHORT"
+
+    KIND_CHOICES = [
+        (POOR_STATUS, "Sampling graded POOR"),
+        (GROWTH_BELOW, "Growth % since previous sampling below threshold"),
+        (WEIGHT_LOSS, "Average weight lost since previous sampling"),
+        (BEHIND_COHORT, "Below p25 of past cycles at the same day"),
+    ]
+
+    # NULL = applies to every user / species
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="alert_rules"
+    )
+    species = models.ForeignKey(
+        FishSpecies,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+"
+    )
+    name = models.CharField(max_length=100)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    threshold = models.DecimalField(
+        max_digits=8,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Growth % for GROWTH_BELOW; grams of loss tolerated for WEIGHT_LOSS"
+    )
+    consecutive = models.PositiveIntegerField(
+        default=1,
+        help_text="Matching samplings in a row before the alert fires"
+    )
+    active = models.BooleanField(default=True)
+
+    # In-memory cache shared by the process, as GrowthThresholdProfile
+    CACHE_SECONDS = 60
+    _cache = None
+    _cached_at = 0.0
+
+    def clean(self):
+        if self.consecutive < 1:
+            raise ValidationError("consecutive must be at least 1.")
+
+        if self.kind == self.GROWTH_BELOW and self.threshold is None:
+            raise ValidationError("A growth threshold is required for this rule.")
+
+        if self.kind == self.WEIGHT_LOSS and self.threshold is not None and self.threshold < 0:
+            raise ValidationError("Weight loss tolerance cannot be negative.")
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def cached_rules(cls):
+        """Active rules, farm-wide ones included."""
+        if cls._cache is None or time.monotonic() - cls._cached_at > cls.CACHE_SECONDS:
+            cls._cache = list(cls.objects.filter(active=True).order_by("pk"))
+            cls._cached_at = time.monotonic()
+        return cls._cache
+
+    @classmethod
+    def clear_cache(cls):
+        cls._cache = None
+
+    @classmethod
+    def for_stock(cls, user_id, species_id):
+        return [
+            rule for rule in cls.cached_rules()
+            if rule.user_id in (None, user_id) and rule.species_id in (None, species_id)
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class StockAlertState(models.Model):
+    """Streak counters and last values per stock, so rules never re-read history."""
+    fish_stock = models.OneToOneField(
+        PondFishStock,
+        on_delete=models.CASCADE,
+        related_name="alert_state"
+    )
+    # {rule id: matching samplings in a row}
+    streaks = models.JSONField(default=dict)
+    last_sampled_on = models.DateField(null=True, blank=True)
+    last_average_weight = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Alert state for {self.fish_stock_id}"
+
+
+class GrowthAlert(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="growth_alerts"
+    )
+    fish_stock = models.ForeignKey(
+        PondFishStock,
+        on_delete=models.CASCADE,
+        related_name="growth_alerts"
+    )
+    sampling = models.ForeignKey(
+        FishSampling,
+        on_delete=models.CASCADE,
+        related_name="growth_alerts"
+    )
+    rule = models.ForeignKey(AlertRule, on_delete=models.CASCADE, related_name="alerts")
+    message = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at", "-pk"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["rule", "sampling"],
+                name="unique_alert_per_rule_sampling"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at"],
+                name="alert_user_created_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return self.message
+
+
+# --------------------
+# Biomass projection (materialized, see sampling.projections)
+# --------------------
+class ProjectionState(models.Model):
+    fish_stock = models.OneToOneField(
+        PondFishStock,
+        on_delete=models.CASCADE,
+        related_name="projection_state"
+    )
+    # Set when a sampling is written; cleared on refresh
+    stale = models.BooleanField(default=True)
+    projected_through = models.DateField(null=True, blank=True)
+    sgr = models.FloatField(null=True, blank=True, help_text="Growth rate used (% per day)")
+    computed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Projection state for {self.fish_stock_id}"
+
+
+class StockProjection(models.Model):
+    fish_stock = models.ForeignKey(
+        PondFishStock,
+        on_delete=models.CASCADE,
+        related_name="projections"
+    )
+    day = models.DateField()
+    average_weight = models.FloatField(help_text="Projected average weight (grams)")
+    biomass_kg = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["fish_stock", "day"],
+                name="unique_projection_per_stock_day"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["day"], name="projection_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.fish_stock_id} on {self.day}: {self.average_weight:.2f} g"
+
+
+# --------------------
+# Feeding
+# --------------------
+class FeedEvent(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="feed_events"
+    )
+    fish_stock = models.ForeignKey(
+        PondFishStock,
+        on_delete=models.CASCADE,
+        related_name="feed_events"
+    )
+    fed_on = models.DateField()
+    quantity_kg = models.DecimalField(max_digits=10, decimal_places=3)
+    notes = models.CharField(max_length=200, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["fish_stock", "-fed_on"], name="feed_stock_date_idx"),
+        ]
+
+    def clean(self):
+        if self.fish_stock.status != PondFishStock.ACTIVE:
+            raise ValidationError(
+                "Cannot log feed for a closed stock."
+            )
+
+        if self.fed_on < self.fish_stock.stocked_on:
+            raise ValidationError(
+                "Feed date cannot be before stock date."
+            )
+
+        if self.quantity_kg <= 0:
+            raise ValidationError(
+                "Feed quantity must be greater than zero."
+            )
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.quantity_kg} kg on {self.fed_on}"
+
+
+class StockFeedSummary(models.Model):
+    """
+    Running feed total and FCR per stock, maintained incrementally by
+    signals on FeedEvent and FishSampling (see sampling.feeding).
+    """
+    fish_stock = models.OneToOneField(
+        PondFishStock,
+        on_delete=models.CASCADE,
+        related_name="feed_summary"
+    )
+    feed_events = models.PositiveIntegerField(default=0)
+    total_feed_kg = models.DecimalField(max_digits=14, decimal_places=3, default=Decimal("0"))
+    biomass_gain_kg = models.DecimalField(
+        max_digits=14,
+        decimal_places=3,
+        null=True,
+        blank=True,
+        help_text="(latest avg weight - initial avg weight) × quantity stocked"
+    )
+    fcr = models.DecimalField(
+        max_digits=8,
+        decimal_places=3,
+        null=True,
+        blank=True,
+        help_text="Feed conversion ratio: feed kg per kg of biomass gained"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # A ratio above this comes from a gain too small to measure (and would
+    # not fit the column), so it is left empty like a non-positive gain
+    MAX_FCR = Decimal("1000")
+
+    def compute_fcr(self):
+        if not self.biomass_gain_kg or self.biomass_gain_kg <= 0:
             return None
+        fcr = round(self.total_feed_kg / self.biomass_gain_kg, 3)
+        return fcr if fcr <= self.MAX_FCR else None
 
-        growth = self.average_weight - base
+    def __str__(self):
+        return f"FCR {self.fcr} for {self.fish_stock_id}"
+
+
+# --------------------
+# Reference growth curves (built from closed cycles, see sampling.cohorts)
+# --------------------
+class CycleGrowthCurve(models.Model):
+    """Daily average weight of one closed cycle, from stocking to its last sampling."""
+    # Same id as the stock, and no FK, so the curve outlives archiving
+    stock_id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    species = models.ForeignKey(FishSpecies, on_delete=models.CASCADE, related_name="+")
+    pond = models.ForeignKey(Pond, on_delete=models.CASCADE, related_name="+")
+    days = models.PositiveIntegerField(help_text="Days covered, from the stocking day")
+    weights = models.BinaryField(help_text="Packed little-endian float32 grams per day")
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "species"], name="cycle_curve_user_species_idx"),
+        ]
 
-        return round(
-            (growth / base) * Decimal("100"),
-            2
-        )
+    def __str__(self):
+        return f"Growth curve of cycle {self.stock_id} ({self.days} days)"
+
+
+class ReferenceGrowthCurve(models.Model):
+    """
+    Percentile bands of average weight by day since stocking across the
+    closed cycles of a species, farm-wide (no pond) or in one pond.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="reference_curves")
+    species = models.ForeignKey(FishSpecies, on_delete=models.CASCADE, related_name="+")
+    pond = models.ForeignKey(
+        Pond,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text="Empty for the species-wide curve"
+    )
+    cycles = models.PositiveIntegerField()
+    days = models.PositiveIntegerField(help_text="Days covered, from the stocking day")
+    bands = models.BinaryField(help_text="Packed little-endian float32, percentiles × days")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "species", "pond"],
+                name="unique_reference_curve_per_pond"
+            ),
+            models.UniqueConstraint(
+                fields=["user", "species"],
+                condition=models.Q(pond__isnull=True),
+                name="unique_reference_curve_per_species"
+            ),
+        ]
 
-    @property
-    def growth_status(self):
-        percentage = self.growth_percentage
+    def __str__(self):
+        scope = f" in pond {self.pond_id}" if self.pond_id else ""
+        return f"Reference curve for species {self.species_id}{scope} ({self.cycles} cycles)"
+
+
+# --------------------
+# Archive (closed cycles moved out of the hot tables, see sampling.archive)
+# --------------------
+class ArchivedPondFishStock(models.Model):
+    # Same id as the original row so a restore is lossless
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    pond = models.ForeignKey(Pond, on_delete=models.CASCADE, related_name="+")
+    species = models.ForeignKey(FishSpecies, on_delete=models.CASCADE, related_name="+")
+    quantity = models.PositiveIntegerField()
+    initial_avg_weight = models.DecimalField(max_digits=8, decimal_places=2)
+    stocked_on = models.DateField()
+    status = models.CharField(max_length=10, choices=PondFishStock.STATUS_CHOICES)
+    closed_on = models.DateField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
 
-        if percentage is None:
-            return "NO DATA"
-        if percentage >= 8:
-            return "GOOD"
-        elif percentage >= 4:
-            return "AVERAGE"
-        else:
-            return "POOR"
+    def __str__(self):
+        return f"{self.species.name} in {self.pond.name} (archived)"
+
+
+class ArchivedFishSampling(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    fish_stock = models.ForeignKey(
+        ArchivedPondFishStock,
+        on_delete=models.CASCADE,
+        related_name="samplings"
+    )
+    sampled_on = models.DateField()
+    sample_fish_count = models.PositiveIntegerField()
+    sample_total_weight = models.DecimalField(max_digits=10, decimal_places=2)
+    batch_size = models.PositiveIntegerField(null=True, blank=True)
+    batch_weights = models.BinaryField(null=True, blank=True, editable=False)
+
+    # Derived columns as they were when archived (a closed cycle no longer
+    # changes), so reports read archived rows like hot ones
+    average_weight = models.DecimalField(max_digits=10, decimal_places=2, null=True, editable=False)
+    growth_from_previous = models.DecimalField(max_digits=10, decimal_places=2, null=True, editable=False)
+    growth_percentage = models.DecimalField(max_digits=10, decimal_places=2, null=True, editable=False)
+    days_since_previous = models.PositiveIntegerField(null=True, editable=False)
 
     def __str__(self):
-        return f"Sampling on {self.sampled_on}"
+        return f"Archived sampling on {self.sampled_on}"
+
+
+class ArchivedFeedEvent(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    fish_stock = models.ForeignKey(
+        ArchivedPondFishStock,
+        on_delete=models.CASCADE,
+        related_name="feed_events"
+    )
+    fed_on = models.DateField()
+    quantity_kg = models.DecimalField(max_digits=10, decimal_places=3)
+    notes = models.CharField(max_length=200, blank=True)
+
+    def __str__(self):
+        return f"Archived feed {self.quantity_kg} kg on {self.fed_on}"
@@ -0,0 +1,127 @@
+import uuid
+from statistics import NormalDist
+import numpy as np
+from django.core.cache import cache
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from core.caching import invalidated_timeout
+from calculator.distribution import batch_weight_array, grouped_moments, required_sample_size
+from sampling.models import FishSampling, PondFishStock
+
+# --------------------
+# Sample-size planner
+# --------------------
+# How many batches a crew should weigh so the sampled mean weight lands
+# within ±margin % of the true mean at the given confidence. The spread
+# comes from the batch weights of each stock's most recent samplings,
+# pooled as a coefficient of variation (fish grow between samplings, so raw
+# weights of different samplings are not pooled).
+
+RECENT_SAMPLINGS = 3
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_MARGIN_PCT = 5.0
+MIN_BATCHES = 2
+
+PLAN_VERSION_KEY = "sample-size-version:{}"
+PLAN_KEY = "sample-size:{}:{}:{}:{}"
+PLAN_TIMEOUT = 60 * 60 * 24
+
+
+def _recent_batches(user):
+    return list(
+        FishSampling.objects
+        .filter(
+            user=user,
+            fish_stock__status=PondFishStock.ACTIVE,
+            batch_weights__isnull=False,
+            batch_size__gt=0,
+        )
+        .annotate(recent=Window(
+            expression=RowNumber(),
+            partition_by=[F("fish_stock_id")],
+            order_by=[F("sampled_on").desc(), F("pk").desc()],
+        ))
+        .filter(recent__lte=RECENT_SAMPLINGS)
+        .values_list("fish_stock_id", "recent", "batch_size", "batch_weights")
+    )
+
+
+def build_plan(user, confidence=DEFAULT_CONFIDENCE, margin_pct=DEFAULT_MARGIN_PCT):
+    stocks = list(
+        PondFishStock.objects
+        .filter(user=user, status=PondFishStock.ACTIVE)
+        .select_related("pond", "species")
+        .order_by("pond__name", "species__name")
+    )
+    stock_index = {stock.pk: i for i, stock in enumerate(stocks)}
+    rows = _recent_batches(user)
+
+    # One flat array of per-fish batch weights, tagged with its sampling
+    per_fish = [
+        batch_weight_array(weights).astype(np.float64) / batch_size
+        for _, _, batch_size, weights in rows
+    ]
+    sampling_of_value = np.repeat(np.arange(len(rows)), [len(values) for values in per_fish])
+    values = np.concatenate(per_fish) if per_fish else np.empty(0)
+
+    count, mean, variance = grouped_moments(values, sampling_of_value, len(rows))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cv_squared = variance / (mean * mean)
+
+    # Pool per stock: Σ (n - 1) cv² / Σ (n - 1) over its recent samplings
+    stock_of_sampling = np.array([stock_index[row[0]] for row in rows], dtype=np.int64)
+    dof = np.where(count > 1, count - 1, 0.0)
+    weighted = np.where(dof > 0, dof * np.nan_to_num(cv_squared), 0.0)
+    pooled_dof = np.bincount(stock_of_sampling, weights=dof, minlength=len(stocks))
+    observed = np.bincount(stock_of_sampling, weights=count, minlength=len(stocks))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pooled_cv = np.sqrt(
+            np.bincount(stock_of_sampling, weights=weighted, minlength=len(stocks)) / pooled_dof
+        )
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    recommended = required_sample_size(pooled_cv, margin_pct / 100.0, z, MIN_BATCHES)
+
+    latest = {}
+    for (stock_id, recent, batch_size, _), n in zip(rows, count):
+        if recent == 1:
+            latest[stock_id] = (batch_size, int(n))
+
+    plan = []
+    for i, stock in enumerate(stocks):
+        has_data = pooled_dof[i] > 0
+        batch_size, batches = latest.get(stock.pk, (None, None))
+        plan.append({
+            "stock": stock.pk,
+            "stock_name": str(stock),
+            "batches_observed": int(observed[i]),
+            "cv_pct": round(float(pooled_cv[i]) * 100, 2) if has_data else None,
+            "recommended_batches": int(recommended[i]) if has_data else None,
+            "last_batch_size": batch_size,
+            "last_batches": batches,
+            "recommended_fish": int(recommended[i]) * batch_size if has_data and batch_size else None,
+        })
+    return plan
+
+
+def _plan_version(user_id):
+    key = PLAN_VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(key, version, invalidated_timeout())
+    return version
+
+
+def sample_size_plan(user, confidence=DEFAULT_CONFIDENCE, margin_pct=DEFAULT_MARGIN_PCT):
+    """Cached plan for all active stocks; a new sampling starts a new version."""
+    key = PLAN_KEY.format(user.pk, _plan_version(user.pk), confidence, margin_pct)
+    plan = cache.get(key)
+    if plan is None:
+        plan = build_plan(user, confidence, margin_pct)
+        cache.set(key, plan, invalidated_timeout(PLAN_TIMEOUT))
+    return plan
+
+
+def invalidate_sample_size_plan(user_id):
+    cache.set(PLAN_VERSION_KEY.format(user_id), uuid.uuid4().hex, invalidated_timeout())
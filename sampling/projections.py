@@ -0,0 +1,147 @@
+from datetime import timedelta
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from sampling.growth import SGR_SINCE_PREVIOUS, with_specific_growth_rate
+from sampling.models import PondFishStock, ProjectionState, StockProjection
+
+# Days projected ahead, starting today
+DEFAULT_HORIZON_DAYS = getattr(settings, "PROJECTION_HORIZON_DAYS", 120)
+MIN_HORIZON_DAYS = 30
+MAX_HORIZON_DAYS = 120
+
+INSERT_BATCH_SIZE = 5000
+
+
+def project_matrix(weights, anchors, rates, quantities, days):
+    """
+    Dense stocks × days projection, extrapolating each stock's observed
+    specific growth rate from its latest sampling:
+
+        W(t) = W_latest * exp(sgr / 100 * (t - t_latest))
+
+    `anchors` and `days` are ordinal day numbers. Returns
+    (average weight in g, biomass in kg), both shaped (stocks, days).
+    """
+    elapsed = days[None, :] - anchors[:, None]
+    average_weight = weights[:, None] * np.exp(rates[:, None] / 100.0 * elapsed)
+    biomass_kg = average_weight * quantities[:, None] / 1000.0
+    return average_weight, biomass_kg
+
+
+def _load_active_stocks():
+    # Latest sampling + growth rate of every active stock in one query
+    return list(
+        with_specific_growth_rate(
+            PondFishStock.objects.filter(status=PondFishStock.ACTIVE),
+            basis=SGR_SINCE_PREVIOUS,
+        )
+        .values_list(
+            "pk",
+            "quantity",
+            "db_latest_average_weight",
+            "db_latest_sampled_on",
+            "db_sgr",
+        )
+    )
+
+
+@transaction.atomic
+def refresh_projections(horizon=DEFAULT_HORIZON_DAYS, today=None, full=False):
+    """
+    Bring the StockProjection table up to [today, today + horizon).
+
+    Stocks with new samplings (stale) or no projection yet are recomputed
+    in full; the others only get the days that rolled into the window.
+    Returns the number of projection rows written.
+    """
+    horizon = max(MIN_HORIZON_DAYS, min(int(horizon), MAX_HORIZON_DAYS))
+    today = today or timezone.localdate()
+    end = today + timedelta(days=horizon - 1)
+    now = timezone.now()
+
+    # Days that left the window, at either end (the horizon may have shrunk)
+    StockProjection.objects.filter(day__lt=today).delete()
+    StockProjection.objects.filter(day__gt=end).delete()
+
+    states = {state.fish_stock_id: state for state in ProjectionState.objects.all()}
+    rows = _load_active_stocks()
+
+    projectable = []
+    starts = []
+    unprojectable = []
+    for row in rows:
+        stock_id, quantity, weight, sampled_on, sgr = row
+        if sgr is None:
+            unprojectable.append(stock_id)
+            continue
+
+        state = states.get(stock_id)
+        if full or state is None or state.stale or state.projected_through is None:
+            start = today
+        else:
+            start = max(today, state.projected_through + timedelta(days=1))
+
+        if start <= end:
+            projectable.append(row)
+            starts.append(start.toordinal())
+
+    # Stocks without enough samplings keep no projection
+    StockProjection.objects.filter(fish_stock_id__in=unprojectable).delete()
+
+    written = 0
+    if projectable:
+        stock_ids = np.array([row[0] for row in projectable])
+        quantities = np.array([row[1] for row in projectable], dtype=np.float64)
+        weights = np.array([row[2] for row in projectable], dtype=np.float64)
+        anchors = np.array([row[3].toordinal() for row in projectable], dtype=np.float64)
+        rates = np.array([row[4] for row in projectable], dtype=np.float64)
+        days = np.arange(today.toordinal(), end.toordinal() + 1)
+
+        average_weight, biomass_kg = project_matrix(
+            weights, anchors, rates, quantities, days.astype(np.float64)
+        )
+
+        # Recomputed stocks replace their whole window
+        recompute = stock_ids[np.array(starts) == today.toordinal()]
+        StockProjection.objects.filter(fish_stock_id__in=recompute.tolist()).delete()
+
+        # Only cells on or after each stock's start day are written
+        mask = days[None, :] >= np.array(starts)[:, None]
+        stock_index, day_index = np.nonzero(mask)
+
+        StockProjection.objects.bulk_create(
+            (
+                StockProjection(
+                    fish_stock_id=int(stock_ids[i]),
+                    day=today + timedelta(days=int(j)),
+                    average_weight=round(float(average_weight[i, j]), 2),
+                    biomass_kg=round(float(biomass_kg[i, j]), 3),
+                )
+                for i, j in zip(stock_index, day_index)
+            ),
+            batch_size=INSERT_BATCH_SIZE,
+        )
+        written = len(stock_index)
+
+    # Record what was projected
+    new_states = []
+    updated_states = []
+    for stock_id, _, _, _, sgr in rows:
+        state = states.get(stock_id) or ProjectionState(fish_stock_id=stock_id)
+        state.stale = False
+        state.sgr = sgr
+        state.projected_through = end if sgr is not None else None
+        state.computed_at = now
+        (updated_states if state.pk else new_states).append(state)
+
+    ProjectionState.objects.bulk_create(new_states, batch_size=INSERT_BATCH_SIZE)
+    ProjectionState.objects.bulk_update(
+        updated_states,
+        ["stale", "sgr", "projected_through", "computed_at"],
+        batch_size=INSERT_BATCH_SIZE,
+    )
+
+    return written
+
@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from datetime import timedelta
+from django.db.models import Max
+from django.utils import timezone
+from sampling.models import GrowthThresholdProfile, PondFishStock
+
+# --------------------
+# Sampling schedule
+# --------------------
+# Every active stock carries its next due date in the indexed
+# PondFishStock.next_sampling_due column: its latest sampling (or stocking
+# date) plus the species cadence from GrowthThresholdProfile - the early
+# interval while the stock is younger than early_phase_days, the regular
+# one after. Signals refresh it when a sampling is written or removed and
+# when a stock or profile changes, so the calendar and route lists below
+# read the index only.
+
+DEFAULT_WINDOW_DAYS = 7
+MAX_WINDOW_DAYS = 90
+UPDATE_BATCH_SIZE = 1000
+
+
+def next_due_date(profile, stocked_on, last_sampled_on=None):
+    base = last_sampled_on or stocked_on
+    if (base - stocked_on).days < profile.early_phase_days:
+        interval = profile.early_sampling_interval_days
+    else:
+        interval = profile.sampling_interval_days
+    return base + timedelta(days=interval)
+
+
+def refresh_due_dates(stocks):
+    """Recompute next_sampling_due for a stock queryset; returns {pk: due date}."""
+    rows = list(
+        stocks
+        .annotate(last_sampled_on=Max("samplings__sampled_on"))
+        .only("pk", "species_id", "stocked_on", "status", "next_sampling_due")
+    )
+
+    due_dates, changed = {}, []
+    for stock in rows:
+        due = None
+        if stock.status == PondFishStock.ACTIVE:
+            profile = GrowthThresholdProfile.for_species(stock.species_id)
+            due = next_due_date(profile, stock.stocked_on, stock.last_sampled_on)
+        if due != stock.next_sampling_due:
+            stock.next_sampling_due = due
+            changed.append(stock)
+        due_dates[stock.pk] = due
+
+    # Plain UPDATE: no validation and no stock signals
+    PondFishStock.objects.bulk_update(changed, ["next_sampling_due"], batch_size=UPDATE_BATCH_SIZE)
+    return due_dates
+
+
+def refresh_stock_due_date(stock_id):
+    return refresh_due_dates(PondFishStock.objects.filter(pk=stock_id)).get(stock_id)
+
+
+# --------------------
+# Calendar / crew routes (index reads only)
+# --------------------
+def _due_stocks(user, through):
+    return (
+        PondFishStock.objects
+        .filter(
+            user=user,
+            status=PondFishStock.ACTIVE,
+            next_sampling_due__lte=through,
+        )
+        .select_related("pond", "species")
+        .order_by("next_sampling_due", "pond__name", "species__name")
+    )
+
+
+def _entry(stock, today):
+    return {
+        "stock": stock.pk,
+        "stock_name": str(stock),
+        "pond": stock.pond_id,
+        "pond_name": stock.pond.name,
+        "species_name": stock.species.name,
+        "due_on": stock.next_sampling_due,
+        "days_overdue": max((today - stock.next_sampling_due).days, 0),
+    }
+
+
+def sampling_calendar(user, days=DEFAULT_WINDOW_DAYS, today=None):
+    """Active stocks overdue, due today and due within the next `days` days."""
+    today = today or timezone.localdate()
+    calendar = {"today": today, "overdue": [], "due_today": [], "upcoming": []}
+
+    for stock in _due_stocks(user, today + timedelta(days=days)):
+        if stock.next_sampling_due < today:
+            bucket = "overdue"
+        elif stock.next_sampling_due == today:
+            bucket = "due_today"
+        else:
+            bucket = "upcoming"
+        calendar[bucket].append(_entry(stock, today))
+    return calendar
+
+
+def route_lists(user, on=None, plan=None):
+    """
+    Stocks to sample on `on` (due then or earlier) grouped by pond, most
+    overdue pond first. `plan` (sampling.planner rows) adds batch counts.
+    """
+    on = on or timezone.localdate()
+    batches = {row["stock"]: row["recommended_batches"] for row in plan or ()}
+
+    ponds = OrderedDict()
+    for stock in _due_stocks(user, on):
+        route = ponds.setdefault(stock.pond_id, {
+            "pond": stock.pond_id,
+            "pond_name": stock.pond.name,
+            "stocks": [],
+        })
+        route["stocks"].append({
+            **_entry(stock, on),
+            "recommended_batches": batches.get(stock.pk),
+        })
+    return list(ponds.values())
@@ -1,5 +1,16 @@
-from calculator.utils import calculate_sampling_from_batches
-from sampling.models import FishSampling
+import secrets
+import time
+from datetime import date
+from decimal import Decimal
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from calculator.utils import calculate_sampling_from_batches, pack_batch_weights
+from core.models import SearchTerm
+from core.search import index_object, remove_object
+from sampling.models import NO_DATA, FishSampling, GrowthThresholdProfile, PondFishStock
 
 
 def create_sampling_from_batches(
@@ -7,9 +18,12 @@ def create_sampling_from_batches(
     fish_stock,
     sampled_on,
     batch_size,
-    batches
+    batches,
+    result=None,
 ):
-    result = calculate_sampling_from_batches(batch_size, batches)
+    # `result` lets a confirmed preview skip the recomputation
+    if result is None:
+        result = calculate_sampling_from_batches(batch_size, batches)
 
     sampling = FishSampling.objects.create(
         user=user,
@@ -17,11 +31,136 @@ def create_sampling_from_batches(
         sampled_on=sampled_on,
         sample_fish_count=result["sample_fish_count"],
         sample_total_weight=result["sample_total_weight"],
+        batch_size=batch_size,
+        batch_weights=pack_batch_weights(batches),
     )
 
     return sampling
 
-from sampling.models import FishSampling
+
+# --------------------
+# Two-step add_sampling preview
+# --------------------
+# The preview step keeps its validated input and computed totals in the
+# user's session (shared by every worker) under a random id; the page only
+# carries the signed id. Confirm claims the preview once and commits it
+# without parsing the form again, re-checking only what can change in
+# between: the stock is still active and has no sampling that day.
+
+PREVIEW_TTL = getattr(settings, "SAMPLING_PREVIEW_TTL_SECONDS", 15 * 60)
+PREVIEW_SESSION_KEY = "sampling_previews"
+PREVIEW_CLAIM_KEY = "sampling-preview-claimed:{}"
+PREVIEW_SALT = "sampling.preview"
+PREVIEW_EXPIRED = "This preview has expired or is invalid. Please enter the sampling again."
+PREVIEW_STOCK_CLOSED = "This fish stock is no longer active."
+PREVIEW_DUPLICATE = "A sampling for this fish stock already exists on this date."
+
+
+def store_sampling_preview(request, cleaned_data, result):
+    preview_id = secrets.token_urlsafe(16)
+    fish_stock = cleaned_data["fish_stock"]
+    now = time.time()
+
+    # Abandoned previews are dropped here instead of piling up in the session
+    previews = {
+        key: preview
+        for key, preview in request.session.get(PREVIEW_SESSION_KEY, {}).items()
+        if preview["stored_at"] > now - PREVIEW_TTL
+    }
+    # Sessions are JSON: dates and Decimals as strings
+    previews[preview_id] = {
+        "stored_at": now,
+        "user_id": request.user.pk,
+        "fish_stock_id": fish_stock.pk,
+        "fish_stock_name": str(fish_stock),
+        "sampled_on": cleaned_data["sampled_on"].isoformat(),
+        "batch_size": cleaned_data["batch_size"],
+        "batches": cleaned_data["batch_weights"],
+        "result": {
+            "sample_fish_count": result["sample_fish_count"],
+            "sample_total_weight": str(result["sample_total_weight"]),
+            "average_weight": str(result["average_weight"]),
+        },
+    }
+    request.session[PREVIEW_SESSION_KEY] = previews
+    return signing.TimestampSigner(salt=PREVIEW_SALT).sign(preview_id)
+
+
+def load_sampling_preview(request, token, consume=False):
+    """Stored preview for a signed token; raises ValidationError if unusable."""
+    try:
+        preview_id = signing.TimestampSigner(salt=PREVIEW_SALT).unsign(token, max_age=PREVIEW_TTL)
+    except signing.BadSignature:
+        raise ValidationError(PREVIEW_EXPIRED)
+
+    previews = request.session.get(PREVIEW_SESSION_KEY, {})
+    preview = previews.get(preview_id)
+    if preview is None or preview["user_id"] != request.user.pk:
+        raise ValidationError(PREVIEW_EXPIRED)
+
+    if consume:
+        # Single use: of two concurrent confirms only the one whose add()
+        # succeeds goes on. With a per-process cache two workers can both
+        # claim; the duplicate check at commit still stops the second save.
+        if not cache.add(PREVIEW_CLAIM_KEY.format(preview_id), True, PREVIEW_TTL):
+            raise ValidationError(PREVIEW_EXPIRED)
+        del previews[preview_id]
+        request.session.modified = True
+
+    result = preview["result"]
+    return {
+        **preview,
+        "sampled_on": date.fromisoformat(preview["sampled_on"]),
+        "result": {
+            "sample_fish_count": result["sample_fish_count"],
+            "sample_total_weight": Decimal(result["sample_total_weight"]),
+            "average_weight": Decimal(result["average_weight"]),
+        },
+    }
+
+
+@transaction.atomic
+def create_sampling_from_preview(user, preview):
+    # The stock row lock serializes confirms for the same stock, so two
+    # cannot both pass the duplicate check
+    fish_stock = (
+        PondFishStock.objects
+        .select_for_update()
+        .filter(pk=preview["fish_stock_id"], user=user)
+        .first()
+    )
+    if fish_stock is None:
+        raise ValidationError(PREVIEW_EXPIRED)
+    if fish_stock.status != PondFishStock.ACTIVE:
+        raise ValidationError(PREVIEW_STOCK_CLOSED)
+    if FishSampling.objects.filter(fish_stock=fish_stock, sampled_on=preview["sampled_on"]).exists():
+        raise ValidationError(PREVIEW_DUPLICATE)
+
+    return create_sampling_from_batches(
+        user=user,
+        fish_stock=fish_stock,
+        sampled_on=preview["sampled_on"],
+        batch_size=preview["batch_size"],
+        batches=preview["batches"],
+        result=preview["result"],
+    )
+
+
+def index_stock(stock):
+    # Only active stocks are offered in search / sampling forms
+    if stock.status != PondFishStock.ACTIVE:
+        remove_object(SearchTerm.STOCK, stock.pk)
+        return
+
+    index_object(
+        SearchTerm.STOCK,
+        stock.pk,
+        str(stock),
+        [stock.species.name, stock.pond.name],
+        user=stock.user,
+        parent_id=stock.pond_id,
+    )
+
 
 def calculate_growth(current_sampling):
     previous_sampling = (
@@ -39,18 +178,14 @@ def calculate_growth(current_sampling):
         return {
             "growth_from_previous": None,
             "growth_percentage": None,
-            "growth_status": "NO DATA",
+            "growth_status": NO_DATA,
         }
 
     diff = current_sampling.average_weight - previous_sampling.average_weight
     percentage = (diff / previous_sampling.average_weight) * 100
 
-    if percentage >= 10:
-        status = "GOOD"
-    elif percentage >= 5:
-        status = "AVERAGE"
-    else:
-        status = "POOR"
+    profile = GrowthThresholdProfile.for_species(current_sampling.fish_stock.species_id)
+    status = profile.grade(percentage, profile.sampling_levels())
 
     return {
         "growth_from_previous": round(diff, 2),
@@ -0,0 +1,422 @@
+from decimal import Decimal
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from core.models import FishSpecies, Pond, SearchTerm
+from core.search import remove_object
+from sampling.alerts import evaluate_sampling, rebuild_alert_state
+from sampling.anomalies import rebuild_stock_growth_stats, record_growth_observation
+from sampling.cohorts import cycle_closed
+from sampling.dashboard import bump_row_versions
+from sampling.density import clear_stocking_density
+from sampling.feeding import apply_feed_change, refresh_biomass_gain
+from sampling.frame import invalidate_sampling_frames, sampling_added
+from sampling.live import publish_on_commit
+from sampling.planner import invalidate_sample_size_plan
+from sampling.schedule import refresh_due_dates, refresh_stock_due_date
+from sampling.models import (
+    AlertRule,
+    FeedEvent,
+    FishSampling,
+    GrowthThresholdProfile,
+    PondFishStock,
+    ProjectionState,
+    StockProjection,
+)
+from sampling.services import index_stock
+
+
+# --------------------
+# Growth anomalies
+# --------------------
+@receiver(post_save, sender=FishSampling)
+def update_growth_statistics(sender, instance, created, raw=False, **kwargs):
+    # Fixture loading (raw) must not touch derived tables
+    if raw:
+        return
+
+    # Only a new latest sampling leaves every other rate as it was
+    later = FishSampling.objects.filter(
+        fish_stock_id=instance.fish_stock_id,
+        sampled_on__gt=instance.sampled_on,
+    )
+    if created and not later.exists():
+        record_growth_observation(instance)
+        return
+
+    rebuild_stock_growth_stats(instance.fish_stock_id)
+    previous = getattr(instance, "_previous_position", None)
+    if previous and previous[0] != instance.fish_stock_id:
+        rebuild_stock_growth_stats(previous[0])
+
+
+@receiver(post_delete, sender=FishSampling)
+def sampling_deleted_growth_statistics(sender, instance, origin=None, **kwargs):
+    # A stock / user delete takes the stats with it
+    if getattr(origin, "model", type(origin)) is FishSampling:
+        rebuild_stock_growth_stats(instance.fish_stock_id)
+
+
+# --------------------
+# Stored growth columns
+# --------------------
+@receiver(pre_save, sender=FishSampling)
+def remember_sampling_position(sender, instance, raw=False, **kwargs):
+    # A moved sampling leaves a successor behind at its old position
+    instance._previous_position = None
+    if instance.pk and not raw:
+        instance._previous_position = (
+            FishSampling.objects
+            .filter(pk=instance.pk)
+            .values_list("fish_stock_id", "sampled_on")
+            .first()
+        )
+
+
+@receiver(post_save, sender=FishSampling)
+def sampling_saved_successor(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    FishSampling.refresh_derived_after(instance.fish_stock_id, instance.sampled_on)
+
+    previous = getattr(instance, "_previous_position", None)
+    if previous and previous != (instance.fish_stock_id, instance.sampled_on):
+        FishSampling.refresh_derived_after(*previous)
+
+
+@receiver(post_delete, sender=FishSampling)
+def sampling_deleted_successor(sender, instance, **kwargs):
+    FishSampling.refresh_derived_after(instance.fish_stock_id, instance.sampled_on)
+
+
+@receiver(post_save, sender=PondFishStock)
+def stock_saved_first_sampling(sender, instance, created, raw=False, **kwargs):
+    # The first samplings grow against the stocking weight
+    if not created and not raw:
+        FishSampling.refresh_derived_after(instance.pk)
+
+
+# --------------------
+# Growth alerts
+# --------------------
+# After the stored growth columns above, which the rules read
+@receiver(post_save, sender=FishSampling)
+def sampling_saved_alerts(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    if created:
+        evaluate_sampling(instance)
+    else:
+        rebuild_alert_state(instance.fish_stock_id)
+
+
+@receiver(post_delete, sender=FishSampling)
+def sampling_deleted_alerts(sender, instance, origin=None, **kwargs):
+    # A stock / user delete takes the state with it
+    if getattr(origin, "model", type(origin)) is FishSampling:
+        rebuild_alert_state(instance.fish_stock_id, create=False)
+
+
+@receiver(post_save, sender=AlertRule)
+@receiver(post_delete, sender=AlertRule)
+def alert_rule_changed(sender, instance, **kwargs):
+    AlertRule.clear_cache()
+
+
+# --------------------
+# Search index
+# --------------------
+@receiver(post_save, sender=PondFishStock)
+def stock_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_stock(instance)
+
+
+@receiver(post_delete, sender=PondFishStock)
+def stock_deleted(sender, instance, **kwargs):
+    remove_object(SearchTerm.STOCK, instance.pk)
+
+
+def _reindex_active_stocks(**filters):
+    stocks = (
+        PondFishStock.objects
+        .filter(status=PondFishStock.ACTIVE, **filters)
+        .select_related("pond", "species")
+    )
+    for stock in stocks:
+        index_stock(stock)
+
+
+@receiver(post_save, sender=Pond)
+def pond_renamed(sender, instance, created, raw=False, **kwargs):
+    # Stock labels embed the pond name
+    if not created and not raw:
+        _reindex_active_stocks(pond=instance)
+
+
+@receiver(post_save, sender=FishSpecies)
+def species_renamed(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        _reindex_active_stocks(species=instance)
+
+
+# --------------------
+# Dashboard row fragments
+# --------------------
+@receiver(post_save, sender=FishSampling)
+@receiver(post_delete, sender=FishSampling)
+def sampling_changed(sender, instance, **kwargs):
+    # Also invalidates the successor row, whose growth depends on this one
+    bump_row_versions([instance.fish_stock_id])
+
+
+@receiver(post_save, sender=PondFishStock)
+def stock_changed(sender, instance, **kwargs):
+    bump_row_versions([instance.pk])
+
+
+@receiver(post_save, sender=Pond)
+def pond_changed(sender, instance, created, **kwargs):
+    if not created:
+        bump_row_versions(
+            PondFishStock.objects.filter(pond=instance).values_list("pk", flat=True)
+        )
+
+
+@receiver(post_save, sender=FishSpecies)
+def species_changed(sender, instance, created, **kwargs):
+    if not created:
+        bump_row_versions(
+            PondFishStock.objects.filter(species=instance).values_list("pk", flat=True)
+        )
+
+
+@receiver(post_save, sender=GrowthThresholdProfile)
+@receiver(post_delete, sender=GrowthThresholdProfile)
+def growth_profile_changed(sender, instance, **kwargs):
+    GrowthThresholdProfile.clear_cache()
+
+    # Rendered rows show the status, so regrade them
+    stocks = PondFishStock.objects.all()
+    if instance.species_id:
+        stocks = stocks.filter(species_id=instance.species_id)
+    bump_row_versions(stocks.values_list("pk", flat=True))
+
+
+# --------------------
+# Biomass projection
+# --------------------
+@receiver(post_save, sender=FishSampling)
+@receiver(post_delete, sender=FishSampling)
+def mark_projection_stale(sender, instance, **kwargs):
+    # A missing state row already means "needs projecting"
+    ProjectionState.objects.filter(
+        fish_stock_id=instance.fish_stock_id
+    ).update(stale=True)
+
+
+@receiver(post_save, sender=PondFishStock)
+def drop_closed_stock_projection(sender, instance, raw=False, **kwargs):
+    if not raw and instance.status != PondFishStock.ACTIVE:
+        StockProjection.objects.filter(fish_stock=instance).delete()
+        ProjectionState.objects.filter(fish_stock=instance).delete()
+
+
+# --------------------
+# Feed / FCR
+# --------------------
+@receiver(pre_save, sender=FeedEvent)
+def remember_feed_quantity(sender, instance, raw=False, **kwargs):
+    # Edits are applied as a delta against the stored row
+    instance._previous_feed = None
+    if instance.pk and not raw:
+        instance._previous_feed = (
+            FeedEvent.objects
+            .filter(pk=instance.pk)
+            .values_list("fish_stock_id", "quantity_kg")
+            .first()
+        )
+
+
+@receiver(post_save, sender=FeedEvent)
+def feed_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    previous = getattr(instance, "_previous_feed", None)
+    if previous:
+        stock_id, quantity_kg = previous
+        apply_feed_change(stock_id, -quantity_kg, -1)
+
+    apply_feed_change(instance.fish_stock_id, Decimal(instance.quantity_kg), 1)
+
+
+@receiver(post_delete, sender=FeedEvent)
+def feed_deleted(sender, instance, **kwargs):
+    # Never create a summary here: the stock itself may be mid-delete
+    apply_feed_change(instance.fish_stock_id, -instance.quantity_kg, -1, create=False)
+
+
+@receiver(post_save, sender=FishSampling)
+@receiver(post_delete, sender=FishSampling)
+def sampling_changed_fcr(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_biomass_gain(instance.fish_stock_id)
+
+
+# --------------------
+# Stocking density
+# --------------------
+@receiver(post_save, sender=FishSampling)
+@receiver(post_delete, sender=FishSampling)
+@receiver(post_save, sender=PondFishStock)
+@receiver(post_delete, sender=PondFishStock)
+@receiver(post_save, sender=Pond)
+@receiver(post_delete, sender=Pond)
+def density_inputs_changed(sender, instance, **kwargs):
+    clear_stocking_density([instance.user_id])
+
+
+@receiver(post_save, sender=GrowthThresholdProfile)
+@receiver(post_delete, sender=GrowthThresholdProfile)
+def capacity_changed(sender, instance, **kwargs):
+    stocks = PondFishStock.objects.all()
+    if instance.species_id:
+        stocks = stocks.filter(species_id=instance.species_id)
+    clear_stocking_density(stocks.values_list("user_id", flat=True).distinct())
+
+
+# --------------------
+# Sample-size planner
+# --------------------
+@receiver(post_save, sender=FishSampling)
+@receiver(post_delete, sender=FishSampling)
+@receiver(post_save, sender=PondFishStock)
+def sample_size_inputs_changed(sender, instance, **kwargs):
+    invalidate_sample_size_plan(instance.user_id)
+
+
+# --------------------
+# Sampling frames
+# --------------------
+@receiver(post_save, sender=FishSampling)
+def sampling_saved_frame(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    if created:
+        sampling_added(instance)
+    else:
+        invalidate_sampling_frames([instance.user_id])
+
+
+@receiver(post_delete, sender=FishSampling)
+def sampling_deleted_frame(sender, instance, **kwargs):
+    invalidate_sampling_frames([instance.user_id])
+
+
+@receiver(post_save, sender=PondFishStock)
+def stock_saved_frame(sender, instance, created, raw=False, **kwargs):
+    # Frame rows carry the stocking date / weight / species
+    if not created and not raw:
+        invalidate_sampling_frames([instance.user_id])
+
+
+# --------------------
+# Reference growth curves
+# --------------------
+@receiver(post_save, sender=PondFishStock)
+def stock_closed_reference_curves(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw and instance.status == PondFishStock.CLOSED:
+        transaction.on_commit(lambda: cycle_closed(instance))
+
+
+# --------------------
+# Sampling schedule
+# --------------------
+@receiver(post_save, sender=FishSampling)
+def sampling_saved_schedule(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_stock_due_date(instance.fish_stock_id)
+
+
+@receiver(post_delete, sender=FishSampling)
+def sampling_deleted_schedule(sender, instance, origin=None, **kwargs):
+    # A stock / user delete takes the stock with it
+    if getattr(origin, "model", type(origin)) is FishSampling:
+        refresh_stock_due_date(instance.fish_stock_id)
+
+
+@receiver(post_save, sender=PondFishStock)
+def stock_saved_schedule(sender, instance, raw=False, **kwargs):
+    # Stocking date, species or status may have changed; the refresh is a
+    # queryset update, so this does not re-enter
+    if not raw:
+        instance.next_sampling_due = refresh_stock_due_date(instance.pk)
+
+
+@receiver(post_save, sender=GrowthThresholdProfile)
+@receiver(post_delete, sender=GrowthThresholdProfile)
+def sampling_cadence_changed(sender, instance, **kwargs):
+    # After growth_profile_changed has cleared the profile cache
+    stocks = PondFishStock.objects.filter(status=PondFishStock.ACTIVE)
+    if instance.species_id:
+        stocks = stocks.filter(species_id=instance.species_id)
+    refresh_due_dates(stocks)
+
+
+# --------------------
+# Live dashboard events
+# --------------------
+@receiver(post_save, sender=FishSampling)
+def publish_sampling_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    if not created:
+        # The generated average is not reloaded after an UPDATE
+        instance.refresh_from_db(fields=["average_weight"])
+
+    stock = instance.fish_stock
+    growth = instance.growth_from_previous
+    publish_on_commit(instance.user_id, {
+        "type": "sampling",
+        "action": "created" if created else "updated",
+        "sampling": {
+            "id": instance.pk,
+            "fish_stock": stock.pk,
+            "pond_id": stock.pond_id,
+            "pond_name": stock.pond.name,
+            "species_name": stock.species.name,
+            "sampled_on": instance.sampled_on.isoformat(),
+            "sample_fish_count": instance.sample_fish_count,
+            "sample_total_weight": str(instance.sample_total_weight),
+            "average_weight": str(instance.average_weight),
+            "growth_from_previous": str(growth) if growth is not None else None,
+            "growth_status": instance.growth_status,
+        },
+    })
+
+
+@receiver(post_delete, sender=FishSampling)
+def publish_sampling_deleted(sender, instance, **kwargs):
+    publish_on_commit(instance.user_id, {
+        "type": "sampling",
+        "action": "deleted",
+        "sampling": {"id": instance.pk, "fish_stock": instance.fish_stock_id},
+    })
+
+
+@receiver(post_save, sender=PondFishStock)
+def publish_stock_closed(sender, instance, created, raw=False, **kwargs):
+    if not raw and not created and instance.status == PondFishStock.CLOSED:
+        publish_on_commit(instance.user_id, {
+            "type": "stock_closed",
+            "stock": {
+                "id": instance.pk,
+                "name": str(instance),
+                "closed_on": instance.closed_on.isoformat(),
+            },
+        })
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+from datetime import timedelta
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from calculator.simulation import BAND_STEP_DAYS, percentile_bands, simulate
+from sampling.frame import sampling_frame
+from sampling.models import ArchivedFishSampling, GrowthThresholdProfile
+
+# Defaults; all can be overridden per run
+SIMULATION_WORKERS = getattr(settings, "SIMULATION_WORKERS", os.cpu_count() or 1)
+DEFAULT_TRAJECTORIES = 20000
+MAX_TRAJECTORIES = 200000
+DEFAULT_MAX_DAYS = 365
+
+# No mortality is recorded yet, so it is a prior rather than learned:
+# % of the standing stock lost per day (mean, sd)
+DAILY_MORTALITY_PCT = getattr(settings, "SIMULATION_DAILY_MORTALITY_PCT", (0.1, 0.05))
+
+MIN_OBSERVATIONS = 3
+CACHE_TIMEOUT = 60 * 60
+
+
+class NotEnoughHistory(Exception):
+    pass
+
+
+def growth_observations(user, species_id):
+    """
+    (ln start weight, sgr % per day) of every sampling interval of a
+    species, in active and archived cycles.
+    """
+    frame = sampling_frame(user)
+    growth = frame.growth()
+    species = frame.species_id == species_id
+
+    # Archived rows keep their growth columns; NULLs become NaN
+    archived = np.array(
+        ArchivedFishSampling.objects
+        .filter(user=user, fish_stock__species_id=species_id)
+        .values_list("average_weight", "growth_from_previous", "growth_percentage", "days_since_previous"),
+        dtype=np.float64,
+    ).reshape(-1, 4)
+
+    start_weight = np.concatenate([growth["base_weight"][species], archived[:, 0] - archived[:, 1]])
+    ratio = 1.0 + np.concatenate([growth["growth_percentage"][species], archived[:, 2]]) / 100.0
+    days = np.concatenate([growth["days_since_previous"][species], archived[:, 3]])
+    with np.errstate(invalid="ignore"):
+        valid = (days > 0) & (start_weight > 0) & (ratio > 0)
+    sgr = 100.0 * np.log(ratio[valid]) / days[valid]
+    return np.log(start_weight[valid]), sgr
+
+
+def learn_growth_model(user, species_id):
+    """
+    Fit sgr = intercept + slope * ln(W) on the species history; the residual
+    spread becomes the between-trajectory growth variation.
+    """
+    log_weight, sgr = growth_observations(user, species_id)
+    if sgr.size < MIN_OBSERVATIONS:
+        raise NotEnoughHistory(
+            f"At least {MIN_OBSERVATIONS} sampling intervals of this species are needed."
+        )
+
+    if sgr.size >= 2 * MIN_OBSERVATIONS and np.ptp(log_weight) > 0:
+        slope, intercept = np.polyfit(log_weight, sgr, 1)
+        # Growth rate does not rise with size
+        slope = min(slope, 0.0)
+        intercept = float(np.mean(sgr - slope * log_weight))
+    else:
+        slope, intercept = 0.0, float(np.mean(sgr))
+
+    residuals = sgr - (intercept + slope * log_weight)
+    return {
+        "observations": int(sgr.size),
+        "intercept": round(intercept, 6),
+        "slope": round(float(slope), 6),
+        "sgr_sd": round(float(residuals.std(ddof=1)) if sgr.size > 1 else 0.0, 6),
+        "mean_sgr": round(float(sgr.mean()), 4),
+    }
+
+
+def _cache_key(params, trajectories, seed):
+    payload = json.dumps([params, trajectories, seed], sort_keys=True, default=str)
+    return "stocking-simulation:" + hashlib.sha256(payload.encode()).hexdigest()
+
+
+def simulate_stocking(
+    user,
+    species_id,
+    quantity,
+    initial_weight,
+    target_weight,
+    stocked_on,
+    area_acres=None,
+    trajectories=DEFAULT_TRAJECTORIES,
+    max_days=DEFAULT_MAX_DAYS,
+    mortality_pct=None,
+    seed=None,
+):
+    """
+    Percentile bands of harvest date / weight / biomass for a proposed stock.
+    Results are cached by inputs and fitted model, so new samplings of the
+    species produce a fresh run.
+    """
+    model = learn_growth_model(user, species_id)
+    mortality_mean, mortality_sd = mortality_pct or DAILY_MORTALITY_PCT
+
+    capacity_kg = None
+    if area_acres:
+        profile = GrowthThresholdProfile.for_species(species_id)
+        capacity_kg = float(profile.carrying_capacity_kg_per_acre) * float(area_acres)
+
+    params = {
+        "quantity": int(quantity),
+        "initial_weight": float(initial_weight),
+        "target_weight": float(target_weight),
+        "max_days": int(max_days),
+        "intercept": model["intercept"],
+        "slope": model["slope"],
+        "sgr_sd": model["sgr_sd"],
+        "mortality_mean": float(mortality_mean) / 100.0,
+        "mortality_sd": float(mortality_sd) / 100.0,
+        "capacity_kg": capacity_kg,
+    }
+
+    key = _cache_key(params, trajectories, seed)
+    result = cache.get(key)
+    if result is None:
+        paths = simulate(params, trajectories, workers=SIMULATION_WORKERS, seed=seed)
+        result = _summarise(paths, params)
+        cache.set(key, result, CACHE_TIMEOUT)
+
+    harvest_days = result["harvest_days"]
+    return {
+        **result,
+        "growth_model": model,
+        "trajectories": trajectories,
+        "harvest_date": {
+            label: stocked_on + timedelta(days=int(round(days)))
+            for label, days in harvest_days.items()
+        },
+    }
+
+
+def _summarise(paths, params):
+    band = paths["band"]
+    return {
+        "harvest_days": percentile_bands(paths["harvest_day"], 0),
+        "harvest_average_weight": percentile_bands(paths["harvest_weight"]),
+        "harvest_biomass_kg": percentile_bands(paths["harvest_biomass"]),
+        "survival_pct": percentile_bands(paths["survival"] * 100),
+        "reached_target_pct": round(float(paths["reached"].mean() * 100), 2),
+        "over_capacity_pct": (
+            round(float(paths["over_capacity"].mean() * 100), 2)
+            if params["capacity_kg"] else None
+        ),
+        "biomass_band": [
+            {"day": step * BAND_STEP_DAYS, **percentile_bands(band[:, step])}
+            for step in range(band.shape[1])
+        ],
+    }
@@ -1,3 +1,1243 @@
-from django.test import TestCase
+import csv
+import importlib
+import io
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from calculator.utils import pack_batch_weights
+from core.caching import LOCAL_CACHE_TIMEOUT
+from core.models import FishSpecies, Pond, SearchTerm
+from core.search import search
+from sampling import cohorts, dashboard, density, frame, planner
+from sampling.anomalies import daily_growth_rate, rebuild_stock_growth_stats
+from sampling.growth import SGR_SINCE_PREVIOUS, stock_leaderboard, with_growth_status
+from sampling.projections import refresh_projections
+from sampling.schedule import sampling_calendar
+from sampling.signals import publish_sampling_saved
+from sampling.archive import archive_stocks, restore_stocks, sampling_history
+from sampling.export import ARROW, PARQUET, export_querysets, record_batches, stream_export
+from sampling.live import CacheBroker
+from sampling.services import (
+    PREVIEW_DUPLICATE,
+    PREVIEW_EXPIRED,
+    PREVIEW_STOCK_CLOSED,
+    PREVIEW_TTL,
+)
+from sampling.models import (
+    AlertRule,
+    ArchivedFishSampling,
+    ArchivedPondFishStock,
+    FeedEvent,
+    FishSampling,
+    GrowthAlert,
+    GrowthAnomaly,
+    GrowthThresholdProfile,
+    PondFishStock,
+    SpeciesGrowthStats,
+    StockAlertState,
+    StockFeedSummary,
+    StockGrowthStats,
+    StockProjection,
+)
 
-# Create your tests here.
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+SHARED = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(tempfile.gettempdir(), "fishfarm-test-cache"),
+    }
+}
+
+
+class SamplingTestCase(TestCase):
+    """A user with one pond, species and active stock stocked on 2026-01-01."""
+
+    stocked_on = date(2026, 1, 1)
+
+    def setUp(self):
+        self.user = User.objects.create_user("crew", password="secret")
+        self.pond = Pond.objects.create(user=self.user, name="P1", area_acres=Decimal("2.50"))
+        self.species = FishSpecies.objects.create(name="Tilapia")
+        self.stock = PondFishStock.objects.create(
+            user=self.user,
+            pond=self.pond,
+            species=self.species,
+            quantity=1000,
+            initial_avg_weight=Decimal("10.00"),
+            stocked_on=self.stocked_on,
+        )
+
+    def add_sampling(self, day, average_weight, stock=None, count=10):
+        return FishSampling.objects.create(
+            user=self.user,
+            fish_stock=stock or self.stock,
+            sampled_on=self.stocked_on + timedelta(days=day),
+            sample_fish_count=count,
+            sample_total_weight=Decimal(f"{average_weight * count:.2f}"),
+        )
+
+
+# --------------------
+# Live dashboard events
+# --------------------
+class LiveEventsTests(SamplingTestCase):
+    def test_wsgi_request_gets_no_stream(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("sampling-events"))
+        self.assertEqual(response.status_code, 204)
+
+    def test_dashboard_does_not_open_stream_under_wsgi(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("sampling-dashboard"))
+        self.assertFalse(response.context["live_events"])
+
+    @override_settings(CACHES=LOCMEM)
+    def test_cache_broker_refuses_per_process_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            CacheBroker()
+
+    @override_settings(CACHES=SHARED)
+    def test_cache_broker_accepts_shared_cache(self):
+        CacheBroker()
+
+    def published_sampling(self, save):
+        with mock.patch("sampling.signals.publish_on_commit") as publish:
+            save()
+        return publish.call_args.args[1]["sampling"]
+
+    def test_missing_growth_is_published_as_null(self):
+        sampling = self.add_sampling(10, 20)
+        sampling.growth_from_previous = None
+        event = self.published_sampling(
+            lambda: publish_sampling_saved(FishSampling, sampling, created=True)
+        )
+        self.assertEqual(event["average_weight"], "20.00")
+        self.assertIsNone(event["growth_from_previous"])
+
+    def test_updated_sampling_publishes_new_average(self):
+        sampling = self.add_sampling(10, 20)
+        sampling.sample_total_weight = Decimal("250.00")
+        event = self.published_sampling(sampling.save)
+        self.assertEqual(event["average_weight"], "25.00")
+        self.assertEqual(event["growth_from_previous"], "15.00")
+
+
+# --------------------
+# Archive
+# --------------------
+class ArchiveTests(SamplingTestCase):
+    def setUp(self):
+        super().setUp()
+        for day, weight in ((10, 20), (20, 35), (30, 50)):
+            self.add_sampling(day, weight)
+        self.stock.status = PondFishStock.CLOSED
+        self.stock.closed_on = self.stocked_on + timedelta(days=40)
+        self.stock.save()
+        self.growth = list(self._growth(FishSampling.objects.all()))
+
+    def _growth(self, queryset):
+        return queryset.order_by("sampled_on").values_list(
+            "pk", "average_weight", *FishSampling.DERIVED_FIELDS
+        )
+
+    def test_archive_restore_round_trip(self):
+        self.assertEqual(archive_stocks([self.stock.pk]), 1)
+        self.assertFalse(PondFishStock.objects.exists())
+        self.assertFalse(FishSampling.objects.exists())
+        self.assertEqual(list(self._growth(ArchivedFishSampling.objects.all())), self.growth)
+
+        self.assertEqual(restore_stocks([self.stock.pk]), 1)
+        self.assertFalse(ArchivedPondFishStock.objects.exists())
+        self.assertEqual(PondFishStock.objects.get().status, PondFishStock.CLOSED)
+        self.assertEqual(list(self._growth(FishSampling.objects.all())), self.growth)
+
+    def test_archive_sends_no_per_sampling_signals(self):
+        with (
+            mock.patch("sampling.signals.publish_on_commit") as publish,
+            mock.patch.object(FishSampling, "refresh_derived_after") as refresh,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            archive_stocks([self.stock.pk])
+        publish.assert_not_called()
+        refresh.assert_not_called()
+
+    def test_active_stock_is_not_archived(self):
+        other = PondFishStock.objects.create(
+            user=self.user,
+            pond=self.pond,
+            species=self.species,
+            quantity=500,
+            initial_avg_weight=Decimal("5.00"),
+            stocked_on=self.stocked_on,
+        )
+        self.assertEqual(archive_stocks([other.pk]), 0)
+        self.assertTrue(PondFishStock.objects.filter(pk=other.pk).exists())
+
+    def species_baseline(self):
+        stats = SpeciesGrowthStats.objects.get(user=self.user, species=self.species)
+        return stats.count, round(stats.mean, 6), round(stats.m2, 6)
+
+    def test_archive_and_restore_keep_species_baseline_exact(self):
+        other = PondFishStock.objects.create(
+            user=self.user,
+            pond=Pond.objects.create(user=self.user, name="P2", area_acres=Decimal("1.00")),
+            species=self.species,
+            quantity=500,
+            initial_avg_weight=Decimal("10.00"),
+            stocked_on=self.stocked_on,
+        )
+        for day, weight in ((10, 15), (20, 30)):
+            self.add_sampling(day, weight, stock=other)
+        other_only = StockGrowthStats.objects.get(fish_stock=other)
+        both = self.species_baseline()
+        self.assertEqual(both[0], 5)
+
+        archive_stocks([self.stock.pk])
+        self.assertEqual(
+            self.species_baseline(),
+            (2, round(other_only.mean, 6), round(other_only.m2, 6)),
+        )
+
+        restore_stocks([self.stock.pk])
+        self.assertEqual(self.species_baseline(), both)
+        self.assertEqual(StockGrowthStats.objects.get(fish_stock=self.stock).count, 3)
+
+        rebuild_stock_growth_stats(self.stock.pk)
+        self.assertEqual(self.species_baseline(), both)
+
+    def test_unsupported_on_delete_is_refused(self):
+        relation = next(
+            rel for rel in PondFishStock._meta.related_objects if rel.related_model is FishSampling
+        )
+        with mock.patch.object(relation, "on_delete", models.PROTECT):
+            with self.assertRaisesMessage(ValueError, "on_delete=PROTECT"):
+                archive_stocks([self.stock.pk])
+        self.assertFalse(ArchivedPondFishStock.objects.exists())
+        self.assertEqual(FishSampling.objects.count(), 3)
+
+    def test_history_api_filters_live_and_archived_rows(self):
+        archive_stocks([self.stock.pk])
+        self.client.force_login(self.user)
+        url = reverse("api-sampling-history")
+
+        response = self.client.get(url, {"fish_stock": self.stock.pk, "from_date": "2026-01-15"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["archived"] for row in response.data["results"]], [True, True])
+        for params in ({"fish_stock": "x"}, {"from_date": "soon"}):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_reports_read_archived_rows(self):
+        archive_stocks([self.stock.pk])
+        self.assertEqual(
+            [row["archived"] for row in sampling_history(self.user)],
+            [True, True, True],
+        )
+
+        batches = list(record_batches(export_querysets(user=self.user), chunk_size=2))
+        self.assertEqual(sum(batch.num_rows for batch in batches), 3)
+        self.assertEqual(
+            batches[-1].column("average_weight").to_pylist()[-1],
+            float(self.growth[-1][1]),
+        )
+
+
+# --------------------
+# Feed conversion
+# --------------------
+class FeedConversionTests(SamplingTestCase):
+    def feed(self, quantity_kg):
+        return FeedEvent.objects.create(
+            user=self.user,
+            fish_stock=self.stock,
+            fed_on=self.stocked_on + timedelta(days=1),
+            quantity_kg=Decimal(quantity_kg),
+        )
+
+    def test_fcr_from_feed_and_gain(self):
+        self.feed("15")
+        self.add_sampling(20, 20)  # 10 g gained by 1000 fish = 10 kg
+        self.assertEqual(StockFeedSummary.objects.get().fcr, Decimal("1.500"))
+
+    def test_fcr_above_bound_is_empty(self):
+        self.feed("5000")
+        # 0.01 g gained by 1000 fish = 0.010 kg: a ratio of 500000
+        self.add_sampling(20, 10.01)
+        summary = StockFeedSummary.objects.get()
+        self.assertEqual(summary.biomass_gain_kg, Decimal("0.010"))
+        self.assertIsNone(summary.fcr)
+
+    def test_fcr_at_bound_is_kept(self):
+        self.feed("10")
+        self.add_sampling(20, 10.01)
+        self.assertEqual(StockFeedSummary.objects.get().fcr, StockFeedSummary.MAX_FCR)
+
+    def test_no_gain_has_no_fcr(self):
+        self.feed("15")
+        self.add_sampling(20, 9)
+        self.assertIsNone(StockFeedSummary.objects.get().fcr)
+
+
+# --------------------
+# Stocking density
+# --------------------
+class StockingDensityTests(SamplingTestCase):
+    def cached_timeout(self):
+        density.clear_stocking_density([self.user.pk])
+        with mock.patch.object(density.cache, "set", wraps=density.cache.set) as cache_set:
+            density.stocking_density(self.user)
+        return cache_set.call_args.args[2]
+
+    @override_settings(CACHES=LOCMEM)
+    def test_per_process_cache_entry_expires(self):
+        self.assertEqual(self.cached_timeout(), LOCAL_CACHE_TIMEOUT)
+
+    @override_settings(CACHES=SHARED)
+    def test_shared_cache_entry_lives_until_cleared(self):
+        self.assertIsNone(self.cached_timeout())
+
+    def test_cleared_on_sampling(self):
+        before = density.stocking_density(self.user)[0]["biomass_kg"]
+        self.add_sampling(20, 20)
+        self.assertEqual(density.stocking_density(self.user)[0]["biomass_kg"], before * 2)
+
+
+# --------------------
+# Seek pagination
+# --------------------
+class SeekPaginationTests(SamplingTestCase):
+    def setUp(self):
+        super().setUp()
+        # Two samplings a day, so pages split inside a day
+        for day in range(1, 8):
+            self.add_sampling(day, 10 + day)
+            self.add_sampling(day, 10 + day)
+        self.newest_first = list(FishSampling.objects.order_by("-sampled_on", "-pk"))
+
+    def test_walks_every_row_once_forward_and_back(self):
+        pages, cursor = [], None
+        while True:
+            page = dashboard.seek_paginate(FishSampling.objects.all(), after=cursor, per_page=4)
+            pages.append(list(page))
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual([row for rows in pages for row in rows], self.newest_first)
+        self.assertEqual([len(rows) for rows in pages], [4, 4, 4, 2])
+
+        before = dashboard.encode_cursor(pages[-1][0])
+        page = dashboard.seek_paginate(FishSampling.objects.all(), before=before, per_page=4)
+        self.assertEqual(list(page), pages[-2])
+        self.assertTrue(page.has_previous)
+
+    def test_first_page_has_no_previous(self):
+        page = dashboard.seek_paginate(FishSampling.objects.all(), per_page=4)
+        self.assertEqual(list(page), self.newest_first[:4])
+        self.assertFalse(page.has_previous)
+        self.assertIsNone(page.previous_cursor)
+
+    def test_bad_cursor_gives_first_page(self):
+        page = dashboard.seek_paginate(FishSampling.objects.all(), after="yesterday.x", per_page=4)
+        self.assertEqual(list(page), self.newest_first[:4])
+
+    def test_dashboard_next_link(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("sampling-dashboard"))
+        page = response.context["page_obj"]
+        self.assertEqual(list(page), self.newest_first[:10])
+        response = self.client.get(reverse("sampling-dashboard"), {"after": page.next_cursor})
+        self.assertEqual(list(response.context["page_obj"]), self.newest_first[10:])
+
+
+# --------------------
+# Dashboard row fragments
+# --------------------
+class RowVersionTests(SamplingTestCase):
+    def version(self):
+        return dashboard.row_versions([self.stock.pk])[self.stock.pk]
+
+    def test_sampling_bumps_stock_version(self):
+        before = self.version()
+        self.assertEqual(self.version(), before)
+        self.add_sampling(20, 20)
+        self.assertNotEqual(self.version(), before)
+
+    @override_settings(CACHES=LOCMEM)
+    def test_per_process_cache_expires_versions_and_rows(self):
+        with mock.patch.object(dashboard.cache, "set_many", wraps=dashboard.cache.set_many) as set_many:
+            dashboard.bump_row_versions([self.stock.pk])
+        self.assertEqual(set_many.call_args.args[1], LOCAL_CACHE_TIMEOUT)
+        self.assertEqual(dashboard.row_fragment_timeout(), LOCAL_CACHE_TIMEOUT)
+
+    @override_settings(CACHES=SHARED)
+    def test_shared_cache_keeps_versions_and_rows(self):
+        with mock.patch.object(dashboard.cache, "set_many", wraps=dashboard.cache.set_many) as set_many:
+            dashboard.bump_row_versions([self.stock.pk])
+        self.assertIsNone(set_many.call_args.args[1])
+        self.assertEqual(dashboard.row_fragment_timeout(), dashboard.ROW_FRAGMENT_TIMEOUT)
+
+    def test_dashboard_renders_cached_rows(self):
+        self.add_sampling(20, 20)
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("sampling-dashboard"))
+        self.assertContains(response, "20.00")
+        self.assertEqual(response.context["row_cache_timeout"], dashboard.row_fragment_timeout())
+
+
+# --------------------
+# Two-step add_sampling preview
+# --------------------
+class SamplingPreviewTests(SamplingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def preview(self, **data):
+        response = self.client.post(reverse("add-sampling"), {
+            "fish_stock": self.stock.pk,
+            "sampled_on": "2026-01-21",
+            "batch_size": 5,
+            "batch_weights": "100\n110",
+            **data,
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.context["preview_token"]
+
+    def confirm(self, token):
+        return self.client.post(reverse("add-sampling"), {"preview_token": token, "confirm": ""})
+
+    def assertRejected(self, response, message):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["error"], message)
+
+    def test_confirm_saves_previewed_totals_once(self):
+        token = self.preview()
+        self.assertRedirects(self.confirm(token), reverse("sampling-success"))
+        sampling = FishSampling.objects.get()
+        self.assertEqual(sampling.sample_fish_count, 10)
+        self.assertEqual(sampling.sample_total_weight, Decimal("210"))
+        self.assertEqual(sampling.sampled_on, date(2026, 1, 21))
+
+        self.assertRejected(self.confirm(token), PREVIEW_EXPIRED)
+        self.assertEqual(FishSampling.objects.count(), 1)
+
+    def test_edit_refills_form(self):
+        token = self.preview()
+        response = self.client.post(reverse("add-sampling"), {"preview_token": token, "edit": ""})
+        self.assertEqual(response.context["form"].initial["batch_weights"], "100\n110")
+        self.assertEqual(response.context["form"].initial["sampled_on"], date(2026, 1, 21))
+
+    def test_expired_token_is_rejected(self):
+        token = self.preview()
+        with mock.patch("time.time", return_value=time.time() + PREVIEW_TTL + 1):
+            self.assertRejected(self.confirm(token), PREVIEW_EXPIRED)
+        self.assertFalse(FishSampling.objects.exists())
+
+    def test_tampered_token_is_rejected(self):
+        token = self.preview()
+        preview_id, _, signature = token.partition(":")
+        tampered = f"{preview_id[:-1]}{'A' if preview_id[-1] != 'A' else 'B'}:{signature}"
+        self.assertRejected(self.confirm(tampered), PREVIEW_EXPIRED)
+        self.assertFalse(FishSampling.objects.exists())
+
+    def test_token_of_another_session_is_rejected(self):
+        token = self.preview()
+        other = User.objects.create_user("other", password="secret")
+        self.client.force_login(other)
+        self.assertRejected(self.confirm(token), PREVIEW_EXPIRED)
+        self.assertFalse(FishSampling.objects.exists())
+
+    def test_stock_closed_since_preview(self):
+        token = self.preview()
+        self.stock.status = PondFishStock.CLOSED
+        self.stock.closed_on = date(2026, 1, 22)
+        self.stock.save()
+        self.assertRejected(self.confirm(token), PREVIEW_STOCK_CLOSED)
+        self.assertFalse(FishSampling.objects.exists())
+
+    def test_sampled_since_preview(self):
+        token = self.preview()
+        self.add_sampling(20, 20)
+        self.assertRejected(self.confirm(token), PREVIEW_DUPLICATE)
+        self.assertEqual(FishSampling.objects.count(), 1)
+
+
+# --------------------
+# Sampling frames
+# --------------------
+class SamplingFrameTests(SamplingTestCase):
+    def test_fetch_picks_up_lower_pk_committed_late(self):
+        early, late = self.add_sampling(10, 20), self.add_sampling(20, 30)
+        # The frame saw `late` commit before `early`
+        built = frame.SamplingFrame(self.user.pk)
+        built.append_rows(
+            FishSampling.objects.filter(pk=late.pk).values_list(*frame.QUERY_FIELDS)
+        )
+        self.assertEqual(built.fetch(), 1)
+        self.assertEqual(sorted(built.sampling_id.tolist()), [early.pk, late.pk])
+        self.assertEqual(built.fetch(), 0)
+
+    def test_catches_up_with_new_samplings(self):
+        self.add_sampling(10, 20)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(len(frame.sampling_frame(self.user)), 1)
+            self.add_sampling(20, 30)
+        current = frame.sampling_frame(self.user)
+        self.assertEqual(len(current), 2)
+        self.assertEqual(current.latest_per_stock()[self.stock.pk].average_weight, 30.0)
+
+    @override_settings(CACHES=LOCMEM)
+    def test_per_process_cache_stamps_expire(self):
+        frame.cache.delete_many([
+            frame.EPOCH_KEY.format(self.user.pk),
+            frame.APPENDED_KEY.format(self.user.pk),
+        ])
+        with mock.patch.object(frame.cache, "add", wraps=frame.cache.add) as cache_add:
+            frame._stamps(self.user.pk)
+        self.assertEqual({call.args[2] for call in cache_add.call_args_list}, {LOCAL_CACHE_TIMEOUT})
+
+
+# --------------------
+# Growth statistics / anomalies
+# --------------------
+class RunningStatsTests(SamplingTestCase):
+    values = [1.5, 2.0, 2.25, 1.75, 3.0, 2.5]
+
+    def stats(self, values):
+        stats = StockGrowthStats()
+        for value in values:
+            stats.push(value)
+        return stats
+
+    def test_push_matches_batch_statistics(self):
+        stats = self.stats(self.values)
+        self.assertEqual(stats.count, 6)
+        self.assertAlmostEqual(stats.mean, statistics.mean(self.values))
+        self.assertAlmostEqual(stats.variance, statistics.variance(self.values))
+
+    def test_discard_leaves_the_remaining_observations(self):
+        stats = self.stats(self.values)
+        stats.discard(self.stats(self.values[2:4]))
+        remaining = self.values[:2] + self.values[4:]
+        self.assertEqual(stats.count, 4)
+        self.assertAlmostEqual(stats.mean, statistics.mean(remaining))
+        self.assertAlmostEqual(stats.variance, statistics.variance(remaining))
+
+    def test_discard_everything_resets(self):
+        stats = self.stats(self.values)
+        stats.discard(self.stats(self.values))
+        self.assertEqual((stats.count, stats.mean, stats.m2), (0, 0.0, 0.0))
+
+
+class GrowthStatisticsTests(SamplingTestCase):
+    def setUp(self):
+        super().setUp()
+        # Steady growth: 10 g more every 10 days
+        self.samplings = [self.add_sampling(day, 10 + day) for day in range(10, 70, 10)]
+
+    def assertStatsMatchHistory(self):
+        rates = [
+            daily_growth_rate(sampling)
+            for sampling in FishSampling.objects.filter(fish_stock=self.stock).order_by("sampled_on", "pk")
+        ]
+        stats = StockGrowthStats.objects.get(fish_stock=self.stock)
+        species = SpeciesGrowthStats.objects.get(user=self.user, species=self.species)
+        for running in (stats, species):
+            self.assertEqual(running.count, len(rates))
+            self.assertAlmostEqual(running.mean, statistics.mean(rates))
+            self.assertAlmostEqual(running.variance, statistics.variance(rates))
+
+    def test_appended_samplings(self):
+        self.assertStatsMatchHistory()
+
+    def test_edited_sampling(self):
+        sampling = self.samplings[2]
+        sampling.sample_total_weight = Decimal("450.00")
+        sampling.save()
+        self.assertStatsMatchHistory()
+
+    def test_deleted_sampling(self):
+        self.samplings[3].delete()
+        self.assertStatsMatchHistory()
+
+    def test_backdated_sampling(self):
+        self.add_sampling(15, 27)
+        self.assertStatsMatchHistory()
+
+    def test_other_stock_keeps_its_share_of_species_baseline(self):
+        pond = Pond.objects.create(user=self.user, name="P2", area_acres=Decimal("1.00"))
+        other = PondFishStock.objects.create(
+            user=self.user,
+            pond=pond,
+            species=self.species,
+            quantity=500,
+            initial_avg_weight=Decimal("10.00"),
+            stocked_on=self.stocked_on,
+        )
+        other_rates = [
+            daily_growth_rate(self.add_sampling(day, 10 + day * 2, stock=other))
+            for day in (10, 20)
+        ]
+        self.samplings[1].delete()
+
+        own_rates = [
+            daily_growth_rate(sampling)
+            for sampling in FishSampling.objects.filter(fish_stock=self.stock).order_by("sampled_on")
+        ]
+        species = SpeciesGrowthStats.objects.get(user=self.user, species=self.species)
+        self.assertEqual(species.count, len(own_rates) + len(other_rates))
+        self.assertAlmostEqual(species.mean, statistics.mean(own_rates + other_rates))
+        self.assertAlmostEqual(species.variance, statistics.variance(own_rates + other_rates))
+
+    def test_anomaly_follows_edits(self):
+        outlier = self.add_sampling(70, 400)
+        self.assertTrue(GrowthAnomaly.objects.filter(sampling=outlier).exists())
+
+        outlier.sample_total_weight = Decimal("800.00")  # back on trend
+        outlier.save()
+        self.assertFalse(GrowthAnomaly.objects.exists())
+
+
+# --------------------
+# Admin
+# --------------------
+class FishSamplingAdminTests(SamplingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sampling = FishSampling.objects.create(
+            user=self.user,
+            fish_stock=self.stock,
+            sampled_on=date(2026, 1, 21),
+            sample_fish_count=10,
+            sample_total_weight=Decimal("210.00"),
+            batch_size=5,
+            batch_weights=pack_batch_weights([100, 110]),
+        )
+        admin_user = User.objects.create_superuser("admin", password="secret")
+        self.client.force_login(admin_user)
+
+    def test_changelist_does_not_decode_batches(self):
+        with mock.patch.object(FishSampling, "batch_stats") as batch_stats:
+            response = self.client.get(reverse("admin:sampling_fishsampling_changelist"))
+        self.assertEqual(response.status_code, 200)
+        batch_stats.assert_not_called()
+
+    def test_change_form_shows_batch_stats(self):
+        response = self.client.get(
+            reverse("admin:sampling_fishsampling_change", args=[self.sampling.pk])
+        )
+        self.assertContains(response, "CV=")
+
+    def test_changelist_ordering_uses_date_index(self):
+        plan = FishSampling.objects.order_by("-sampled_on", "-id")[:100].explain()
+        self.assertIn("sampling_date_idx", plan)
+
+        response = self.client.get(
+            reverse("admin:sampling_fishsampling_changelist"), {"sampled_on__year": "2026"}
+        )
+        self.assertContains(response, "Jan")
+
+
+# --------------------
+# Biomass projection
+# --------------------
+class ProjectionTests(SamplingTestCase):
+    today = date(2026, 3, 1)
+
+    def setUp(self):
+        super().setUp()
+        self.add_sampling(30, 20)
+        self.add_sampling(50, 30)
+
+    def projected_days(self):
+        return list(StockProjection.objects.order_by("day").values_list("day", flat=True))
+
+    def test_window_starts_today(self):
+        refresh_projections(horizon=60, today=self.today)
+        days = self.projected_days()
+        self.assertEqual((days[0], days[-1], len(days)), (self.today, date(2026, 4, 29), 60))
+
+    def test_shrunk_horizon_drops_days_beyond_end(self):
+        refresh_projections(horizon=120, today=self.today)
+        refresh_projections(horizon=30, today=self.today)
+        days = self.projected_days()
+        self.assertEqual((days[0], days[-1], len(days)), (self.today, date(2026, 3, 30), 30))
+
+    def test_rolling_forward_only_adds_new_days(self):
+        refresh_projections(horizon=30, today=self.today)
+        written = refresh_projections(horizon=30, today=self.today + timedelta(days=2))
+        self.assertEqual(written, 2)
+        self.assertEqual(len(self.projected_days()), 30)
+
+    def test_api_filters_by_stock(self):
+        refresh_projections(horizon=30, today=self.today)
+        self.client.force_login(self.user)
+        url = reverse("api-stock-projections")
+        params = {"from": "2026-03-01", "to": "2026-03-10"}
+
+        response = self.client.get(url, {**params, "stock": self.stock.pk})
+        self.assertEqual(response.status_code, 200)
+        for name in ("stock", "pond"):
+            response = self.client.get(url, {**params, name: "abc"})
+            self.assertEqual(response.status_code, 400)
+
+
+# --------------------
+# Growth alerts
+# --------------------
+class AlertStreakTests(SamplingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.rule = AlertRule.objects.create(
+            user=self.user,
+            name="Losing weight",
+            kind=AlertRule.WEIGHT_LOSS,
+            threshold=Decimal("0"),
+            consecutive=2,
+        )
+
+    def streak(self):
+        return StockAlertState.objects.get(fish_stock=self.stock).streaks[str(self.rule.pk)]
+
+    def alerted_days(self):
+        alerts = GrowthAlert.objects.filter(rule=self.rule).order_by("sampling__sampled_on")
+        return [alert.sampling.sampled_on.day for alert in alerts]
+
+    def test_fires_once_when_streak_reaches_count(self):
+        self.add_sampling(10, 20)
+        self.add_sampling(20, 18)
+        self.assertEqual((self.streak(), self.alerted_days()), (1, []))
+        self.add_sampling(30, 16)
+        self.assertEqual((self.streak(), self.alerted_days()), (2, [31]))
+        self.add_sampling(40, 15)
+        self.assertEqual((self.streak(), self.alerted_days()), (3, [31]))
+
+    def test_growth_resets_streak(self):
+        self.add_sampling(10, 20)
+        self.add_sampling(20, 18)
+        self.add_sampling(30, 25)
+        self.add_sampling(40, 24)
+        self.assertEqual((self.streak(), self.alerted_days()), (1, []))
+
+    def test_edit_replays_streaks_without_firing(self):
+        self.add_sampling(10, 20)
+        self.add_sampling(20, 18)
+        recovered = self.add_sampling(30, 25)
+        recovered.sample_total_weight = Decimal("160.00")
+        recovered.save()
+        self.assertEqual((self.streak(), self.alerted_days()), (2, []))
+
+    def test_backdated_sampling_replays_streaks(self):
+        self.add_sampling(10, 20)
+        self.add_sampling(30, 22)
+        self.add_sampling(20, 30)  # between them: 30 g, then a loss to 22 g
+        self.assertEqual((self.streak(), self.alerted_days()), (1, []))
+
+    def test_deleted_sampling_replays_streaks(self):
+        self.add_sampling(10, 20)
+        loss = self.add_sampling(20, 18)
+        self.add_sampling(30, 16)
+        loss.delete()
+        self.assertEqual(self.streak(), 1)
+
+
+# --------------------
+# Sampling schedule
+# --------------------
+class DueDateTests(SamplingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.profile = GrowthThresholdProfile.objects.create(
+            species=self.species,
+            early_sampling_interval_days=7,
+            sampling_interval_days=14,
+            early_phase_days=60,
+        )
+        self.stock.refresh_from_db()
+
+    def due(self):
+        return PondFishStock.objects.get(pk=self.stock.pk).next_sampling_due
+
+    def day(self, days):
+        return self.stocked_on + timedelta(days=days)
+
+    def test_new_stock_is_due_one_early_interval_after_stocking(self):
+        self.assertEqual(self.due(), self.day(7))
+
+    def test_sampling_moves_due_date(self):
+        self.add_sampling(10, 20)
+        self.assertEqual(self.due(), self.day(17))
+        # Past the early phase: the regular interval
+        self.add_sampling(70, 60)
+        self.assertEqual(self.due(), self.day(84))
+
+    def test_backdated_sampling_keeps_due_date(self):
+        self.add_sampling(20, 20)
+        self.add_sampling(10, 15)
+        self.assertEqual(self.due(), self.day(27))
+
+    def test_deleting_latest_sampling_moves_due_date_back(self):
+        self.add_sampling(10, 20)
+        latest = self.add_sampling(20, 25)
+        latest.delete()
+        self.assertEqual(self.due(), self.day(17))
+
+    def test_closed_stock_is_not_due(self):
+        self.stock.status = PondFishStock.CLOSED
+        self.stock.closed_on = self.day(30)
+        self.stock.save()
+        self.assertIsNone(self.due())
+
+    def test_profile_change_refreshes_due_dates(self):
+        self.add_sampling(70, 60)
+        self.profile.sampling_interval_days = 21
+        self.profile.save()
+        self.assertEqual(self.due(), self.day(91))
+
+    def test_calendar_buckets(self):
+        other_pond = Pond.objects.create(user=self.user, name="P2", area_acres=Decimal("1.00"))
+        later = PondFishStock.objects.create(
+            user=self.user,
+            pond=other_pond,
+            species=self.species,
+            quantity=500,
+            initial_avg_weight=Decimal("5.00"),
+            stocked_on=self.day(5),
+        )
+        calendar = sampling_calendar(self.user, days=7, today=self.day(7))
+        self.assertEqual([row["stock"] for row in calendar["due_today"]], [self.stock.pk])
+        self.assertEqual([row["stock"] for row in calendar["upcoming"]], [later.pk])
+
+        calendar = sampling_calendar(self.user, days=7, today=self.day(10))
+        overdue = [(row["stock"], row["days_overdue"]) for row in calendar["overdue"]]
+        self.assertEqual(overdue, [(self.stock.pk, 3)])
+
+
+# --------------------
+# Reference growth curves
+# --------------------
+class ReferenceCurveTests(SamplingTestCase):
+    def close_cycle(self, final_weight):
+        stock = PondFishStock.objects.create(
+            user=self.user,
+            pond=self.pond,
+            species=self.species,
+            quantity=1000,
+            initial_avg_weight=Decimal("10.00"),
+            stocked_on=self.stocked_on,
+        )
+        for day, weight in ((30, 10 + final_weight / 3), (60, final_weight)):
+            self.add_sampling(day, weight, stock=stock)
+        stock.status = PondFishStock.CLOSED
+        stock.closed_on = self.stocked_on + timedelta(days=61)
+        with self.captureOnCommitCallbacks(execute=True):
+            stock.save()
+        return stock
+
+    def setUp(self):
+        super().setUp()
+        self.stock.status = PondFishStock.CLOSED
+        self.stock.closed_on = self.stocked_on
+        self.stock.save()
+        cohorts.cache.delete(cohorts.CURVES_KEY.format(self.user.pk))
+
+    def test_rebuilt_curves_are_read_back(self):
+        for weight in (80, 100, 120):
+            self.close_cycle(weight)
+        curves = cohorts.reference_curves(self.user.pk)
+        cycles, bands = curves[(self.species.pk, None)]
+        self.assertEqual(cycles, 3)
+        self.assertAlmostEqual(float(bands[cohorts.PERCENTILES.index(50), 60]), 100, places=2)
+
+        self.close_cycle(200)
+        cycles, bands = cohorts.reference_curves(self.user.pk)[(self.species.pk, None)]
+        self.assertEqual(cycles, 4)
+        self.assertGreater(float(bands[cohorts.PERCENTILES.index(50), 60]), 100)
+
+    @override_settings(CACHES=LOCMEM)
+    def test_per_process_cache_entry_expires(self):
+        with mock.patch.object(cohorts.cache, "set", wraps=cohorts.cache.set) as cache_set:
+            cohorts.reference_curves(self.user.pk)
+        self.assertEqual(cache_set.call_args.args[2], LOCAL_CACHE_TIMEOUT)
+
+    def test_comparison_rejects_non_numeric_stock(self):
+        self.client.login(username="crew", password="secret")
+        response = self.client.get(reverse("api-cohort-comparison"), {"fish_stock": "abc"})
+        self.assertEqual(response.status_code, 400)
+
+
+# --------------------
+# Sample-size planner
+# --------------------
+class SampleSizePlanTests(SamplingTestCase):
+    def plan_row(self):
+        return planner.sample_size_plan(self.user)[0]
+
+    def weigh(self, day, weights):
+        return FishSampling.objects.create(
+            user=self.user,
+            fish_stock=self.stock,
+            sampled_on=self.stocked_on + timedelta(days=day),
+            sample_fish_count=len(weights) * 10,
+            sample_total_weight=Decimal(sum(weights)),
+            batch_size=10,
+            batch_weights=pack_batch_weights(weights),
+        )
+
+    @override_settings(CACHES=SHARED)
+    def test_new_sampling_changes_plan(self):
+        planner.cache.delete(planner.PLAN_VERSION_KEY.format(self.user.pk))
+        self.assertEqual(self.plan_row()["batches_observed"], 0)
+
+        self.weigh(30, [100, 110])
+        self.assertEqual(self.plan_row()["batches_observed"], 2)
+        first_cv = self.plan_row()["cv_pct"]
+
+        self.weigh(40, [100, 200, 150])
+        self.assertEqual(self.plan_row()["batches_observed"], 5)
+        self.assertNotEqual(self.plan_row()["cv_pct"], first_cv)
+
+    @override_settings(CACHES=LOCMEM)
+    def test_per_process_cache_entries_expire(self):
+        planner.cache.delete(planner.PLAN_VERSION_KEY.format(self.user.pk))
+        with mock.patch.object(planner.cache, "set", wraps=planner.cache.set) as cache_set:
+            self.plan_row()
+            self.weigh(30, [100, 110])
+        timeouts = [
+            call.args[2] for call in cache_set.call_args_list if call.args[0].startswith("sample-size")
+        ]
+        self.assertEqual(timeouts, [LOCAL_CACHE_TIMEOUT] * 3)
+
+
+# --------------------
+# Derived growth columns
+# --------------------
+class DerivedGrowthTests(SamplingTestCase):
+    def test_growth_uses_generated_average_rounding(self):
+        # 81 g / 8 fish = 10.125 g, which SQL rounds half away from zero
+        sampling = FishSampling.objects.create(
+            user=self.user,
+            fish_stock=self.stock,
+            sampled_on=self.stocked_on + timedelta(days=10),
+            sample_fish_count=8,
+            sample_total_weight=Decimal("81.00"),
+        )
+        sampling.refresh_from_db()
+        self.assertEqual(sampling.average_weight, Decimal("10.13"))
+        self.assertEqual(sampling.growth_from_previous, Decimal("0.13"))
+        self.assertEqual(sampling.growth_percentage, Decimal("1.30"))
+
+    def test_growth_filters_reject_non_numbers(self):
+        self.add_sampling(10, 20)
+        self.client.force_login(self.user)
+        for params in ({"min_growth": "abc"}, {"max_growth": "NaN"}):
+            response = self.client.get(reverse("api-samplings"), params)
+            self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(reverse("api-samplings"), {"min_growth": "50", "max_growth": "150"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+
+
+# --------------------
+# Sampling create API
+# --------------------
+class SamplingCreateAPITests(SamplingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def post(self, stock, sampled_on="2026-02-01"):
+        return self.client.post(
+            reverse("api-sampling-create"),
+            {"fish_stock": stock.pk, "sampled_on": sampled_on, "batch_size": 10, "batches": [100, 110]},
+            content_type="application/json",
+        )
+
+    def test_creates_sampling_from_batches(self):
+        response = self.post(self.stock)
+        self.assertEqual(response.status_code, 201)
+        sampling = FishSampling.objects.get()
+        self.assertEqual((sampling.user, sampling.fish_stock), (self.user, self.stock))
+        self.assertEqual(sampling.sample_fish_count, 20)
+        self.assertEqual(response.data["average_weight"], Decimal("10.50"))
+
+    def test_other_users_stock_is_rejected(self):
+        other = User.objects.create_user("other", password="secret")
+        stock = PondFishStock.objects.create(
+            user=other,
+            pond=Pond.objects.create(user=other, name="P2", area_acres=Decimal("1.00")),
+            species=self.species,
+            quantity=100,
+            initial_avg_weight=Decimal("10.00"),
+            stocked_on=self.stocked_on,
+        )
+        response = self.post(stock)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("fish_stock", response.data)
+        self.assertFalse(FishSampling.objects.exists())
+
+    def test_model_validation_errors_are_bad_requests(self):
+        response = self.post(self.stock, sampled_on="2025-12-01")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, ["Sampling date cannot be before stock date."])
+
+        self.stock.status = PondFishStock.CLOSED
+        self.stock.closed_on = self.stocked_on + timedelta(days=60)
+        self.stock.save()
+        response = self.post(self.stock)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, ["Cannot add sampling to a closed stock."])
+        self.assertFalse(FishSampling.objects.exists())
+
+
+# --------------------
+# Growth status
+# --------------------
+class GrowthStatusTests(SamplingTestCase):
+    # Around the default (8 / 4) and the custom (10 / 5) thresholds
+    PERCENTAGES = [
+        None, "-1.00", "0.00", "3.99", "4.00", "4.99", "5.00", "7.99", "8.00", "9.99", "10.00", "25.00",
+    ]
+
+    def test_sql_status_matches_property_at_boundaries(self):
+        GrowthThresholdProfile.objects.create(
+            species=self.species, sampling_good=Decimal("10"), sampling_average=Decimal("5")
+        )
+        other_species = FishSpecies.objects.create(name="Carp")
+        other_stock = PondFishStock.objects.create(
+            user=self.user,
+            pond=Pond.objects.create(user=self.user, name="P2", area_acres=Decimal("1.00")),
+            species=other_species,
+            quantity=500,
+            initial_avg_weight=Decimal("10.00"),
+            stocked_on=self.stocked_on,
+        )
+
+        for stock in (self.stock, other_stock):
+            for day, percentage in enumerate(self.PERCENTAGES, start=1):
+                sampling = self.add_sampling(day, 20, stock=stock)
+                FishSampling.objects.filter(pk=sampling.pk).update(
+                    growth_percentage=percentage and Decimal(percentage)
+                )
+
+        graded = with_growth_status(FishSampling.objects.select_related("fish_stock"))
+        statuses = {row.pk: row.db_growth_status for row in graded}
+        for sampling in FishSampling.objects.select_related("fish_stock"):
+            with self.subTest(species=sampling.fish_stock.species_id, percentage=sampling.growth_percentage):
+                self.assertEqual(statuses[sampling.pk], sampling.growth_status)
+        self.assertEqual(len(set(statuses.values())), 4)
+
+        at_eight = graded.filter(growth_percentage=Decimal("8.00")).order_by("fish_stock_id")
+        self.assertEqual([row.db_growth_status for row in at_eight], ["AVERAGE", "GOOD"])
+
+
+# --------------------
+# SGR leaderboard
+# --------------------
+class LeaderboardTests(SamplingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = PondFishStock.objects.create(
+            user=self.user,
+            pond=Pond.objects.create(user=self.user, name="P2", area_acres=Decimal("1.00")),
+            species=self.species,
+            quantity=1000,
+            initial_avg_weight=Decimal("10.00"),
+            stocked_on=self.stocked_on,
+        )
+        # Stock: 10 → 12 → 40 g, other: 10 → 30 → 45 g (days 0, 30, 60)
+        for stock, weights in ((self.stock, (12, 40)), (self.other, (30, 45))):
+            self.add_sampling(30, weights[0], stock=stock)
+            self.add_sampling(60, weights[1], stock=stock)
+
+    def ranking(self, **kwargs):
+        return [(row["position"], row["id"], row["db_sgr"]) for row in stock_leaderboard(self.user, **kwargs)]
+
+    def test_ranks_by_sgr_since_stocking(self):
+        # 100 * ln(45 / 10) / 60 and 100 * ln(40 / 10) / 60
+        self.assertEqual(self.ranking(), [(1, self.other.pk, 2.5068), (2, self.stock.pk, 2.3105)])
+
+    def test_ranks_by_sgr_since_previous_sampling(self):
+        # 100 * ln(40 / 12) / 30 and 100 * ln(45 / 30) / 30
+        self.assertEqual(
+            self.ranking(basis=SGR_SINCE_PREVIOUS),
+            [(1, self.stock.pk, 4.0132), (2, self.other.pk, 1.3516)],
+        )
+
+    def test_bottom_k(self):
+        self.assertEqual(self.ranking(bottom=True, k=1), [(1, self.stock.pk, 2.3105)])
+
+
+# --------------------
+# Typeahead search
+# --------------------
+class SearchTests(SamplingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = User.objects.create_user("other", password="secret")
+        Pond.objects.create(user=self.other, name="Tilapia Pond", area_acres=Decimal("1.00"))
+        self.shared = FishSpecies.objects.create(name="Tilapia Red")
+
+    def found(self, query, user=None, **kwargs):
+        return [(row["type"], row["id"]) for row in search(user or self.user, query, **kwargs)]
+
+    def test_prefix_matches_words_and_phrases(self):
+        self.assertEqual(
+            sorted(self.found("tila")),
+            sorted([("species", self.species.pk), ("species", self.shared.pk), ("stock", self.stock.pk)]),
+        )
+        self.assertEqual(self.found("tilapia r"), [("species", self.shared.pk)])
+        self.assertEqual(self.found("p1", kinds=["pond"]), [("pond", self.pond.pk)])
+        self.assertEqual(self.found("  "), [])
+
+    def test_only_own_and_global_objects(self):
+        custom = FishSpecies.objects.create(name="Tilapia Gold", user=self.user)
+        self.assertNotIn("pond", [kind for kind, _ in self.found("tilapia")])
+        self.assertIn(("species", custom.pk), self.found("tilapia"))
+        self.assertIn(("species", self.shared.pk), self.found("tilapia", user=self.other))
+        self.assertNotIn(("species", custom.pk), self.found("tilapia", user=self.other))
+
+    def test_stocks_follow_renames_and_closing(self):
+        self.pond.name = "North"
+        self.pond.save()
+        self.assertEqual(self.found("north", kinds=["stock"]), [("stock", self.stock.pk)])
+        self.assertEqual(
+            self.found("tilapia", kinds=["stock"], parent_id=self.pond.pk),
+            [("stock", self.stock.pk)],
+        )
+
+        self.stock.status = PondFishStock.CLOSED
+        self.stock.closed_on = self.stocked_on + timedelta(days=30)
+        self.stock.save()
+        self.assertEqual(self.found("north", kinds=["stock"]), [])
+
+    def test_api(self):
+        self.client.force_login(self.user)
+        url = reverse("api-search")
+        response = self.client.get(url, {"q": "tilapia", "types": "stock", "pond": self.pond.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["results"],
+            [{"type": "stock", "id": self.stock.pk, "label": str(self.stock)}],
+        )
+        response = self.client.get(url, {"q": "tilapia", "limit": "ten"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_migration_backfills_missing_terms(self):
+        migration = importlib.import_module("sampling.migrations.0016_backfill_search_terms")
+        expected = sorted(SearchTerm.objects.values_list("kind", "object_id", "label", "term", "user_id"))
+        SearchTerm.objects.filter(kind__in=[SearchTerm.POND, SearchTerm.STOCK]).delete()
+
+        migration.backfill_search_terms(apps, None)
+        migration.backfill_search_terms(apps, None)
+        self.assertEqual(
+            sorted(SearchTerm.objects.values_list("kind", "object_id", "label", "term", "user_id")),
+            expected,
+        )
+
+
+# --------------------
+# Sampling export
+# --------------------
+class ExportTests(SamplingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.add_sampling(10, 20)
+        self.add_sampling(40, 35)
+
+        # A 2025 cycle, archived, and a stock spanning the new year
+        archived = self.add_stock("P2", date(2025, 6, 1))
+        self.add_sampling(-184, 15, stock=archived)
+        self.add_sampling(-31, 60, stock=archived)
+        archived.status = PondFishStock.CLOSED
+        archived.closed_on = date(2025, 12, 15)
+        archived.save()
+        archive_stocks([archived.pk])
+
+        spanning = self.add_stock("P3", date(2025, 11, 1))
+        self.add_sampling(-12, 12.5, stock=spanning)
+        self.add_sampling(4, 14.25, stock=spanning)
+
+        self.client.force_login(self.user)
+
+    def add_stock(self, pond_name, stocked_on):
+        return PondFishStock.objects.create(
+            user=self.user,
+            pond=Pond.objects.create(user=self.user, name=pond_name, area_acres=Decimal("1.00")),
+            species=self.species,
+            quantity=500,
+            initial_avg_weight=Decimal("10.00"),
+            stocked_on=stocked_on,
+        )
+
+    def expected(self, year):
+        rows = {}
+        for model in (FishSampling, ArchivedFishSampling):
+            queryset = model.objects.filter(sampled_on__year=year)
+            rows.update((pk, float(average)) for pk, average in queryset.values_list("pk", "average_weight"))
+        return rows
+
+    def read(self, data, fmt):
+        if fmt == PARQUET:
+            return pq.read_table(pa.BufferReader(data))
+        return pa.ipc.open_stream(data).read_all()
+
+    def exported(self, table):
+        return dict(zip(table.column("sampling_id").to_pylist(), table.column("average_weight").to_pylist()))
+
+    def test_stream_round_trips_in_chunks(self):
+        for fmt in (PARQUET, ARROW):
+            with self.subTest(fmt=fmt):
+                batches = record_batches(export_querysets(user=self.user, year=2025), chunk_size=1)
+                table = self.read(b"".join(stream_export(batches, fmt)), fmt)
+                self.assertEqual(self.exported(table), self.expected(2025))
+                self.assertEqual(set(table.column("year").to_pylist()), {2025})
+                self.assertEqual(
+                    sorted(set(table.column("pond").to_pylist())),
+                    ["P2", "P3"],
+                )
+
+    def test_api_streams_year(self):
+        for fmt in (PARQUET, ARROW):
+            with self.subTest(fmt=fmt):
+                response = self.client.get(reverse("api-sampling-export"), {"output": fmt, "year": "2026"})
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("samplings-2026.", response["Content-Disposition"])
+                table = self.read(b"".join(response.streaming_content), fmt)
+                self.assertEqual(self.exported(table), self.expected(2026))
+
+        response = self.client.get(reverse("api-sampling-export"), {"year": "last"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_admin_csv_streams_year(self):
+        admin_user = User.objects.create_superuser("admin", password="secret")
+        self.client.force_login(admin_user)
+        response = self.client.post(
+            reverse("admin:sampling_fishsampling_changelist") + "?sampled_on__year=2025",
+            {
+                "action": "export_csv",
+                "select_across": "1",
+                "index": "0",
+                "_selected_action": [FishSampling.objects.first().pk],
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        hot_2025 = {
+            pk: average for pk, average in self.expected(2025).items()
+            if FishSampling.objects.filter(pk=pk).exists()
+        }
+        self.assertEqual({int(row["id"]): float(row["average_weight"]) for row in rows}, hot_2025)
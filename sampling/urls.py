@@ -1,5 +1,5 @@
 from django.urls import path,include
-from sampling.views import add_sampling, sampling_dashboard, sampling_success, add_pond_stock, pond_stock_list, close_pond_stock
+from sampling.views import add_sampling, sampling_dashboard, sampling_success, add_pond_stock, pond_stock_list, close_pond_stock, sampling_events, alert_list
 
 urlpatterns = [
     path("add/", add_sampling, name="add-sampling"),
@@ -7,5 +7,7 @@ urlpatterns = [
     path("stock/add/", add_pond_stock, name="add-pond-stock"),
     path("stock/", pond_stock_list, name="pond-stock-list"),
     path("dashboard/", sampling_dashboard, name="sampling-dashboard"),
+    path("dashboard/events/", sampling_events, name="sampling-events"),
     path("stock/<int:stock_id>/close/",close_pond_stock,name="close-pond-stock"),
+    path("alerts/", alert_list, name="alert-list"),
 ]
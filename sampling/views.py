@@ -1,58 +1,87 @@
+import json
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render, redirect
 from calculator.utils import calculate_sampling_from_batches
-from core.models import Pond
-from sampling.forms import SamplingForm, PondStockForm
-from sampling.models import FishSampling, PondFishStock
-from sampling.services import create_sampling_from_batches
+from sampling.alerts import mark_alerts_read
+from sampling.dashboard import row_fragment_timeout, row_versions, seek_paginate
+from sampling.frame import sampling_frame
+from sampling.growth import with_growth_status
+from sampling.live import get_broker, streaming_supported
+from sampling.planner import sample_size_plan
+from sampling.forms import SamplingForm, SamplingFilterForm, PondStockForm
+from sampling.models import FishSampling, GrowthAlert, PondFishStock
+from sampling.services import (
+    create_sampling_from_preview,
+    load_sampling_preview,
+    store_sampling_preview,
+)
 from django.core.paginator import Paginator
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
 
 def add_sampling(request):
     if request.method == "POST":
-        form = SamplingForm(request.POST, user=request.user)
+        token = request.POST.get("preview_token")
 
-        if form.is_valid():
-            # If user clicks "Go back and edit"
-            if "edit" in request.POST:
+        # Edit / confirm of a preview: work from the stored result
+        if token:
+            confirm = "confirm" in request.POST
+            try:
+                preview = load_sampling_preview(request, token, consume=confirm)
+                if confirm:
+                    create_sampling_from_preview(request.user, preview)
+                    return redirect("sampling-success")
+            except ValidationError as exc:
                 return render(
                     request,
                     "sampling/add_sampling.html",
-                    {"form": form},
+                    {"form": SamplingForm(user=request.user), "error": exc.messages[0]},
                 )
 
+            # "Go back and edit"
+            form = SamplingForm(
+                initial={
+                    "fish_stock": preview["fish_stock_id"],
+                    "sampled_on": preview["sampled_on"],
+                    "batch_size": preview["batch_size"],
+                    "batch_weights": "\n".join(f"{weight:g}" for weight in preview["batches"]),
+                },
+                user=request.user,
+            )
+            return render(request, "sampling/add_sampling.html", {"form": form})
+
+        form = SamplingForm(request.POST, user=request.user)
+
+        if form.is_valid():
             fish_stock = form.cleaned_data["fish_stock"]
-            sampled_on = form.cleaned_data["sampled_on"]
             batch_size = form.cleaned_data["batch_size"]
             batch_weights = form.cleaned_data["batch_weights"]
 
-
             # Preview step
-            if "confirm" not in request.POST:
-                preview = calculate_sampling_from_batches(
-                            batch_size=batch_size,
-                            batches=batch_weights,
-                        )
-
-                return render(
-                    request,
-                    "sampling/preview_sampling.html",
-                    {
-                        "form": form,
-                        "preview": preview,
-                    },
-                )
-
-            # Final save
-            create_sampling_from_batches(
-                user=request.user,
-                fish_stock=fish_stock,
-                sampled_on=sampled_on,
+            preview = calculate_sampling_from_batches(
                 batch_size=batch_size,
                 batches=batch_weights,
             )
+            token = store_sampling_preview(request, form.cleaned_data, preview)
 
-            return redirect("sampling-success")
+            plan = next(
+                (row for row in sample_size_plan(request.user) if row["stock"] == fish_stock.pk),
+                None,
+            )
+
+            return render(
+                request,
+                "sampling/preview_sampling.html",
+                {
+                    "form": form,
+                    "preview": preview,
+                    "preview_token": token,
+                    "plan": plan,
+                    "batches_entered": len(batch_weights),
+                },
+            )
 
     else:
         form = SamplingForm(user=request.user)
@@ -103,8 +132,9 @@ def close_pond_stock(request, stock_id):
 def sampling_dashboard(request):
     pond_id = request.GET.get("pond")
     stock_id = request.GET.get("stock")
+    growth_status = request.GET.get("growth_status")
 
-    samplings = (
+    samplings = with_growth_status(
         FishSampling.objects
         .filter(user=request.user)
         .select_related(
@@ -112,7 +142,7 @@ def sampling_dashboard(request):
             "fish_stock__pond",
             "fish_stock__species"
         )
-        .order_by("-sampled_on")
+        .order_by("-sampled_on", "-id")
     )
 
     # Apply filters in correct priority
@@ -122,28 +152,51 @@ def sampling_dashboard(request):
     if stock_id:
         samplings = samplings.filter(fish_stock_id=stock_id)
 
-    paginator = Paginator(samplings, 10)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    if growth_status:
+        samplings = samplings.filter(db_growth_status=growth_status)
 
-    # ✅ Ponds for dropdown
-    ponds = Pond.objects.filter(user=request.user)
+    # Numbered pages (with COUNT) only for old ?page= links;
+    # otherwise seek on (sampled_on, id) with no total count
+    seek = "page" not in request.GET
+    if seek:
+        page_obj = seek_paginate(
+            samplings,
+            after=request.GET.get("after"),
+            before=request.GET.get("before"),
+            per_page=10,
+        )
+    else:
+        paginator = Paginator(samplings, 10)
+        page_obj = paginator.get_page(request.GET.get("page"))
+
+    # Cached row fragments are keyed by sampling id + stock version
+    versions = row_versions(sampling.fish_stock_id for sampling in page_obj)
+    for sampling in page_obj:
+        sampling.row_version = versions[sampling.fish_stock_id]
 
-    # ✅ Stocks filtered by selected pond
-    stocks = PondFishStock.objects.filter(
+    filter_params = request.GET.copy()
+    for key in ("page", "after", "before"):
+        filter_params.pop(key, None)
+
+    # ✅ Pond / stock pickers query the search API instead of listing everything
+    filter_form = SamplingFilterForm(
+        initial={"pond": pond_id, "stock": stock_id, "growth_status": growth_status},
         user=request.user,
-        status=PondFishStock.ACTIVE
     )
 
-    if pond_id:
-        stocks = stocks.filter(pond_id=pond_id)
-
     return render(
         request,
         "sampling/dashboard.html",
         {
             "page_obj": page_obj,
-            "ponds": ponds,
-            "stocks": stocks,
+            "seek": seek,
+            "filter_query": filter_params.urlencode(),
+            "filter_form": filter_form,
+            "row_cache_timeout": row_fragment_timeout(),
+            # Live updates need the ASGI app (see sampling.live)
+            "live_events": streaming_supported(request),
+            # Live-pushed new samplings are prepended only to the newest page
+            "live_top": seek and not filter_params and not request.GET.get("after") and not request.GET.get("before"),
             "selected_pond": pond_id,
             "selected_stock": stock_id,
         }
@@ -151,10 +204,77 @@ def sampling_dashboard(request):
 
 @login_required
 def pond_stock_list(request):
-    stocks = PondFishStock.objects.filter(user=request.user)
+    stocks = list(
+        PondFishStock.objects
+        .filter(user=request.user)
+        .select_related("pond", "species")
+    )
+    latest = sampling_frame(request.user).latest_per_stock()
+    for stock in stocks:
+        stock.last_sampling = latest.get(stock.pk)
 
     return render(
         request,
         "sampling/pond_stock_list.html",
         {"stocks": stocks}
     )
+
+
+@login_required
+def alert_list(request):
+    if request.method == "POST":
+        mark_alerts_read(request.user)
+        return redirect("alert-list")
+
+    alerts = (
+        GrowthAlert.objects
+        .filter(user=request.user)
+        .select_related("rule", "fish_stock__pond", "fish_stock__species")
+    )
+    page = Paginator(alerts, 20).get_page(request.GET.get("page"))
+
+    return render(
+        request,
+        "sampling/alerts.html",
+        {
+            "page": page,
+            "unread": alerts.filter(read_at__isnull=True).count(),
+        }
+    )
+
+
+# Comment line sent when idle so proxies keep the stream open
+SSE_HEARTBEAT_SECONDS = 15
+
+
+@login_required
+async def sampling_events(request):
+    """
+    Server-Sent Events stream of the user's sampling / stock changes
+    (sampling.live). Needs the ASGI app to hold connections open.
+    """
+    if not streaming_supported(request):
+        # A WSGI worker would buffer the endless stream and never send it;
+        # 204 tells EventSource not to reconnect
+        return HttpResponse(status=204)
+
+    user = await request.auser()
+    subscription = get_broker().subscribe(user.pk)
+
+    async def stream():
+        try:
+            yield "retry: 2000\n\n"
+            while True:
+                event = await subscription.get(SSE_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                data = json.dumps(event, cls=DjangoJSONEncoder)
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from telemetry.models import Reading, Rollup
+
+
+@admin.register(Reading)
+class ReadingAdmin(admin.ModelAdmin):
+    list_display = ("pond", "metric", "recorded_at", "value")
+    list_filter = ("metric",)
+    list_select_related = ("pond",)
+    show_full_result_count = False
+
+
+@admin.register(Rollup)
+class RollupAdmin(admin.ModelAdmin):
+    list_display = ("pond", "metric", "resolution", "bucket_start", "count", "minimum", "maximum")
+    list_filter = ("metric", "resolution")
+    list_select_related = ("pond",)
+    show_full_result_count = False
@@ -0,0 +1,7 @@
+from django.urls import path
+from telemetry.api_views import ReadingIngestAPI, ReadingSeriesAPI
+
+urlpatterns = [
+    path("", ReadingSeriesAPI.as_view(), name="api-telemetry-series"),
+    path("ingest/", ReadingIngestAPI.as_view(), name="api-telemetry-ingest"),
+]
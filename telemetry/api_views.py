@@ -0,0 +1,133 @@
+import math
+from datetime import timedelta, timezone as dt_timezone
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from core.models import Pond
+from telemetry.models import METRIC_CHOICES
+from telemetry.services import MAX_POINTS, ingest, query_series
+
+METRICS = dict(METRIC_CHOICES)
+MAX_BATCH_SIZE = 10000
+
+
+def _parse_value(value):
+    # float() also accepts "nan" / "inf" (and MessagePack carries them as is),
+    # which would poison every rollup the reading lands in
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"Value must be a finite number: {value}")
+    return value
+
+
+def _parse_time(value):
+    moment = parse_datetime(value) if isinstance(value, str) else None
+    if moment is None:
+        raise ValueError(f"Invalid timestamp: {value}")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, dt_timezone.utc)
+    return moment
+
+
+class ReadingIngestAPI(APIView):
+    """
+    POST {"readings": [{"pond": 1, "metric": "do", "recorded_at": "...", "value": 6.4}, ...]}
+
+    Validated by hand instead of a per-item serializer: this endpoint
+    is called with thousands of readings per second.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        items = request.data.get("readings") if hasattr(request.data, "get") else None
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"error": "readings must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > MAX_BATCH_SIZE:
+            return Response(
+                {"error": f"At most {MAX_BATCH_SIZE} readings per batch"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        readings = []
+        try:
+            for item in items:
+                metric = item["metric"]
+                if metric not in METRICS:
+                    raise ValueError(f"Unknown metric: {metric}")
+                readings.append((
+                    int(item["pond"]),
+                    metric,
+                    _parse_time(item["recorded_at"]),
+                    _parse_value(item["value"]),
+                ))
+        except (KeyError, TypeError, ValueError) as exc:
+            return Response(
+                {"error": f"Invalid reading: {exc}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # 🔒 Every pond in the batch must belong to the caller
+        pond_ids = {reading[0] for reading in readings}
+        owned = Pond.objects.filter(user=request.user, pk__in=pond_ids).count()
+        if owned != len(pond_ids):
+            return Response(
+                {"error": "Unknown pond in batch"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            {"ingested": ingest(readings)},
+            status=status.HTTP_201_CREATED
+        )
+
+
+class ReadingSeriesAPI(APIView):
+    """
+    GET ?pond=1&metric=do&from=...&to=...
+    Served from the coarsest series that still gives enough points.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        metric = params.get("metric")
+        if metric not in METRICS:
+            return Response(
+                {"error": "metric must be one of " + ", ".join(METRICS)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            pond = Pond.objects.get(pk=int(params.get("pond", "")), user=request.user)
+        except (ValueError, Pond.DoesNotExist):
+            return Response(
+                {"error": "Pond not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        try:
+            end = _parse_time(params["to"]) if params.get("to") else timezone.now()
+            start = _parse_time(params["from"]) if params.get("from") else end - timedelta(days=1)
+            max_points = min(int(params.get("points", MAX_POINTS)), MAX_POINTS)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if end <= start or max_points < 1:
+            return Response(
+                {"error": "from must be before to"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        resolution, points = query_series(pond.pk, metric, start, end, max_points=max_points)
+        return Response({
+            "pond": pond.pk,
+            "metric": metric,
+            "resolution": resolution,
+            "points": points,
+        })
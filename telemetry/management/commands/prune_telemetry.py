@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from telemetry.services import prune
+
+
+class Command(BaseCommand):
+    help = "Delete raw readings and rollups older than their retention window"
+
+    def handle(self, *args, **options):
+        for series, count in prune().items():
+            self.stdout.write(f"{series}: deleted {count}")
@@ -0,0 +1,46 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core', '0003_search_term'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reading',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('do', 'Dissolved oxygen (mg/L)'), ('temp', 'Temperature (°C)'), ('ph', 'pH')], max_length=4)),
+                ('recorded_at', models.DateTimeField()),
+                ('value', models.FloatField()),
+                ('pond', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.pond')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['pond', 'metric', 'recorded_at'], name='reading_series_idx'), models.Index(fields=['recorded_at'], name='reading_time_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Rollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('do', 'Dissolved oxygen (mg/L)'), ('temp', 'Temperature (°C)'), ('ph', 'pH')], max_length=4)),
+                ('resolution', models.CharField(choices=[('1m', '1 minute'), ('1h', '1 hour'), ('1d', '1 day')], max_length=2)),
+                ('bucket_start', models.DateTimeField()),
+                ('count', models.PositiveIntegerField()),
+                ('total', models.FloatField()),
+                ('minimum', models.FloatField()),
+                ('maximum', models.FloatField()),
+                ('pond', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.pond')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('pond', 'metric', 'resolution', 'bucket_start'), name='unique_rollup_bucket')],
+            },
+        ),
+    ]
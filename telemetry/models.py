@@ -0,0 +1,75 @@
+from django.db import models
+from core.models import Pond
+
+# Probe metrics
+DISSOLVED_OXYGEN = "do"
+TEMPERATURE = "temp"
+PH = "ph"
+
+METRIC_CHOICES = [
+    (DISSOLVED_OXYGEN, "Dissolved oxygen (mg/L)"),
+    (TEMPERATURE, "Temperature (°C)"),
+    (PH, "pH"),
+]
+
+
+class Reading(models.Model):
+    """
+    Raw probe reading. Append-only and kept for a bounded window
+    (TELEMETRY_RAW_RETENTION_DAYS); rollups keep the long-term history.
+    """
+    pond = models.ForeignKey(Pond, on_delete=models.CASCADE, related_name="+")
+    metric = models.CharField(max_length=4, choices=METRIC_CHOICES)
+    recorded_at = models.DateTimeField()
+    value = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["pond", "metric", "recorded_at"],
+                name="reading_series_idx"
+            ),
+            # Retention pruning
+            models.Index(fields=["recorded_at"], name="reading_time_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}={self.value} at {self.recorded_at}"
+
+
+class Rollup(models.Model):
+    MINUTE = "1m"
+    HOUR = "1h"
+    DAY = "1d"
+
+    RESOLUTION_CHOICES = [
+        (MINUTE, "1 minute"),
+        (HOUR, "1 hour"),
+        (DAY, "1 day"),
+    ]
+
+    pond = models.ForeignKey(Pond, on_delete=models.CASCADE, related_name="+")
+    metric = models.CharField(max_length=4, choices=METRIC_CHOICES)
+    resolution = models.CharField(max_length=2, choices=RESOLUTION_CHOICES)
+    bucket_start = models.DateTimeField()
+
+    # Mergeable aggregates; avg = total / count
+    count = models.PositiveIntegerField()
+    total = models.FloatField()
+    minimum = models.FloatField()
+    maximum = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["pond", "metric", "resolution", "bucket_start"],
+                name="unique_rollup_bucket"
+            )
+        ]
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else None
+
+    def __str__(self):
+        return f"{self.metric} {self.resolution} @ {self.bucket_start}"
@@ -0,0 +1,201 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from telemetry.models import Reading, Rollup
+
+RESOLUTION_SECONDS = {
+    Rollup.MINUTE: 60,
+    Rollup.HOUR: 3600,
+    Rollup.DAY: 86400,
+}
+
+# Retention windows; None = kept forever
+RAW_RETENTION = timedelta(days=getattr(settings, "TELEMETRY_RAW_RETENTION_DAYS", 7))
+ROLLUP_RETENTION = {
+    Rollup.MINUTE: timedelta(days=getattr(settings, "TELEMETRY_MINUTE_RETENTION_DAYS", 30)),
+    Rollup.HOUR: timedelta(days=getattr(settings, "TELEMETRY_HOUR_RETENTION_DAYS", 730)),
+    Rollup.DAY: None,
+}
+
+# Typical seconds between readings of one probe, used to size raw queries
+PROBE_INTERVAL_SECONDS = getattr(settings, "TELEMETRY_PROBE_INTERVAL_SECONDS", 5)
+
+MAX_POINTS = 1000
+INSERT_BATCH_SIZE = 2000
+RAW = "raw"
+
+
+def bucket_start(moment, resolution):
+    seconds = RESOLUTION_SECONDS[resolution]
+    timestamp = int(moment.timestamp())
+    return datetime.fromtimestamp(timestamp - timestamp % seconds, tz=dt_timezone.utc)
+
+
+# --------------------
+# Ingest
+# --------------------
+def ingest(readings):
+    """
+    Store a batch of (pond_id, metric, recorded_at, value) readings and fold
+    them into the 1m / 1h / 1d rollups. Rollup cost depends on the number of
+    buckets the batch touches, not on how much history is stored.
+    """
+    if not readings:
+        return 0
+
+    # Pre-aggregate the batch: [count, total, min, max] per bucket
+    buckets = {}
+    for pond_id, metric, recorded_at, value in readings:
+        for resolution in RESOLUTION_SECONDS:
+            key = (pond_id, metric, resolution, bucket_start(recorded_at, resolution))
+            aggregate = buckets.get(key)
+            if aggregate is None:
+                buckets[key] = [1, value, value, value]
+            else:
+                aggregate[0] += 1
+                aggregate[1] += value
+                if value < aggregate[2]:
+                    aggregate[2] = value
+                if value > aggregate[3]:
+                    aggregate[3] = value
+
+    with transaction.atomic():
+        Reading.objects.bulk_create(
+            [
+                Reading(pond_id=pond_id, metric=metric, recorded_at=recorded_at, value=value)
+                for pond_id, metric, recorded_at, value in readings
+            ],
+            batch_size=INSERT_BATCH_SIZE,
+        )
+
+        try:
+            with transaction.atomic():
+                _merge_rollups(buckets)
+        except IntegrityError:
+            # A concurrent batch created one of our new buckets first
+            _merge_rollups(buckets)
+
+    return len(readings)
+
+
+def _merge_rollups(buckets):
+    by_resolution = {}
+    for key in buckets:
+        by_resolution.setdefault(key[2], []).append(key)
+
+    to_create = []
+    to_update = []
+    for resolution, keys in by_resolution.items():
+        existing = {
+            (rollup.pond_id, rollup.metric, rollup.resolution, rollup.bucket_start): rollup
+            for rollup in Rollup.objects.select_for_update().filter(
+                resolution=resolution,
+                pond_id__in={key[0] for key in keys},
+                metric__in={key[1] for key in keys},
+                bucket_start__in={key[3] for key in keys},
+            )
+        }
+
+        for key in keys:
+            count, total, minimum, maximum = buckets[key]
+            rollup = existing.get(key)
+            if rollup is None:
+                pond_id, metric, _, start = key
+                to_create.append(Rollup(
+                    pond_id=pond_id,
+                    metric=metric,
+                    resolution=resolution,
+                    bucket_start=start,
+                    count=count,
+                    total=total,
+                    minimum=minimum,
+                    maximum=maximum,
+                ))
+            else:
+                rollup.count += count
+                rollup.total += total
+                rollup.minimum = min(rollup.minimum, minimum)
+                rollup.maximum = max(rollup.maximum, maximum)
+                to_update.append(rollup)
+
+    Rollup.objects.bulk_create(to_create, batch_size=INSERT_BATCH_SIZE)
+    Rollup.objects.bulk_update(
+        to_update,
+        ["count", "total", "minimum", "maximum"],
+        batch_size=INSERT_BATCH_SIZE,
+    )
+
+
+# --------------------
+# Query
+# --------------------
+def pick_resolution(start, end, now=None, max_points=MAX_POINTS):
+    """
+    Finest series that is still retained for `start` and returns at most
+    `max_points` points; the daily rollup is the fallback.
+    """
+    now = now or timezone.now()
+    span = max((end - start).total_seconds(), 1)
+
+    candidates = [(RAW, PROBE_INTERVAL_SECONDS, RAW_RETENTION)] + [
+        (resolution, seconds, ROLLUP_RETENTION[resolution])
+        for resolution, seconds in RESOLUTION_SECONDS.items()
+    ]
+    for resolution, seconds, retention in candidates:
+        retained = retention is None or start >= now - retention
+        if retained and span / seconds <= max_points:
+            return resolution
+    return Rollup.DAY
+
+
+def query_series(pond_id, metric, start, end, max_points=MAX_POINTS):
+    resolution = pick_resolution(start, end, max_points=max_points)
+
+    if resolution == RAW:
+        rows = (
+            Reading.objects
+            .filter(pond_id=pond_id, metric=metric, recorded_at__range=(start, end))
+            .order_by("recorded_at")
+            .values_list("recorded_at", "value")
+        )
+        points = [
+            {"t": recorded_at, "avg": value, "min": value, "max": value, "count": 1}
+            for recorded_at, value in rows
+        ]
+    else:
+        rows = (
+            Rollup.objects
+            .filter(
+                pond_id=pond_id,
+                metric=metric,
+                resolution=resolution,
+                bucket_start__range=(bucket_start(start, resolution), end),
+            )
+            .order_by("bucket_start")
+            .values_list("bucket_start", "count", "total", "minimum", "maximum")
+        )
+        points = [
+            {"t": start_at, "avg": total / count, "min": minimum, "max": maximum, "count": count}
+            for start_at, count, total, minimum, maximum in rows
+        ]
+
+    return resolution, points
+
+
+# --------------------
+# Retention
+# --------------------
+def prune(now=None):
+    now = now or timezone.now()
+    deleted = {RAW: Reading.objects.filter(recorded_at__lt=now - RAW_RETENTION).delete()[0]}
+
+    for resolution, retention in ROLLUP_RETENTION.items():
+        if retention is None:
+            continue
+        deleted[resolution] = Rollup.objects.filter(
+            resolution=resolution,
+            bucket_start__lt=now - retention,
+        ).delete()[0]
+
+    return deleted
@@ -0,0 +1,43 @@
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from core.models import Pond
+from telemetry.models import DISSOLVED_OXYGEN, Reading, Rollup
+
+
+class ReadingIngestTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("crew", password="secret")
+        self.pond = Pond.objects.create(user=self.user, name="P1", area_acres=Decimal("1.00"))
+        self.client.force_login(self.user)
+
+    def ingest(self, *values):
+        return self.client.post(
+            reverse("api-telemetry-ingest"),
+            {"readings": [
+                {
+                    "pond": self.pond.pk,
+                    "metric": DISSOLVED_OXYGEN,
+                    "recorded_at": f"2026-10-19T08:00:0{index}Z",
+                    "value": value,
+                }
+                for index, value in enumerate(values)
+            ]},
+            content_type="application/json",
+        )
+
+    def test_finite_values_are_stored_and_rolled_up(self):
+        response = self.ingest(6.5, "7.5")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Reading.objects.count(), 2)
+        rollup = Rollup.objects.get(resolution=Rollup.MINUTE)
+        self.assertEqual((rollup.count, rollup.total), (2, 14.0))
+
+    def test_non_finite_values_are_rejected(self):
+        for value in ("nan", "NaN", "inf", "-Infinity", "1e400"):
+            with self.subTest(value=value):
+                response = self.ingest(6.5, value)
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(Reading.objects.exists())
+        self.assertFalse(Rollup.objects.exists())